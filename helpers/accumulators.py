@@ -0,0 +1,496 @@
+import math
+from collections import defaultdict, Counter
+
+import numpy as np
+
+from helpers.allplay import all_play
+from helpers.cache import current_season
+from helpers.compact import line_points, optimal_points, position_name, starter_points
+from helpers.drafts import DraftIndex
+from helpers.h2h import HeadToHeadMatrix, write_owner_slices
+from helpers.leaderboard import Leaderboards, TOP_K
+from helpers.metrics import METRICS
+from helpers.payouts import PayoutSchedule, SeasonLines
+from helpers.pipeline import Accumulator, is_final
+from helpers.standings import StandingsTimeline
+
+
+# === LEAGUE HISTORY (get_history.py) ===
+class LeagueHistory(Accumulator):
+    sort_by = ['Year', 'Final Standing']
+    config = ("years", "owners")
+
+    def __init__(self, years, owners):
+        self.years = years
+        self.owners = owners
+        self.history_data = {}  # year -> rows, replaced whenever a season is re-run
+        self.standings = StandingsTimeline()
+
+    def start_season(self, league):
+        self.standings.start_season(league.year, [team.team_id for team in league.teams],
+                                    league.settings.reg_season_count,
+                                    getattr(league.settings, "playoff_team_count", None))
+
+    def add_week(self, league, week, box_scores):
+        # Only final scores go into the standings
+        if not is_final(league, week):
+            return
+        self.standings.add_week(league.year, week, [
+            (box.home_team_id, box.away_team_id, box.home_score, box.away_score)
+            for box in box_scores
+            if box.home_team_id and box.away_team_id
+        ])
+
+    def end_season(self, league):
+        sacko = self.standings.sacko(league.year)
+
+        owners = self.owners.season(league.year)
+        season_rows = self.history_data[league.year] = []
+        for team in league.teams:
+            owner_id = owners[team.team_id]
+            season_rows.append({
+                'Year': league.year,
+                'Owner ID': owner_id,
+                'Owner Name': self.owners.name(owner_id),
+                'Wins': team.wins,
+                'Losses': team.losses,
+                'Points For': team.points_for,
+                'Points Against': team.points_against,
+                'Final Standing': team.final_standing,
+                'Champion': team.final_standing == 1,
+                'Sacko': team.team_id == sacko
+            })
+
+    def rows(self):
+        return [row for year in sorted(self.history_data) for row in self.history_data[year]]
+
+    def standings_rows(self):
+        owners = self.owners
+        return ({
+            'Year': row['year'],
+            'Week': row['week'],
+            'Owner ID': owners.owner(row['year'], row['team_id']),
+            'Owner Name': owners.name_of(row['year'], row['team_id']),
+            'Rank': row['rank'],
+            'Wins': row['wins'],
+            'Losses': row['losses'],
+            'Ties': row['ties'],
+            'Points For': row['points_for'],
+            'Points Against': row['points_against'],
+            'Games Back': row['games_back'],
+            'Clinched': row['clinched'],
+            'Eliminated': row['eliminated']
+        } for row in self.standings.rows())
+
+
+# === HEAD TO HEAD (head_to_head.py) ===
+class HeadToHead(Accumulator):
+    sort_by = ['Owner Name', 'Opponent Name']
+    config = ("years", "owners", "include_playoffs")
+
+    def __init__(self, years, owners, include_playoffs=False):
+        self.years = years
+        self.owners = owners
+        self.include_playoffs = include_playoffs
+        self.matrix = HeadToHeadMatrix()
+
+    def weeks(self, league):
+        if self.include_playoffs:
+            return sorted(int(w) for w in league.settings.matchup_periods)
+        return super().weeks(league)
+
+    def add_week(self, league, week, box_scores):
+        owners = self.owners.season(league.year)
+        games = [
+            (owners[box.home_team_id], owners[box.away_team_id], box.home_score, box.away_score)
+            for box in box_scores
+            if box.home_team_id and box.away_team_id
+        ]
+        if games:
+            self.matrix.add_games(*zip(*games))
+
+    def rows(self):
+        records = []
+        for i, j in self.matrix.pairs():
+            owner_id = self.matrix.owner_ids[i]
+            opp_id = self.matrix.owner_ids[j]
+            stats = self.matrix.record(i, j)
+            records.append({
+                'Owner ID': owner_id,
+                'Owner Name': self.owners.name(owner_id),
+                'Opponent ID': opp_id,
+                'Opponent Name': self.owners.name(opp_id),
+                'Win %': round(100 * stats['Wins'] / stats['Games Played'], 2),
+                **stats
+            })
+        return records
+
+    def write_owner_slices(self, directory):
+        write_owner_slices(self.matrix, self.owners.names, directory)
+
+
+# === ALL TIME RECORDS (records.py) ===
+def add_season_totals(boards, owners, year, team_totals, player_totals):
+    # Totals are keyed by owner id; entries carry the owner's name
+    for owner_id, points in team_totals.items():
+        entry = {"owner": owners.name(owner_id), "name": "", "points": points, "year": year, "week": ""}
+        boards.add("Team Season", points, entry, (f"Owner {owner_id}",))
+    for (player_id, name, owner_id, pos), points in player_totals.items():
+        entry = {"owner": owners.name(owner_id), "name": name, "points": points, "year": year, "week": ""}
+        slices = [f"Owner {owner_id}", f"Year {year}"]
+        if pos:
+            slices.insert(0, f"Position {pos}")
+        boards.add("Player Season", points, entry, slices)
+
+
+def record_row(category, record, entry):
+    return {
+        "Category": category, "Record": record, "Owner": entry["owner"], "Detail": entry["name"],
+        "Points": round(entry["points"], 2), "Year": entry["year"], "Week": entry["week"]
+    }
+
+
+class Records(Accumulator):
+    config = ("years", "owners", "k")
+
+    def __init__(self, years, owners, k=TOP_K):
+        self.years = years
+        self.owners = owners
+        self.k = k
+        self.boards = Leaderboards(k)  # game boards plus every finished season
+        self.open_seasons = {}         # year -> (team totals, player totals) until the season is over
+
+    def add_week(self, league, week, box_scores):
+        year = league.year
+        boards = self.boards
+        team_totals, player_totals = self.open_seasons.setdefault(year, ({}, {}))
+        owners = self.owners.season(year)
+        names = self.owners.names
+
+        player_names = box_scores.names
+
+        for box in box_scores:
+            for team_id, score, _ in box.sides():
+                owner_id = owners.get(team_id)
+                if owner_id is None:
+                    continue
+                team_totals[owner_id] = team_totals.get(owner_id, 0.0) + score
+
+                entry = {"owner": names[owner_id], "name": "", "points": score, "year": year, "week": week}
+                boards.add("Team Game", score, entry, (f"Owner {owner_id}", f"Year {year}"))
+
+            for team_id, _, lineup in box.sides():
+                owner_id = owners.get(team_id)
+                if owner_id is None:
+                    continue
+                for player_id, code, pts in zip(lineup["player_id"].tolist(), lineup["position"].tolist(),
+                                                line_points(lineup).tolist()):
+                    name = player_names.get(player_id)
+                    if not name or math.isnan(pts):
+                        continue
+                    pos = position_name(code)
+
+                    key = (player_id, name, owner_id, pos)
+                    player_totals[key] = player_totals.get(key, 0.0) + pts
+
+                    entry = {"owner": names[owner_id], "name": name, "points": pts, "year": year, "week": week}
+                    slices = [f"Owner {owner_id}", f"Year {year}"]
+                    if pos:
+                        slices.insert(0, f"Position {pos}")
+                    boards.add("Player Game", pts, entry, slices)
+
+    def end_season(self, league):
+        # Season totals only become records once the season is over: a half
+        # played season would always hold the low marks, and a re-run of the
+        # current season can never add the same season twice
+        if league.year < current_season() and league.year in self.open_seasons:
+            add_season_totals(self.boards, self.owners, league.year, *self.open_seasons.pop(league.year))
+
+    def rows(self):
+        boards = self.boards
+        records = []
+        for category, board, most, least in [
+            ("Team Game", "Team Game", "Most Points", "Least Points"),
+            ("Team Season", "Team Season", "Most Points", "Least Points"),
+        ]:
+            if boards.top(board):
+                records.append(record_row(category, most, boards.top(board)[0]))
+                records.append(record_row(category, least, boards.bottom(board)[0]))
+
+        if boards.top("Player Game"):
+            records.append(record_row("Single Game", "Top Player", boards.top("Player Game")[0]))
+        for slice_name in boards.slices("Player Game"):
+            if slice_name.startswith("Position "):
+                pos = slice_name[len("Position "):]
+                records.append(record_row("Single Game", f"Top {pos}", boards.top("Player Game", slice_name)[0]))
+
+        if boards.top("Player Season"):
+            records.append(record_row("Player Season", "Top Player", boards.top("Player Season")[0]))
+        return records
+
+    def leaderboard_rows(self):
+        boards = self.boards
+        for (board, slice_name), (top, bottom) in boards.boards.items():
+            for direction, entries in [("Top", top.entries()), ("Bottom", bottom.entries())]:
+                for rank, entry in enumerate(entries, 1):
+                    yield {
+                        "Board": board, "Slice": slice_name, "Direction": direction, "Rank": rank,
+                        "Owner": entry["owner"], "Detail": entry["name"], "Points": round(entry["points"], 2),
+                        "Year": entry["year"], "Week": entry["week"]
+                    }
+
+
+# === ADVANCED METRICS (advanced_history.py) ===
+def new_team_stats():
+    return {
+        'Wins': 0,
+        'Losses': 0,
+        'Points For': 0,
+        'Opponent Points': [],
+        'Starter Points': 0.0,
+        'Optimal Points': 0.0,
+        'True Wins': 0,
+        'True Losses': 0,
+        'Games Played': 0,
+    }
+
+
+class AdvancedMetrics(Accumulator):
+    sort_by = ["Year", "Owner Name"]
+    config = ("years", "owners")
+
+    def __init__(self, years, owners):
+        self.years = years
+        self.owners = owners
+        self.season_stats = {}  # year -> team_stats, kept so a season can be resumed mid-way
+        self.season_scores = {}  # year -> [(week, owner_id, starter points)]
+        self.data = {}          # year -> rows
+
+    def weeks(self, league):
+        return sorted(int(w) for w in league.settings.matchup_periods.keys() if int(w) < league.currentMatchupPeriod)
+
+    def start_season(self, league):
+        # Extract lineup slot requirements from league settings
+        self.slot_counts = Counter()
+        for slot in league.settings.position_slot_counts:
+            if slot == "RB/WR/TE":
+                self.slot_counts["RB/WR/TE"] += league.settings.position_slot_counts[slot]
+            elif slot in ["QB", "RB", "WR", "TE", "K", "D/ST"]:
+                self.slot_counts[slot] += league.settings.position_slot_counts[slot]
+
+        # Map team ID to owner ID
+        self.team_owner_map = self.owners.season(league.year)
+        self.team_wins = {self.team_owner_map[team.team_id]: (team.wins, team.losses) for team in league.teams}
+
+        self.team_stats = self.season_stats.setdefault(league.year, defaultdict(new_team_stats))
+
+    def add_week(self, league, week, box_scores):
+        year = league.year
+        team_stats = self.team_stats
+        weekly_points = {}
+        starters = starter_points(box_scores)
+        # Build every team's optimal lineup for the week in one batch
+        optimal = optimal_points(box_scores, self.slot_counts, self.slot_counts['RB/WR/TE'])
+
+        for i, box in enumerate(box_scores):
+            # Bye weeks have no opponent
+            if not box.home_team_id or not box.away_team_id:
+                continue
+
+            for side, (team_id, _, _) in enumerate(box.sides(), 2 * i):
+                owner_id = self.team_owner_map.get(team_id)
+                if owner_id is None:
+                    continue
+
+                points = starters[side]
+                team_stats[(owner_id, year)]['Starter Points'] += points
+                team_stats[(owner_id, year)]['Points For'] += points
+                team_stats[(owner_id, year)]['Optimal Points'] += float(optimal[side])
+                weekly_points[(owner_id, year)] = points
+
+            # Record opponent scores
+            home_id = self.team_owner_map.get(box.home_team_id)
+            away_id = self.team_owner_map.get(box.away_team_id)
+            if home_id is not None and away_id is not None:
+                team_stats[(home_id, year)]['Opponent Points'].append(box.away_score)
+                team_stats[(away_id, year)]['Opponent Points'].append(box.home_score)
+
+        # Keep the week's scores; true wins are ranked for the whole season at once
+        season_scores = self.season_scores.setdefault(year, [])
+        season_scores.extend((week, owner_id, score) for (owner_id, _), score in weekly_points.items())
+
+    def tally_true_records(self, year):
+        season_scores = self.season_scores.get(year)
+        if not season_scores:
+            return
+        weeks, owner_ids, scores = zip(*season_scores)
+        wins, losses, ties = all_play(np.array(weeks), np.array(scores))
+        # Owner ids are dense, so they index the tallies directly
+        owner_ids = np.array(owner_ids, dtype=np.int64)
+        true_wins = np.bincount(owner_ids, weights=wins)
+        true_losses = np.bincount(owner_ids, weights=losses)
+        games = np.bincount(owner_ids, weights=wins + losses + ties)
+        for owner_id in np.unique(owner_ids).tolist():
+            stats = self.team_stats[(owner_id, year)]
+            stats['True Wins'] = int(true_wins[owner_id])
+            stats['True Losses'] = int(true_losses[owner_id])
+            stats['Games Played'] = int(games[owner_id])
+
+    def end_season(self, league):
+        self.tally_true_records(league.year)
+        team_stats = self.team_stats
+        week_numbers = self.weeks(league)
+
+        season_rows = self.data[league.year] = []
+
+        sos_all = [s for stats in team_stats.values() for s in stats['Opponent Points']]
+        avg_sos = sum(sos_all) / len(sos_all) if sos_all else 0
+        # Compile final metrics
+        for (owner_id, year), stats_dict in team_stats.items():
+            real_wins = self.team_wins.get(owner_id)[0]
+            real_losses = self.team_wins.get(owner_id)[1]
+            league_games = real_wins + real_losses
+            initials = self.owners.name(owner_id)
+            true_wins = stats_dict['True Wins']
+            sos = sum(stats_dict['Opponent Points']) / len(stats_dict['Opponent Points']) if stats_dict['Opponent Points'] else 0.0
+            efficiency = (stats_dict['Starter Points'] / stats_dict['Optimal Points']) * 100 if stats_dict['Optimal Points'] > 0 else 0.0
+            games_played = stats_dict['Games Played']
+
+            # Normalize True Wins/Losses to match actual number of scheduled games (if needed)
+            scheduled_games = len(week_numbers)
+            true_win_ratio = true_wins / games_played if games_played else 0
+            normalized_true_wins = round(true_win_ratio * league_games)
+            normalized_true_losses = league_games - normalized_true_wins
+            noramlized_win_pct = round(normalized_true_wins/ league_games,3)
+            net_lucky_wins = real_wins - normalized_true_wins
+            luck_adjustment = (sos - avg_sos) / 10
+            adjusted_luck_index = round(net_lucky_wins - luck_adjustment, 2)
+
+            season_rows.append({
+                "Year": year,
+                "Owner ID": owner_id,
+                "Owner Name": initials,
+                "Normalized True Wins": normalized_true_wins,
+                "Normalized True Losses": normalized_true_losses,
+                "Scheduled Games": scheduled_games,
+                "Legaue Games": league_games,
+                "Wins": real_wins,
+                "Losses": real_losses,
+                "True W/L": f"{normalized_true_wins} - {normalized_true_losses}",
+                "True W/L %": noramlized_win_pct,
+                "Luck Index": adjusted_luck_index,
+                "Strength of Schedule": round(sos, 2),
+                "Manager Efficiency": round(efficiency, 2)
+            })
+
+    def rows(self):
+        return [row for year in sorted(self.data) for row in self.data[year]]
+
+
+# === DRAFT HABITS (owner_habits.py) ===
+class DraftHabits(Accumulator):
+    sort_by = "Times Drafted"
+    ascending = False
+    config = ("years", "owners")
+
+    def __init__(self, years, owners):
+        self.years = years
+        self.owners = owners
+        self.index = DraftIndex()  # saved on its own too, see DraftIndex.save
+
+    def weeks(self, league):
+        return []
+
+    def start_season(self, league):
+        team_id_to_owner = self.owners.season(league.year)
+        for owner_id in team_id_to_owner.values():
+            self.index.owner_names[owner_id] = self.owners.name(owner_id)
+
+        # A completed draft never changes, so only index it once
+        if league.year in self.index.years:
+            return
+        try:
+            draft = league.draft
+        except Exception as e:
+            print(f"Could not load draft data for {league.year}: {e}")
+            METRICS.error("load_draft", e, league.year)
+            return
+
+        self.index.add_season(league.year, [
+            (team_id_to_owner[pick.team.team_id], pick.playerId, pick.playerName, pick.round_num, pick.round_pick)
+            for pick in draft
+            if pick.team.team_id in team_id_to_owner
+        ])
+
+    def rows(self):
+        rows = []
+        for owner_id in self.index.owners():
+            for top in self.index.top_repeats(owner_id, 1):
+                rows.append({
+                    "Owner ID": owner_id,
+                    "Owner Name": self.index.owner_names.get(owner_id, "??"),
+                    "Most Drafted Player": top["player_name"],
+                    "Times Drafted": top["times"],
+                    "Drafted Seasons": " / ".join(map(str, top["seasons"]))
+                })
+        return rows
+
+
+# === WEEKLY PAYOUTS (weekly_summary.py) ===
+class WeeklyPayouts(Accumulator):
+    sort_by = ['Year', 'Week']
+    config = ("years", "owners", "schedule")
+
+    def __init__(self, years, owners, payout_config):
+        self.years = years
+        self.owners = owners
+        self.schedule = PayoutSchedule(payout_config)
+        self.open_seasons = {}  # year -> {week: box scores} until the season is over
+        self.winners = {}       # year -> winners, as weekly_payout_winners.json lists them
+        self.team_names = {}
+
+    def weeks(self, league):
+        return self.schedule.weeks()
+
+    def start_season(self, league):
+        self.team_names = {team.team_id: (team.team_name, self.owners.name_of(league.year, team.team_id))
+                           for team in league.teams}
+
+    def add_week(self, league, week, box_scores):
+        # A week still being played pays out once it's final
+        if not is_final(league, week):
+            return
+        self.open_seasons.setdefault(league.year, {})[week] = box_scores
+
+    def end_season(self, league):
+        # All of a season's payout weeks are scored together; the current
+        # season keeps its weeks so an incremental run can add to them
+        weeks = self.open_seasons.get(league.year, {})
+        if league.year < current_season():
+            self.open_seasons.pop(league.year, None)
+
+        self.winners[league.year] = []
+        for winner in self.schedule.winners(SeasonLines(weeks)):
+            team_name, owner = self.team_names.get(winner["team_id"], ("", "??"))
+            self.winners[league.year].append({
+                "week": winner["week"],
+                "payout_text": winner["payout_text"],
+                "team": team_name,
+                "owner": owner,
+                "points": round(winner["points"], 2),
+                "players": winner["players"]
+            })
+
+    def season_winners(self, year):
+        return self.winners.get(year, [])
+
+    def rows(self):
+        return [{
+            'Year': year,
+            'Week': winner["week"],
+            'Payout': winner["payout_text"],
+            'Team Name': winner["team"],
+            'Owner': winner["owner"],
+            'Points': winner["points"],
+            'Players': " / ".join(name or "" for name in winner["players"])
+        } for year in sorted(self.winners) for winner in self.winners[year]]
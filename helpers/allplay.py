@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def run_bounds(sorted_keys):
+    # For each position of a sorted key array: index where its run of equal
+    # keys starts and index just past where it ends
+    n = len(sorted_keys)
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    lengths = np.diff(np.r_[starts, n])
+    first = np.repeat(starts, lengths)
+    return first, first + np.repeat(lengths, lengths)
+
+
+def all_play(group, scores):
+    """All-play record of every score against the others in its group.
+
+    `group` identifies the slate a score belongs to (a league week, or any
+    (league, year, week) packed into one integer) and `scores` the points.
+    A single lexsort ranks every slate at once: wins are the scores below,
+    losses the scores above and ties the other equal scores. Returns
+    (wins, losses, ties) aligned with the input.
+    """
+    group = np.asarray(group)
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(scores)
+    wins = np.zeros(n, dtype=np.int64)
+    losses = np.zeros(n, dtype=np.int64)
+    ties = np.zeros(n, dtype=np.int64)
+    if not n:
+        return wins, losses, ties
+
+    order = np.lexsort((scores, group))
+    sorted_group = group[order]
+    sorted_scores = scores[order]
+
+    group_start, group_end = run_bounds(sorted_group)
+    # Runs of equal (group, score) pairs
+    same = np.r_[False, (sorted_group[1:] == sorted_group[:-1]) & (sorted_scores[1:] == sorted_scores[:-1])]
+    value_start = np.flatnonzero(~same)
+    value_len = np.diff(np.r_[value_start, n])
+    first = np.repeat(value_start, value_len)
+    last = first + np.repeat(value_len, value_len)
+
+    wins[order] = first - group_start
+    losses[order] = group_end - last
+    ties[order] = last - first - 1
+    return wins, losses, ties
+
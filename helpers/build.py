@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from helpers.accumulators import LeagueHistory, HeadToHead, Records, AdvancedMetrics, DraftHabits
+from helpers.owners import OwnerIndex
+from helpers.pipeline import run_pipeline, export, export_rows
+from helpers.store import ARCHIVE_PATH, ArchiveWriter, player_positions
+from helpers.utilities import BASE_DIR
+
+LEAGUES_DIR = BASE_DIR / "ignore" / "leagues"
+BOX_SCORE_START = 2019  # lineups are only available from 2019
+
+
+def league_namespace(league_id, root=LEAGUES_DIR):
+    # Everything one league keeps between runs: response cache, checkpoints,
+    # archive and owner map. Batch runs never share these between leagues.
+    namespace = Path(root) / str(league_id)
+    return {
+        "cache": namespace / "cache",
+        "state": namespace / "state",
+        "archive": namespace / "archive.sqlite",
+        "owner_map": namespace / "owner_map.json",
+    }
+
+
+def build_league(league_id, years, output_dir, owner_map, swid=None, espn_s2=None, fetcher=None,
+                 checkpoint=None, archive_path=ARCHIVE_PATH, incremental=False, draft_index_path=None,
+                 positions_path=ARCHIVE_PATH, standings_path=None, owners_path=None):
+    """One crawl of `league_id` that writes every CSV plus the h2h slices to
+    `output_dir`. Pass archive_path=None to skip archiving (e.g. when the
+    crawl itself reads from the archive). The draft index is saved to
+    `draft_index_path`, with player positions from the `positions_path`
+    archive, the standings timeline to `standings_path` and the owner index
+    to `owners_path`."""
+    output_dir = Path(output_dir)
+    box_score_era = range(max(years[0], BOX_SCORE_START), years[-1] + 1)
+
+    owners = OwnerIndex(years, owner_map)
+    history = LeagueHistory(years, owners)
+    head_to_head = HeadToHead(years, owners)
+    records = Records(box_score_era, owners)
+    habits = DraftHabits(years, owners)
+    outputs = {
+        'owners.csv': owners,
+        'league_history.csv': history,
+        'head_to_head_lifetime.csv': head_to_head,
+        'all_time_records.csv': records,
+        'advanced_team_metrics.csv': AdvancedMetrics(box_score_era, owners),
+        'most_drafted_players.csv': habits,
+    }
+
+    # The owner index comes first so every season's owners are known before
+    # the other accumulators see it. The raw player lines and matchups are
+    # archived on the same crawl.
+    accumulators = list(outputs.values())
+    if archive_path:
+        accumulators.append(ArchiveWriter(years, archive_path))
+
+    run_pipeline(league_id, accumulators, swid=swid, espn_s2=espn_s2, fetcher=fetcher,
+                 checkpoint=checkpoint, incremental=incremental)
+
+    for filename, accumulator in outputs.items():
+        export(accumulator, output_dir / filename)
+    export_rows(records.leaderboard_rows(), output_dir / 'all_time_leaderboards.csv')
+    export_rows(history.standings_rows(), output_dir / 'standings_timeline.csv')
+    head_to_head.write_owner_slices(output_dir / 'h2h')
+    if draft_index_path:
+        save_draft_index(habits.index, league_id, draft_index_path, positions_path)
+    if standings_path:
+        history.standings.save(standings_path)
+    if owners_path:
+        owners.save(owners_path)
+
+
+def save_draft_index(index, league_id, path, positions_path=ARCHIVE_PATH):
+    # Positions only exist on lineups, so they come from the archive
+    if positions_path and Path(positions_path).exists():
+        index.positions.update(player_positions(league_id, positions_path))
+    index.save(path)
@@ -0,0 +1,195 @@
+import json
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from helpers.compact import compact_matchups
+
+POOL_SIZE = 8  # kept-alive connections per host, enough for every fetcher thread
+BULK_VIEWS = ["mMatchupScore", "mScoreboard"]
+
+_session = None
+_session_lock = threading.Lock()
+
+
+# === ONE HTTP SESSION PER PROCESS ===
+def shared_session():
+    # Every league, season and fetcher thread reuses the same connection
+    # pool, so only the first request to a host pays for the TLS handshake.
+    # Responses come compressed in whichever encodings urllib3 can decode
+    # here (gzip and deflate, plus brotli/zstd when installed).
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(make_headers(accept_encoding=True))
+            _session = session
+        return _session
+
+
+def use_session(espn_request, session=None):
+    # Swaps the bare requests.get() in EspnFantasyRequests.league_get()/get()
+    # for the shared session. Must run before instrument_requests and
+    # install_cache, which wrap whatever methods are there. Status handling
+    # (including the 401 switch between league endpoints) stays espn_api's.
+    session = session or shared_session()
+
+    def league_get(params=None, headers=None, extend=""):
+        r = session.get(espn_request.LEAGUE_ENDPOINT + extend, params=params, headers=headers,
+                        cookies=espn_request.cookies)
+        alternate = espn_request.checkRequestStatus(r.status_code, extend=extend, params=params, headers=headers)
+        data = alternate if alternate else r.json()
+        return data[0] if isinstance(data, list) else data
+
+    def get(params=None, headers=None, extend=""):
+        r = session.get(espn_request.ENDPOINT + extend, params=params, headers=headers,
+                        cookies=espn_request.cookies)
+        if r.status_code == 404:
+            return espn_request.checkRequestStatus(r.status_code, extend=extend)
+        espn_request.checkRequestStatus(r.status_code)
+        return r.json()
+
+    espn_request.league_get = league_get
+    espn_request.get = get
+    return espn_request
+
+
+# === WHOLE-SEASON FETCH ===
+def matchup_periods(league, weeks):
+    # Week -> matchup period. The pipeline's weeks are scoring periods from
+    # 2019 on (box_scores) and matchup periods before (scoreboard).
+    if league.year < 2019:
+        return {week: week for week in weeks}
+    periods = {}
+    for period, scoring_periods in getattr(league.settings, "matchup_periods", {}).items():
+        for week in scoring_periods:
+            if week in weeks:
+                periods[week] = int(period)
+    return periods
+
+
+def fetch_season(league, weeks):
+    """Every matchup of `weeks` from one league_get, split into CompactWeeks.
+
+    Asks for the season's whole schedule with scores and lineups (the views
+    box_scores() uses, filtered to all the matchup periods at once) instead
+    of three requests a week. Returns {week: CompactWeek} for the weeks the
+    response covers; a week it can't split, e.g. a playoff matchup spanning
+    two scoring periods or a season without lineups in the response, is
+    left out for the caller to fetch on its own.
+    """
+    espn_request = getattr(league, "espn_request", None)
+    periods = matchup_periods(league, weeks)
+    if espn_request is None or not periods:
+        return {}
+
+    filters = {"schedule": {"filterMatchupPeriodIds": {"value": sorted(set(periods.values()))}}}
+    data = espn_request.league_get(params={"view": BULK_VIEWS}, headers={"x-fantasy-filter": json.dumps(filters)})
+    return split_season(data.get("schedule", []), league, periods)
+
+
+def fetch_schedule(league):
+    """The season's whole schedule with scores, from one league_get.
+
+    scoreboard() sends this same request for every week it's asked for and
+    keeps one matchup period of the answer. This keeps all of them:
+    {matchup period: [(home team id, away team id, home score, away score)]},
+    with ESPN's totals as scoreboard() reports them and team 0 for a bye.
+    """
+    data = league.espn_request.league_get(params={"view": "mMatchupScore"})
+    schedule = {}
+    for matchup in data.get("schedule", []):
+        home_id, home_score = side_score(matchup, "home", False)
+        away_id, away_score = side_score(matchup, "away", False)
+        schedule.setdefault(matchup.get("matchupPeriodId"), []).append((home_id, away_id, home_score, away_score))
+    return schedule
+
+
+def split_season(schedule, league, periods):
+    by_period = {}
+    for matchup in schedule:
+        by_period.setdefault(matchup.get("matchupPeriodId"), []).append(matchup)
+    spans = {int(period): len(weeks) for period, weeks in getattr(league.settings, "matchup_periods", {}).items()}
+
+    season = {}
+    for week, period in periods.items():
+        matchups = by_period.get(period)
+        if not matchups:
+            continue
+        if league.year < 2019:
+            # The scoreboard: scores only, as ESPN reported them
+            season[week] = compact_matchups([
+                (*side_score(matchup, "home", False), *side_score(matchup, "away", False), [], [])
+                for matchup in matchups
+            ])
+            continue
+        if spans.get(period, 1) > 1 or not all(has_lineups(matchup) for matchup in matchups):
+            continue
+        boxes = []
+        for matchup in matchups:
+            (home_id, home_score), (away_id, away_score) = side_score(matchup, "home"), side_score(matchup, "away")
+            boxes.append((home_id, away_id, home_score, away_score,
+                          side_lineup(matchup, "home", week, league.year),
+                          side_lineup(matchup, "away", week, league.year)))
+        season[week] = compact_matchups(boxes)
+    return season
+
+
+# === PARSING: the same fields espn_api's BoxScore and Matchup read ===
+def side_score(matchup, side, rounded=True):
+    # (team id, score); a bye side is (0, 0). Box scores prefer the live
+    # total and round it, the scoreboard keeps ESPN's total as is.
+    if side not in matchup:
+        return 0, 0
+    team = matchup[side]
+    if not rounded:
+        return team["teamId"], team["totalPoints"]
+    return team["teamId"], round(team.get("totalPointsLive", team["totalPoints"]), 2)
+
+
+def roster_entries(team):
+    # Only the matchup period's roster: without a scoringPeriodId the
+    # "current scoring period" one is today's lineup, not that week's. With
+    # one scoring period per matchup period it is exactly the week's lineup.
+    return team.get("rosterForMatchupPeriod", {}).get("entries") or None
+
+
+def has_lineups(matchup):
+    return all(roster_entries(matchup[side]) is not None for side in ("home", "away") if side in matchup)
+
+
+def side_lineup(matchup, side, week, year):
+    if side not in matchup:
+        return []
+    return [player_line(entry, week, year) for entry in roster_entries(matchup[side])]
+
+
+def player_line(entry, week, year):
+    from espn_api.football.constant import POSITION_MAP
+
+    pool_entry = entry.get("playerPoolEntry", {})
+    player = pool_entry.get("player") or entry["player"]
+    name = player.get("fullName", "")
+
+    # Main position: the first eligible slot that isn't a flex (as Player does)
+    position = ""
+    for slot in player.get("eligibleSlots", []):
+        if (slot != 25 and "/" not in POSITION_MAP[slot]) or "/" in name:
+            position = POSITION_MAP[slot]
+            break
+
+    points = None
+    for stats in player.get("stats", []):
+        if (stats.get("scoringPeriodId") == week and stats.get("statSourceId") == 0
+                and stats.get("seasonId", year) == year and stats.get("statSplitTypeId") != 2):
+            points = round(stats.get("appliedTotal", 0), 2)
+    if points is None:
+        points = round(pool_entry.get("appliedStatTotal", 0), 2)
+
+    slot = POSITION_MAP.get(entry["lineupSlotId"], "FA") if "lineupSlotId" in entry else "FA"
+    return player.get("id", entry.get("playerId")), name, position, slot, points
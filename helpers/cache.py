@@ -0,0 +1,118 @@
+import hashlib
+import json
+import time
+from datetime import date
+
+from helpers.export import write_json
+from helpers.metrics import METRICS, instrument_requests
+from helpers.utilities import BASE_DIR
+
+CACHE_DIR = BASE_DIR / "ignore" / "cache"
+CURRENT_WEEK_TTL = 15 * 60  # seconds an in-progress response stays fresh
+
+
+def current_season(today=None):
+    # NFL seasons are labelled by the year they kick off in
+    today = today or date.today()
+    return today.year if today.month >= 8 else today.year - 1
+
+
+class ResponseCache:
+    """On-disk cache of raw ESPN responses keyed by (league_id, year, week, endpoint).
+
+    Entries for finished seasons and finished weeks are kept forever; everything
+    else expires after `ttl` seconds.
+    """
+
+    def __init__(self, root=CACHE_DIR, ttl=CURRENT_WEEK_TTL):
+        self.root = root
+        self.ttl = ttl
+
+    def path(self, league_id, year, week, endpoint):
+        return self.root / str(league_id) / str(year) / f"week_{week:02d}" / f"{endpoint}.json"
+
+    def get(self, league_id, year, week, endpoint):
+        path = self.path(league_id, year, week, endpoint)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not entry["permanent"] and time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        return entry["data"]
+
+    def put(self, league_id, year, week, endpoint, data, permanent):
+        # A unique temp file per write, so concurrent fetchers never clobber each other
+        write_json({"fetched_at": time.time(), "permanent": permanent, "data": data},
+                   self.path(league_id, year, week, endpoint))
+
+
+def endpoint_key(method, params=None, headers=None, extend=""):
+    params = params or {}
+    view = params.get("view", "")
+    if isinstance(view, list):
+        view = "+".join(view)
+    request = json.dumps([extend, params, headers or {}], sort_keys=True)
+    digest = hashlib.sha1(request.encode()).hexdigest()[:12]
+    name = f"{method}{extend.replace('/', '_')}_{view}_{digest}"
+    return name.replace("/", "_")
+
+
+def install_cache(espn_request, league_id, year, cache=None, limiter=None):
+    # Wrap the two raw request methods every espn_api call funnels through.
+    # Instance attributes shadow the class methods, so helpers like
+    # get_league() and get_league_draft() pick up the cached versions too.
+    # Only cache misses go to ESPN, so only they wait on the rate limiter.
+    cache = cache or ResponseCache()
+    espn_request.current_week = None
+    finished_season = year < current_season()
+
+    def wrap(method_name):
+        fetch = getattr(espn_request, method_name)
+
+        def cached(params=None, headers=None, extend=""):
+            week = (params or {}).get("scoringPeriodId", 0)
+            endpoint = endpoint_key(method_name, params, headers, extend)
+            data = cache.get(league_id, year, week, endpoint)
+            if data is not None:
+                METRICS.count("cache_hits")
+                return data
+            METRICS.count("cache_misses")
+            if limiter:
+                limiter.acquire()
+            data = fetch(params=params, headers=headers, extend=extend)
+            current_week = espn_request.current_week
+            permanent = finished_season or (
+                week > 0 and current_week is not None and week < current_week
+            )
+            cache.put(league_id, year, week, endpoint, data, permanent)
+            return data
+
+        setattr(espn_request, method_name, cached)
+
+    wrap("league_get")
+    wrap("get")
+    return espn_request
+
+
+def cached_league(league_id, year, swid=None, espn_s2=None, cache=None, limiter=None, base_url=None):
+    from espn_api.football import League
+    from helpers.bulk import use_session
+
+    league = League(league_id=league_id, year=year, swid=swid, espn_s2=espn_s2, fetch_league=False)
+    use_session(league.espn_request)
+    instrument_requests(league.espn_request)
+    if base_url:
+        # The stand-in is the cache: every request has to reach it so a
+        # recording run captures the full set of responses
+        from helpers.standin import point_at
+        point_at(league.espn_request, base_url)
+        league.fetch_league()
+        return league
+
+    install_cache(league.espn_request, league_id, year, cache, limiter)
+    league.fetch_league()
+    # Weeks before the current one are final and can be cached for good
+    league.espn_request.current_week = league.current_week
+    return league
@@ -0,0 +1,39 @@
+import pickle
+
+from helpers.export import atomic_open
+from helpers.utilities import BASE_DIR
+
+STATE_DIR = BASE_DIR / "ignore" / "state"
+
+
+def dump_state(accumulators, high_water):
+    # Pickled straight away so later weeks can't leak into the snapshot
+    return pickle.dumps({
+        "accumulators": [type(acc).__name__ for acc in accumulators],
+        "state": [acc.get_state() for acc in accumulators],
+        "high_water": high_water,
+    })
+
+
+def save_checkpoint(path, snapshot):
+    with atomic_open(path, "wb") as f:
+        f.write(snapshot)
+
+
+def load_checkpoint(path, accumulators):
+    # Restores the saved aggregates into `accumulators` and returns the
+    # (year, week) high-water mark; (0, 0) means start from scratch
+    try:
+        with open(path, "rb") as f:
+            checkpoint = pickle.load(f)
+    except OSError:
+        print(f"No checkpoint at {path}, running a full rebuild")
+        return (0, 0)
+
+    if checkpoint["accumulators"] != [type(acc).__name__ for acc in accumulators]:
+        print(f"Checkpoint at {path} was written for different outputs, running a full rebuild")
+        return (0, 0)
+
+    for acc, state in zip(accumulators, checkpoint["state"]):
+        acc.set_state(state)
+    return tuple(checkpoint["high_water"])
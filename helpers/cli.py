@@ -0,0 +1,63 @@
+import argparse
+import os
+from pathlib import Path
+
+from helpers.metrics import METRICS_DIR
+from helpers.utilities import BASE_DIR
+
+# Only light imports here: scripts/whodat.py builds every subcommand's
+# options from these before it knows which script (and which of pandas,
+# numpy and espn_api) it needs.
+
+OUTPUT_DIR = BASE_DIR  # CSVs and JSON land in the project root by default
+MAX_PROCESSES = 4
+
+
+def add_output_arguments(parser):
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR,
+                        help="where the CSV and JSON outputs are written")
+    return parser
+
+
+def add_fetch_arguments(parser):
+    add_output_arguments(parser)
+    parser.add_argument("--standin", metavar="URL",
+                        help="send ESPN requests to a local stand-in (scripts/espn_standin.py)")
+    parser.add_argument("--metrics-dir", type=Path, default=METRICS_DIR,
+                        help="where the JSON run report and Prometheus file are written")
+    return parser
+
+
+def add_pipeline_arguments(parser):
+    add_fetch_arguments(parser)
+    parser.add_argument("--incremental", action="store_true",
+                        help="resume from the saved checkpoint and only fetch new weeks")
+    parser.add_argument("--from-archive", action="store_true",
+                        help="read seasons from the local archive instead of ESPN")
+    return parser
+
+
+def add_simulation_arguments(parser):
+    parser.add_argument("--simulations", type=int, default=100_000,
+                        help="random schedules (luck) or seasons (odds) to draw")
+    parser.add_argument("--processes", type=int, default=min(MAX_PROCESSES, os.cpu_count() or 1))
+    parser.add_argument("--seed", type=int, help="fix the random draws, for repeatable results")
+    return parser
+
+
+def add_luck_arguments(parser):
+    add_output_arguments(parser)
+    add_simulation_arguments(parser)
+    parser.add_argument("--standings", type=Path,
+                        help="standings timeline saved by get_history.py or build_all.py "
+                             "(default ignore/state/standings.pkl)")
+    return parser
+
+
+def add_odds_arguments(parser):
+    add_fetch_arguments(parser)
+    return add_simulation_arguments(parser)
+
+
+def parse_args(add_arguments=add_pipeline_arguments, description=None, argv=None):
+    return add_arguments(argparse.ArgumentParser(description=description)).parse_args(argv)
@@ -0,0 +1,156 @@
+import numpy as np
+
+from helpers.lineup import LINEUP_POSITIONS, solve_optimal_lineups
+
+# Codes 0-5 match helpers.lineup.POSITION_CODES, so the position column can
+# go straight into the optimal lineup solver; -1 is an unknown position
+POSITIONS = LINEUP_POSITIONS + ["DT", "DE", "LB", "DL", "CB", "S", "DB", "DP", "P", "HC", "OP", "TQB", "ER"]
+POSITION_CODES = {pos: code for code, pos in enumerate(POSITIONS)}
+
+# Slot codes are ESPN's lineupSlotId, plus FA for players off a roster
+SLOTS = ["QB", "TQB", "RB", "RB/WR", "WR", "WR/TE", "TE", "OP", "DT", "DE", "LB", "DL", "CB", "S", "DB", "DP",
+         "D/ST", "K", "P", "HC", "BE", "IR", "", "RB/WR/TE", "ER", "Rookie", "FA"]
+SLOT_CODES = {slot: code for code, slot in enumerate(SLOTS)}
+BENCH_SLOTS = [SLOT_CODES["BE"], SLOT_CODES["IR"]]
+
+LINE_DTYPE = np.dtype([
+    ("team_id", np.int16),
+    ("player_id", np.int32),
+    ("position", np.int8),
+    ("slot", np.int8),
+    ("points", np.float32),  # NaN where ESPN had no score
+])
+POINT_DECIMALS = 2  # ESPN scores are hundredths, so rounding a float32 back restores them exactly
+
+
+class CompactBox:
+    """One matchup: team ids (0 for a bye) and scores, with each side's lineup
+    as a view into the week's line array."""
+
+    __slots__ = ("home_team_id", "away_team_id", "home_score", "away_score", "home_lineup", "away_lineup")
+
+    def __init__(self, home_team_id, away_team_id, home_score, away_score, home_lineup, away_lineup):
+        self.home_team_id = home_team_id
+        self.away_team_id = away_team_id
+        self.home_score = home_score
+        self.away_score = away_score
+        self.home_lineup = home_lineup
+        self.away_lineup = away_lineup
+
+    def sides(self):
+        return [(self.home_team_id, self.home_score, self.home_lineup),
+                (self.away_team_id, self.away_score, self.away_lineup)]
+
+
+class CompactWeek:
+    """A week of box scores: the matchups, every player line in one structured
+    array (in box order, home side first) and the player names by id."""
+
+    __slots__ = ("boxes", "lines", "names")
+
+    def __init__(self, boxes, lines, names):
+        self.boxes = boxes
+        self.lines = lines
+        self.names = names
+
+    def __iter__(self):
+        return iter(self.boxes)
+
+    def __len__(self):
+        return len(self.boxes)
+
+
+def team_id_of(team):
+    return team.team_id if team else 0
+
+
+def compact_week(box_scores):
+    # Converts espn_api BoxScore/Matchup objects (or anything shaped like
+    # them) right after fetch, so no Player or Team object outlives it.
+    # Matchups from the pre-2019 scoreboard have no lineups.
+    if isinstance(box_scores, CompactWeek):
+        return box_scores
+
+    matchups = []
+    for box in box_scores:
+        lineups = [
+            [(p.playerId, p.name, p.position, p.slot_position, p.points) for p in getattr(box, side, None) or []]
+            for side in ("home_lineup", "away_lineup")
+        ]
+        matchups.append((team_id_of(box.home_team), team_id_of(box.away_team), box.home_score, box.away_score,
+                         *lineups))
+    return compact_matchups(matchups)
+
+
+def compact_matchups(matchups):
+    # `matchups` is [(home id, away id, home score, away score, home lineup,
+    # away lineup)], each lineup [(player id, name, position, slot, points)]
+    rows = []
+    names = {}
+    sides = []
+    for home_id, away_id, home_score, away_score, home_lineup, away_lineup in matchups:
+        bounds = []
+        for team_id, lineup in [(home_id, home_lineup), (away_id, away_lineup)]:
+            start = len(rows)
+            for player_id, name, position, slot, points in lineup:
+                names[player_id] = name
+                rows.append((
+                    team_id, player_id, POSITION_CODES.get(position, -1), SLOT_CODES.get(slot, -1),
+                    np.nan if points is None else points
+                ))
+            bounds.append((start, len(rows)))
+        sides.append((home_id, away_id, home_score, away_score, bounds))
+
+    lines = np.array(rows, dtype=LINE_DTYPE)
+    boxes = [
+        CompactBox(home_id, away_id, home_score, away_score, lines[slice(*home)], lines[slice(*away)])
+        for home_id, away_id, home_score, away_score, (home, away) in sides
+    ]
+    return CompactWeek(boxes, lines, names)
+
+
+def line_points(lines):
+    # Points back as float64, rounded to undo the float32 storage so sums
+    # match what the original scores would give
+    return np.round(lines["points"].astype(np.float64), POINT_DECIMALS)
+
+
+def is_starter(lines):
+    slots = lines["slot"]
+    return (slots != BENCH_SLOTS[0]) & (slots != BENCH_SLOTS[1])
+
+
+def line_sides(week):
+    # Index of the side (2 * box + 0 for home, 1 for away) each line belongs to
+    lengths = [len(lineup) for box in week for lineup in (box.home_lineup, box.away_lineup)]
+    return np.repeat(np.arange(len(lengths)), lengths), len(lengths)
+
+
+def starter_points(week):
+    # Starter points of every side, summed line by line like the scores were
+    points = line_points(week.lines)
+    points = np.where(is_starter(week.lines) & ~np.isnan(points), points, 0.0).tolist()
+    totals = []
+    start = 0
+    for box in week:
+        for lineup in (box.home_lineup, box.away_lineup):
+            stop = start + len(lineup)
+            totals.append(sum(points[start:stop]))
+            start = stop
+    return totals
+
+
+def position_name(code):
+    return POSITIONS[code] if code >= 0 else ""
+
+
+def slot_name(code):
+    return SLOTS[code] if code >= 0 else ""
+
+
+def optimal_points(week, slot_counts, flex_count):
+    # Optimal lineup score of every side of the week in one solver call
+    sides, n_sides = line_sides(week)
+    optimal, _ = solve_optimal_lineups(sides, week.lines["position"], line_points(week.lines), slot_counts,
+                                       flex_count, n_sides)
+    return optimal
@@ -0,0 +1,91 @@
+import pickle
+from collections import Counter, defaultdict
+
+from helpers.checkpoint import STATE_DIR, save_checkpoint
+
+DRAFT_INDEX_PATH = STATE_DIR / "draft_index.pkl"
+PICK_FIELDS = ("year", "owner_id", "player_id", "player_name", "round_num", "round_pick")
+
+
+class DraftIndex:
+    """Every draft pick of a league, with inverted player and owner lookups.
+    Seasons are added once; a completed draft never changes."""
+
+    def __init__(self):
+        self.picks = []                      # (year, owner_id, player_id, player_name, round_num, round_pick)
+        self.by_player = defaultdict(list)   # player_id -> pick numbers
+        self.by_owner = defaultdict(list)    # owner_id -> pick numbers
+        self.player_ids = defaultdict(set)   # lowercased player name -> player ids
+        self.owner_names = {}                # owner_id -> initials
+        self.positions = {}                  # player_id -> position, where one is known
+        self.years = set()
+
+    def add_season(self, year, picks):
+        # `picks` is [(owner_id, player_id, player_name, round_num, round_pick)]
+        if year in self.years or not picks:
+            return False
+        self.years.add(year)
+        for owner_id, player_id, player_name, round_num, round_pick in picks:
+            number = len(self.picks)
+            self.picks.append((year, owner_id, player_id, player_name, round_num, round_pick))
+            self.by_player[player_id].append(number)
+            self.by_owner[owner_id].append(number)
+            self.player_ids[player_name.lower()].add(player_id)
+        return True
+
+    # === QUERIES ===
+    def owner_id(self, owner):
+        # Accepts an owner id (as a number or a string of one) or the owner's initials
+        if owner in self.by_owner:
+            return owner
+        if str(owner).isdigit() and int(owner) in self.by_owner:
+            return int(owner)
+        matches = [owner_id for owner_id, name in self.owner_names.items() if name == owner]
+        if not matches:
+            raise KeyError(f"No drafts for owner {owner!r}")
+        return matches[0]
+
+    def player_picks(self, player):
+        # Every time a player (id or name) was drafted, oldest first
+        ids = [player] if player in self.by_player else self.player_ids.get(str(player).lower(), ())
+        numbers = sorted(number for player_id in ids for number in self.by_player[player_id])
+        return [dict(zip(PICK_FIELDS, self.picks[number])) for number in numbers]
+
+    def owner_profile(self, owner):
+        owner_id = self.owner_id(owner)
+        picks = [self.picks[number] for number in self.by_owner[owner_id]]
+        return {
+            "owner_id": owner_id,
+            "owner_name": self.owner_names.get(owner_id, "??"),
+            "picks": len(picks),
+            "seasons": sorted({pick[0] for pick in picks}),
+            "by_round": dict(sorted(Counter(pick[4] for pick in picks).items())),
+            "by_position": dict(Counter(self.positions.get(pick[2], "?") for pick in picks).most_common()),
+        }
+
+    def top_repeats(self, owner, n=5):
+        # The owner's most drafted players by name (as shown on the site),
+        # ties in the order first drafted
+        owner_id = self.owner_id(owner)
+        counts = Counter()
+        years = defaultdict(list)
+        for number in self.by_owner[owner_id]:
+            year, _, _, player_name, _, _ = self.picks[number]
+            counts[player_name] += 1
+            years[player_name].append(year)
+        return [
+            {"player_name": player_name, "times": times, "seasons": sorted(years[player_name])}
+            for player_name, times in counts.most_common(n)
+        ]
+
+    def owners(self):
+        return list(self.by_owner)
+
+    # === PERSISTENCE ===
+    def save(self, path=DRAFT_INDEX_PATH):
+        save_checkpoint(path, pickle.dumps(self))
+
+    @classmethod
+    def load(cls, path=DRAFT_INDEX_PATH):
+        with open(path, "rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,172 @@
+import csv
+import heapq
+import json
+import math
+import os
+import pickle
+import tempfile
+from contextlib import contextmanager
+from itertools import chain, islice
+from pathlib import Path
+
+CHUNK_ROWS = 100_000  # rows held in memory per sorted run before it spills to disk
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+# === ATOMIC WRITES ===
+@contextmanager
+def atomic_open(path, mode="w", **kwargs):
+    # Writes to a temp file next to `path` and renames it over `path` only
+    # once the block finishes, so a reader (or the site) sees the old file or
+    # the new one, never half of one. On an error the old file is kept.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if "b" not in mode:
+        kwargs.setdefault("encoding", "utf-8")
+        kwargs.setdefault("newline", "" if path.suffix == ".csv" else None)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+# === VALUES ===
+def is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def plain(value):
+    # numpy scalars to Python ones, NaN to an empty cell / null
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        value = value.item()
+    return None if is_missing(value) else value
+
+
+# === SORTING ===
+class SortKey:
+    """Orders rows like DataFrame.sort_values: column by column, every column
+    in the same direction, missing values last either way."""
+
+    __slots__ = ("values", "descending")
+
+    def __init__(self, values, descending):
+        self.values = values
+        self.descending = descending
+
+    def __lt__(self, other):
+        for a, b in zip(self.values, other.values):
+            a_missing, b_missing = is_missing(a), is_missing(b)
+            if a_missing or b_missing:
+                if a_missing != b_missing:
+                    return b_missing
+                continue
+            if a != b:
+                return a > b if self.descending else a < b
+        return False
+
+    def __eq__(self, other):
+        # heapq.merge only falls back to run order on keys that compare equal
+        return not (self < other or other < self)
+
+
+def sort_key(sort_by, ascending=True):
+    columns = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+    return lambda row: SortKey([row.get(column) for column in columns], not ascending)
+
+
+def spill(rows, directory):
+    # One sorted run, pickled row by row so it can be read back lazily
+    with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".run", delete=False) as f:
+        pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+        for row in rows:
+            pickler.dump(row)
+    return f.name
+
+
+def read_run(path):
+    with open(path, "rb") as f:
+        unpickler = pickle.Unpickler(f)
+        while True:
+            try:
+                yield unpickler.load()
+            except EOFError:
+                return
+
+
+def external_sort(rows, key, chunk_rows=CHUNK_ROWS, directory=None):
+    """Yields `rows` sorted by `key` while holding at most `chunk_rows` of them.
+
+    Rows are sorted a chunk at a time; a chunk that doesn't fit is spilled
+    to a temp file as a sorted run and the runs are merged lazily at the
+    end. Both steps are stable, so rows with equal keys keep their order.
+    Input that fits in one chunk never touches the disk.
+    """
+    rows = iter(rows)
+    chunk = sorted(islice(rows, chunk_rows), key=key)
+    if len(chunk) < chunk_rows:
+        yield from chunk
+        return
+
+    with tempfile.TemporaryDirectory(dir=directory, prefix="export-") as tmp:
+        runs = [spill(chunk, tmp)]
+        del chunk
+        while True:
+            chunk = sorted(islice(rows, chunk_rows), key=key)
+            if not chunk:
+                break
+            runs.append(spill(chunk, tmp))
+        yield from heapq.merge(*(read_run(run) for run in runs), key=key)
+
+
+# === WRITERS ===
+def write_csv(rows, f):
+    first = next(rows)
+    writer = csv.DictWriter(f, fieldnames=list(first), lineterminator="\n")
+    writer.writeheader()
+    count = 0
+    for row in chain([first], rows):
+        writer.writerow({column: plain(value) for column, value in row.items()})
+        count += 1
+    return count
+
+
+def write_ndjson(rows, f):
+    count = 0
+    for row in rows:
+        f.write(json.dumps({column: plain(value) for column, value in row.items()}, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_rows(rows, path, sort_by=None, ascending=True, chunk_rows=CHUNK_ROWS):
+    """Streams `rows` (any iterable of dicts) to `path` and returns how many
+    were written, or None (and nothing is written) if there were none.
+
+    The format follows the suffix: newline-delimited JSON for .ndjson or
+    .jsonl, CSV otherwise, with the first row's keys as the header. With
+    `sort_by` the rows go through external_sort first, so only `chunk_rows`
+    of them are ever in memory; without it each row is written as it comes.
+    """
+    path = Path(path)
+    rows = iter(rows)
+    if sort_by:
+        rows = external_sort(rows, sort_key(sort_by, ascending), chunk_rows, directory=path.parent)
+    first = next(rows, None)
+    if first is None:
+        return None
+    rows = chain([first], rows)
+
+    with atomic_open(path) as f:
+        if path.suffix in NDJSON_SUFFIXES:
+            return write_ndjson(rows, f)
+        return write_csv(rows, f)
+
+
+def write_json(data, path, **kwargs):
+    with atomic_open(path) as f:
+        json.dump(data, f, **kwargs)
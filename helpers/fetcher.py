@@ -0,0 +1,85 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers.cache import cached_league
+from helpers.metrics import METRICS
+
+MAX_WORKERS = 4
+REQUESTS_PER_SECOND = 5.0
+BURST = 5
+RETRIES = 3
+BACKOFF = 1.0  # seconds before the first retry, doubled on every attempt
+
+
+class TokenBucket:
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_permanent_error(error):
+    # Bad credentials or a missing league will not fix themselves on retry
+    return type(error).__name__ in ("ESPNAccessDenied", "ESPNInvalidLeague")
+
+
+class Fetcher:
+    """Bounded thread pool for ESPN calls with rate limiting and retry/backoff.
+
+    Results always come back in the order the work was submitted, so the
+    pipeline sees seasons and weeks in (year, week) order no matter which
+    request finishes first.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, rate=REQUESTS_PER_SECOND, burst=BURST,
+                 retries=RETRIES, backoff=BACKOFF, base_url=None, cache=None):
+        self.max_workers = max_workers
+        self.base_url = base_url  # local ESPN stand-in, see helpers/standin.py
+        self.cache = cache        # ResponseCache, defaults to the shared one
+        self.limiter = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+
+    def call(self, fn, *args):
+        for attempt in range(self.retries + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == self.retries or is_permanent_error(e):
+                    raise
+                METRICS.count("retries")
+                delay = self.backoff * 2 ** attempt
+                time.sleep(delay + random.uniform(0, delay / 2))
+
+    def map(self, fn, items):
+        # Yields (item, result, error) in input order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [(item, pool.submit(self.call, fn, item)) for item in items]
+            for item, future in futures:
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
+
+    def leagues(self, league_id, years, swid=None, espn_s2=None, cache=None):
+        def load(year):
+            with METRICS.time("load_season", year):
+                return cached_league(league_id, year, swid=swid, espn_s2=espn_s2,
+                                     cache=cache or self.cache, limiter=self.limiter, base_url=self.base_url)
+        return self.map(load, years)
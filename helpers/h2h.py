@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+
+from helpers.export import write_json
+
+
+class HeadToHeadMatrix:
+    """Owner x owner results held in dense arrays indexed by interned owner ids.
+
+    Cell [i, j] is owner i's record against owner j. New owners grow the
+    arrays; new games (regular season, playoffs, new seasons) are folded in
+    place with np.add.at.
+    """
+
+    STATS = ("wins", "losses", "ties", "points_for", "points_against")
+
+    def __init__(self, capacity=16):
+        self.index = {}      # owner id -> row/column
+        self.owner_ids = []
+        self.wins = np.zeros((capacity, capacity), dtype=np.int32)
+        self.losses = np.zeros((capacity, capacity), dtype=np.int32)
+        self.ties = np.zeros((capacity, capacity), dtype=np.int32)
+        self.points_for = np.zeros((capacity, capacity), dtype=np.float64)
+        self.points_against = np.zeros((capacity, capacity), dtype=np.float64)
+
+    def intern(self, owner_id):
+        idx = self.index.get(owner_id)
+        if idx is None:
+            idx = self.index[owner_id] = len(self.owner_ids)
+            self.owner_ids.append(owner_id)
+            capacity = len(self.wins)
+            if idx >= capacity:
+                for stat in self.STATS:
+                    grown = np.zeros((capacity * 2, capacity * 2), dtype=getattr(self, stat).dtype)
+                    grown[:capacity, :capacity] = getattr(self, stat)
+                    setattr(self, stat, grown)
+        return idx
+
+    def add_games(self, home_ids, away_ids, home_scores, away_scores):
+        home = np.array([self.intern(owner_id) for owner_id in home_ids], dtype=np.int64)
+        away = np.array([self.intern(owner_id) for owner_id in away_ids], dtype=np.int64)
+        home_scores = np.asarray(home_scores, dtype=np.float64)
+        away_scores = np.asarray(away_scores, dtype=np.float64)
+
+        # Both perspectives of every game in one scatter per stat
+        rows = np.r_[home, away]
+        cols = np.r_[away, home]
+        scored = np.r_[home_scores, away_scores]
+        allowed = np.r_[away_scores, home_scores]
+        np.add.at(self.points_for, (rows, cols), scored)
+        np.add.at(self.points_against, (rows, cols), allowed)
+        np.add.at(self.wins, (rows, cols), scored > allowed)
+        np.add.at(self.losses, (rows, cols), scored < allowed)
+        np.add.at(self.ties, (rows, cols), scored == allowed)
+
+    def games(self):
+        n = len(self.owner_ids)
+        return (self.wins + self.losses + self.ties)[:n, :n]
+
+    def pairs(self):
+        # (owner index, opponent index) for every pair that has met
+        return np.argwhere(self.games() > 0)
+
+    def record(self, i, j):
+        games = int(self.wins[i, j] + self.losses[i, j] + self.ties[i, j])
+        return {
+            'Wins': int(self.wins[i, j]), 'Losses': int(self.losses[i, j]), 'Ties': int(self.ties[i, j]),
+            'Games Played': games,
+            'Points For': float(self.points_for[i, j]),
+            'Points Against': float(self.points_against[i, j])
+        }
+
+
+def write_owner_slices(matrix, owner_names, directory):
+    # index.json lists the owners; <n>.json holds one owner's row of the
+    # matrix so the page only downloads the owner being viewed. `owner_names`
+    # is indexed by owner id (OwnerIndex.names).
+    os.makedirs(directory, exist_ok=True)
+    games = matrix.games()
+    owners = []
+    for i, owner_id in enumerate(matrix.owner_ids):
+        opponents = []
+        for j in np.flatnonzero(games[i]):
+            rec = matrix.record(i, j)
+            opponents.append({
+                "opponent": owner_names[matrix.owner_ids[j]],
+                "games": rec['Games Played'],
+                "wins": rec['Wins'],
+                "losses": rec['Losses'],
+                "ties": rec['Ties'],
+                "points_for": round(rec['Points For'], 2),
+                "points_against": round(rec['Points Against'], 2),
+                "win_pct": round(100 * rec['Wins'] / rec['Games Played'], 2),
+            })
+        if not opponents:
+            continue
+        opponents.sort(key=lambda row: row["opponent"])
+        name = owner_names[owner_id]
+        write_json({"owner": name, "opponents": opponents}, os.path.join(directory, f"{i}.json"),
+                   separators=(",", ":"))
+        owners.append({"name": name, "file": f"{i}.json"})
+
+    owners.sort(key=lambda owner: owner["name"])
+    write_json(owners, os.path.join(directory, "index.json"), separators=(",", ":"))
@@ -0,0 +1,57 @@
+import heapq
+
+TOP_K = 10
+
+
+class Leaderboard:
+    """Keeps the best `k` entries seen so far in a bounded heap.
+
+    Ties go to the entry that was pushed first, matching the old running
+    maxima that only replaced a record on a strictly better score.
+    """
+
+    def __init__(self, k=TOP_K, largest=True):
+        self.k = k
+        self.largest = largest
+        self.heap = []
+        self.pushed = 0
+
+    def push(self, points, entry):
+        self.pushed += 1
+        # heap[0] is the weakest kept entry; the sequence number breaks ties
+        # so the dict entries themselves are never compared
+        item = (points if self.largest else -points, -self.pushed, entry)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def entries(self):
+        return [entry for _, _, entry in sorted(self.heap, reverse=True)]
+
+
+class Leaderboards:
+    """Top-k and bottom-k boards for every (board, slice) pair, filled in one pass."""
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.boards = {}  # (board, slice) -> (top, bottom)
+
+    def add(self, board, points, entry, slices=()):
+        for slice_name in ("All",) + tuple(slices):
+            pair = self.boards.get((board, slice_name))
+            if pair is None:
+                pair = self.boards[(board, slice_name)] = (Leaderboard(self.k, True), Leaderboard(self.k, False))
+            pair[0].push(points, entry)
+            pair[1].push(points, entry)
+
+    def slices(self, board):
+        return [slice_name for b, slice_name in self.boards if b == board]
+
+    def top(self, board, slice_name="All"):
+        pair = self.boards.get((board, slice_name))
+        return pair[0].entries() if pair else []
+
+    def bottom(self, board, slice_name="All"):
+        pair = self.boards.get((board, slice_name))
+        return pair[1].entries() if pair else []
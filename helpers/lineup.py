@@ -0,0 +1,51 @@
+import numpy as np
+
+LINEUP_POSITIONS = ["QB", "RB", "WR", "TE", "K", "D/ST"]
+FLEX_POSITIONS = ["RB", "WR", "TE"]
+POSITION_CODES = {pos: code for code, pos in enumerate(LINEUP_POSITIONS)}
+
+
+def rank_within(keys, points, mask):
+    # 0-based rank of each masked line by points (descending) within its key;
+    # lines outside the mask get a rank no slot can reach
+    rank = np.full(len(points), np.iinfo(np.int64).max)
+    idx = np.flatnonzero(mask)
+    if not len(idx):
+        return rank
+    order = idx[np.lexsort((-points[idx], keys[idx]))]
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    block_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    rank[order] = np.arange(len(order)) - block_start
+    return rank
+
+
+def solve_optimal_lineups(group, position, points, slot_counts, flex_count, n_groups=None):
+    """Best possible starting lineup for many team-weeks at once.
+
+    `group` says which team-week each player line belongs to, `position`
+    holds POSITION_CODES (any other code never starts) and `points` is NaN
+    where ESPN had no score. Every position is filled with its highest
+    scorers first, then the flex spots take the best remaining RB/WR/TE.
+    Negative and missing scores never start. Returns (optimal points per group, mask of chosen lines).
+    """
+    group = np.asarray(group, dtype=np.int64)
+    position = np.asarray(position, dtype=np.int64)
+    points = np.asarray(points, dtype=np.float64)
+    if n_groups is None:
+        n_groups = int(group.max()) + 1 if len(group) else 0
+
+    n_positions = len(LINEUP_POSITIONS)
+    eligible = (points >= 0) & (position >= 0) & (position < n_positions)  # NaN compares False
+    counts = np.array([slot_counts.get(pos, 0) for pos in LINEUP_POSITIONS])
+
+    rank = rank_within(group * n_positions + position, points, eligible)
+    chosen = eligible & (rank < counts[np.clip(position, 0, n_positions - 1)])
+
+    flex_codes = [POSITION_CODES[pos] for pos in FLEX_POSITIONS]
+    flex_pool = eligible & ~chosen & np.isin(position, flex_codes)
+    chosen |= flex_pool & (rank_within(group, points, flex_pool) < flex_count)
+
+    optimal = np.bincount(group[chosen], weights=points[chosen], minlength=n_groups)
+    return optimal, chosen
+
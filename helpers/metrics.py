@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from helpers.export import atomic_open
+from helpers.utilities import BASE_DIR
+
+METRICS_DIR = BASE_DIR / "ignore" / "metrics"
+PROMETHEUS_PREFIX = "whodat_"
+
+# Counter name -> help text; anything counted must be listed here
+COUNTERS = {
+    "espn_requests": "Requests sent to ESPN (or the stand-in)",
+    "espn_response_bytes": "Bytes of JSON received from ESPN, as re-encoded",
+    "espn_request_seconds": "Seconds spent waiting on ESPN responses",
+    "cache_hits": "ESPN responses served from the local cache",
+    "cache_misses": "ESPN responses not in the local cache",
+    "retries": "Failed calls retried after a backoff",
+    "errors": "Seasons or weeks that failed for good",
+    "rows_written": "Rows written to output files",
+}
+
+
+class Metrics:
+    """Counters and stage timings for one run, shared by every thread. Stage
+    time is busy time: stages running on several threads add up."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, **labels):
+        with self.lock:
+            self.labels = labels
+            self.started = time.time()
+            self.counters = {}     # (name, labels) -> value
+            self.stages = {}       # stage -> [calls, seconds]
+            self.weeks = {}        # (year, week) -> {stage: seconds}
+            self.failures = []
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def time(self, stage, year=None, week=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                calls = self.stages.setdefault(stage, [0, 0.0])
+                calls[0] += 1
+                calls[1] += seconds
+                if year is not None:
+                    by_stage = self.weeks.setdefault((year, week or 0), {})
+                    by_stage[stage] = by_stage.get(stage, 0.0) + seconds
+
+    def error(self, stage, error, year=None, week=None):
+        self.count("errors", stage=stage)
+        with self.lock:
+            self.failures.append({"stage": stage, "year": year, "week": week,
+                                  "error": f"{type(error).__name__}: {error}"})
+
+    # === REPORTS ===
+    def report(self):
+        with self.lock:
+            return {
+                "labels": self.labels,
+                "started": self.started,
+                "wall_seconds": round(time.time() - self.started, 3),
+                "counters": [
+                    {"name": name, **dict(labels), "value": round(value, 3)}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "stages": {
+                    stage: {"calls": calls, "seconds": round(seconds, 3)}
+                    for stage, (calls, seconds) in sorted(self.stages.items())
+                },
+                "weeks": [
+                    {"year": year, "week": week, **{stage: round(s, 3) for stage, s in stages.items()}}
+                    for (year, week), stages in sorted(self.weeks.items())
+                ],
+                "failures": list(self.failures),
+            }
+
+    def prometheus(self):
+        # Text exposition format, for a node_exporter textfile collector
+        report = self.report()
+        run_labels = report["labels"]
+
+        def escape(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def sample(name, value, **labels):
+            labels = {**run_labels, **labels}
+            text = ",".join(f'{key}="{escape(val)}"' for key, val in sorted(labels.items()))
+            return f"{PROMETHEUS_PREFIX}{name}{{{text}}} {value}" if text else f"{PROMETHEUS_PREFIX}{name} {value}"
+
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}run_start_timestamp_seconds When the run started",
+            f"# TYPE {PROMETHEUS_PREFIX}run_start_timestamp_seconds gauge",
+            sample("run_start_timestamp_seconds", round(report["started"], 3)),
+            f"# HELP {PROMETHEUS_PREFIX}run_seconds Wall time of the run",
+            f"# TYPE {PROMETHEUS_PREFIX}run_seconds gauge",
+            sample("run_seconds", report["wall_seconds"]),
+        ]
+        # Every value is a total for this run only, so they are all gauges
+        for name, help_text in COUNTERS.items():
+            lines += [f"# HELP {PROMETHEUS_PREFIX}{name} {help_text}",
+                      f"# TYPE {PROMETHEUS_PREFIX}{name} gauge"]
+            counted = [counter for counter in report["counters"] if counter["name"] == name]
+            for counter in counted or [{"name": name, "value": 0}]:
+                labels = {key: val for key, val in counter.items() if key not in ("name", "value")}
+                lines.append(sample(name, counter["value"], **labels))
+        for name, field, help_text in [("stage_seconds", "seconds", "Busy seconds per pipeline stage"),
+                                       ("stage_calls", "calls", "Calls per pipeline stage")]:
+            lines += [f"# HELP {PROMETHEUS_PREFIX}{name} {help_text}",
+                      f"# TYPE {PROMETHEUS_PREFIX}{name} gauge"]
+            for stage, stats in report["stages"].items():
+                lines.append(sample(name, stats[field], stage=stage))
+        return "\n".join(lines) + "\n"
+
+    def write(self, name, directory=METRICS_DIR, **labels):
+        # <name>.json is the run report, <name>.prom the scrape file; both
+        # are replaced atomically so a scraper never reads half a file.
+        # `name` and `labels` end up as labels on every sample.
+        with self.lock:
+            self.labels = {"job": name, **self.labels, **labels}
+        directory = Path(directory)
+        for path, text in [(directory / f"{name}.json", json.dumps(self.report(), indent=2) + "\n"),
+                           (directory / f"{name}.prom", self.prometheus())]:
+            with atomic_open(path) as f:
+                f.write(text)
+        print(f"Run report saved to {directory / name}.json")
+
+
+METRICS = Metrics()  # one per process
+
+
+def instrument_requests(espn_request, metrics=METRICS):
+    # Count every request that actually leaves for ESPN. Wraps the same two
+    # methods as install_cache, underneath it, so cache hits never get here.
+    def wrap(method_name):
+        fetch = getattr(espn_request, method_name)
+
+        def counted(params=None, headers=None, extend=""):
+            start = time.perf_counter()
+            try:
+                data = fetch(params=params, headers=headers, extend=extend)
+            finally:
+                metrics.count("espn_requests")
+                metrics.count("espn_request_seconds", time.perf_counter() - start)
+            metrics.count("espn_response_bytes", len(json.dumps(data)))
+            return data
+
+        setattr(espn_request, method_name, counted)
+
+    wrap("league_get")
+    wrap("get")
+    return espn_request
@@ -0,0 +1,107 @@
+import pickle
+
+from helpers.checkpoint import STATE_DIR, save_checkpoint
+from helpers.pipeline import Accumulator
+
+OWNERS_PATH = STATE_DIR / "owners.pkl"
+UNKNOWN = "??"
+
+
+def owner_initials(owner):
+    first, last = owner.get('firstName') or "", owner.get('lastName') or ""
+    return f"{first[:1]}{last[:1]}".upper()
+
+
+class OwnerIndex(Accumulator):
+    """Every owner of a league as a dense integer id, the join key of every output.
+
+    Owners are interned by ESPN member GUID the first time a season they
+    play in starts, so ids run 0, 1, 2, ... in order of first appearance and
+    stay the same across seasons, team ids and outputs. A team without an
+    owner GUID is an owner of its own for that one season. Run it before the
+    accumulators that read it; they keep a reference to it (in their
+    `config`) and the checkpoint restores it in place.
+
+    Names are the owner's initials, upper-cased. owner_map.json can name an
+    owner by GUID, or by team id for a team ESPN has no name for.
+    """
+
+    config = ("years", "owner_map")
+
+    def __init__(self, years=(), owner_map=None):
+        self.years = years
+        self.owner_map = owner_map or {}
+        self.keys = []      # owner id -> GUID, or (year, team id) for a team without one
+        self.names = []     # owner id -> display name
+        self.seasons = []   # owner id -> years played
+        self.by_key = {}    # GUID -> owner id
+        self.by_team = {}   # year -> {team id: owner id}
+
+    def wants_year(self, year):
+        return True
+
+    def weeks(self, league):
+        return []
+
+    def start_season(self, league):
+        self.add_season(league.year, league.teams)
+
+    def add_season(self, year, teams):
+        for team in sorted(teams, key=lambda team: team.team_id):
+            self.add_team(year, team)
+        return self.season(year)
+
+    def add_team(self, year, team):
+        owner = team.owners[0] if team.owners else {}
+        key = owner.get('id') or (year, team.team_id)
+        owner_id = self.by_key.get(key)
+        if owner_id is None:
+            owner_id = self.by_key[key] = len(self.keys)
+            self.keys.append(key)
+            self.names.append(UNKNOWN)
+            self.seasons.append([])
+        name = self.owner_map.get(str(key)) or owner_initials(owner) or self.owner_map.get(str(team.team_id))
+        if name:
+            self.names[owner_id] = name  # the latest season's name wins
+        if year not in self.seasons[owner_id]:
+            self.seasons[owner_id].append(year)
+        self.by_team.setdefault(year, {})[team.team_id] = owner_id
+        return owner_id
+
+    # === LOOKUPS ===
+    def owner(self, year, team_id):
+        return self.by_team.get(year, {}).get(team_id)
+
+    def season(self, year):
+        # team id -> owner id for one season
+        return self.by_team.get(year, {})
+
+    def name(self, owner_id):
+        return UNKNOWN if owner_id is None else self.names[owner_id]
+
+    def name_of(self, year, team_id):
+        return self.name(self.owner(year, team_id))
+
+    def espn_id(self, owner_id):
+        key = self.keys[owner_id]
+        return key if isinstance(key, str) else ""
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rows(self):
+        return [{
+            'Owner ID': owner_id,
+            'Owner Name': self.names[owner_id],
+            'ESPN ID': self.espn_id(owner_id),
+            'Seasons': " / ".join(map(str, sorted(self.seasons[owner_id])))
+        } for owner_id in range(len(self.keys))]
+
+    # === PERSISTENCE ===
+    def save(self, path=OWNERS_PATH):
+        save_checkpoint(path, pickle.dumps(self))
+
+    @classmethod
+    def load(cls, path=OWNERS_PATH):
+        with open(path, "rb") as f:
+            return pickle.load(f)
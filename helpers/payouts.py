@@ -0,0 +1,186 @@
+import json
+
+import numpy as np
+
+from helpers.compact import LINE_DTYPE, POSITION_CODES, SLOT_CODES, compact_week, line_points, line_sides
+from helpers.lineup import rank_within
+
+# Payout scores count every line off the bench, IR included, that has points
+BENCH = SLOT_CODES["BE"]
+
+
+class SeasonLines:
+    """Every player line of a season's weeks in one table. A side is one
+    team-week, numbered in box order (home first) through the weeks."""
+
+    def __init__(self, weeks):
+        tables, sides, side_week, side_team, self.names = [], [], [], [], {}
+        for week in sorted(weeks):
+            box_scores = compact_week(weeks[week])
+            line_side, n_sides = line_sides(box_scores)
+            tables.append(box_scores.lines)
+            sides.append(line_side + len(side_week))
+            side_week.extend([week] * n_sides)
+            side_team.extend(team_id for box in box_scores for team_id in (box.home_team_id, box.away_team_id))
+            self.names.update(box_scores.names)
+
+        table = np.concatenate(tables) if tables else np.empty(0, dtype=LINE_DTYPE)
+        self.side = np.concatenate(sides) if sides else np.empty(0, dtype=np.int64)
+        self.side_week = np.array(side_week, dtype=np.int64)
+        self.side_team = np.array(side_team, dtype=np.int64)
+        self.week = self.side_week[self.side]
+        self.player_id = table["player_id"]
+        self.position = table["position"]
+        self.slot = table["slot"]
+        self.points = line_points(table)
+
+    def correct(self, week, player_id, points):
+        # Apply an ESPN stat correction in place; returns the lines changed
+        hit = (self.week == week) & (self.player_id == player_id)
+        self.points[hit] = np.nan if points is None else points
+        return int(hit.sum())
+
+
+# === RULES: one class per payout type, registered by its config name ===
+PAYOUT_RULES = {}
+
+
+def payout_rule(name):
+    def register(cls):
+        PAYOUT_RULES[name] = cls
+        return cls
+    return register
+
+
+def position_code(pos):
+    # Positions no line can have (e.g. "FLEX") never match anything
+    return POSITION_CODES.get(pos, -2)
+
+
+def side_totals(season, picks, n_sides):
+    # Sums each side's picked lines in the order given, like a running total
+    return np.bincount(season.side[picks], weights=season.points[picks], minlength=n_sides)
+
+
+class PayoutRule:
+    """A weekly payout rule compiled from its config. score() rates every
+    side at once: (score per side, NaN where the side can't win; indices of
+    the lines that make up each score, in display order)."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def text(self):
+        raise NotImplementedError
+
+    def score(self, season, lines):
+        raise NotImplementedError
+
+
+@payout_rule("highest_total_points")
+class HighestTotalPoints(PayoutRule):
+    def text(self):
+        return "Highest Scoring Team"
+
+    def score(self, season, lines):
+        n_sides = len(season.side_week)
+        return side_totals(season, lines, n_sides), lines
+
+
+@payout_rule("top_player_overall")
+class TopPlayerOverall(PayoutRule):
+    def text(self):
+        return "Top Individual Player Score"
+
+    def score(self, season, lines):
+        n_sides = len(season.side_week)
+        best = lines[rank_within(season.side[lines], season.points[lines], np.ones(len(lines), dtype=bool)) == 0]
+        scores = np.full(n_sides, np.nan)
+        scores[season.side[best]] = season.points[best]
+        return scores, best
+
+
+def top_of_position(season, lines, pos, count):
+    # The `count` best lines of one position per side, best first, and
+    # whether the side had that many
+    lines = lines[season.position[lines] == position_code(pos)]
+    rank = rank_within(season.side[lines], season.points[lines], np.ones(len(lines), dtype=bool))
+    top = lines[rank < count]
+    top = top[np.lexsort((rank[rank < count], season.side[top]))]
+    filled = np.bincount(season.side[top], minlength=len(season.side_week)) == count
+    return top, filled
+
+
+@payout_rule("top_slot")
+class TopSlot(PayoutRule):
+    def text(self):
+        return f"Top {', '.join(f'{v}×{k}' for k, v in self.config['slots'].items())} Score"
+
+    def score(self, season, lines):
+        # Each side's best position group wins; ties go to the first listed
+        n_sides = len(season.side_week)
+        groups = [top_of_position(season, lines, pos, count) for pos, count in self.config["slots"].items()]
+        totals = np.array([np.where(filled, side_totals(season, top, n_sides), -np.inf) for top, filled in groups])
+        choice = totals.argmax(axis=0) if groups else np.zeros(n_sides, dtype=np.int64)
+        scores = totals.max(axis=0) if groups else np.full(n_sides, -np.inf)
+        scores = np.where(scores > -1, scores, np.nan)
+        # Only the chosen group's lines, each side's together
+        picks = [top[choice[season.side[top]] == i] for i, (top, _) in enumerate(groups)]
+        picks = np.concatenate(picks or [lines[:0]])
+        return scores, picks[np.argsort(season.side[picks], kind="stable")]
+
+
+@payout_rule("top_slot_combo")
+class TopSlotCombo(PayoutRule):
+    def text(self):
+        return f"Top Combo: {', '.join(f'{v}×{k}' for k, v in self.config['slots'].items())}"
+
+    def score(self, season, lines):
+        # Every listed position must be filled; the score adds them in order
+        n_sides = len(season.side_week)
+        groups = [top_of_position(season, lines, pos, count) for pos, count in self.config["slots"].items()]
+        picks = np.concatenate([top for top, _ in groups] or [lines[:0]])
+        picks = picks[np.argsort(season.side[picks], kind="stable")]
+        filled = np.logical_and.reduce([filled for _, filled in groups]) if groups else np.ones(n_sides, dtype=bool)
+        return np.where(filled, side_totals(season, picks, n_sides), np.nan), picks
+
+
+# === SCHEDULE: the compiled rules of a payout config ===
+class PayoutSchedule:
+    """Weekly payout rules compiled once. Weeks sharing a rule are scored
+    together, so a season is a single pass per distinct rule."""
+
+    def __init__(self, payout_config):
+        self.rules = {}  # config key -> (rule, weeks)
+        for week, config in payout_config["weekly_payouts"].items():
+            if config["type"] not in PAYOUT_RULES:
+                raise ValueError(f"Unknown payout type {config['type']!r} for week {week}")
+            key = json.dumps(config, sort_keys=True)
+            if key not in self.rules:
+                self.rules[key] = (PAYOUT_RULES[config["type"]](config), [])
+            self.rules[key][1].append(int(week))
+
+    def weeks(self):
+        return sorted(week for _, weeks in self.rules.values() for week in weeks)
+
+    def winners(self, season):
+        # The best side of every scheduled week, first in box order on ties
+        counted = (season.slot != BENCH) & ~np.isnan(season.points)
+        results = []
+        for rule, weeks in self.rules.values():
+            lines = np.flatnonzero(counted & np.isin(season.week, weeks))
+            scores, picks = rule.score(season, lines)
+            # Byes (team id 0) never win
+            candidates = np.flatnonzero(np.isin(season.side_week, weeks) & (season.side_team != 0) & ~np.isnan(scores))
+            order = candidates[np.lexsort((candidates, -scores[candidates], season.side_week[candidates]))]
+            first = np.diff(season.side_week[order], prepend=-1) != 0
+            for side in order[first].tolist():
+                players = picks[season.side[picks] == side]
+                results.append({
+                    "week": int(season.side_week[side]),
+                    "payout_text": rule.text(),
+                    "team_id": int(season.side_team[side]),
+                    "points": float(scores[side]),
+                    "players": [season.names.get(player_id) for player_id in season.player_id[players].tolist()],
+                })
+        return sorted(results, key=lambda result: result["week"])
@@ -0,0 +1,169 @@
+from functools import partial
+from pathlib import Path
+
+from helpers.bulk import fetch_season
+from helpers.cache import current_season
+from helpers.checkpoint import dump_state, load_checkpoint, save_checkpoint
+from helpers.compact import compact_week
+from helpers.export import write_rows
+from helpers.fetcher import Fetcher
+from helpers.metrics import METRICS
+
+
+class Accumulator:
+    """Receives every season and week from run_pipeline and builds one output."""
+
+    years = ()        # seasons this accumulator cares about
+    sort_by = None
+    ascending = True
+    config = ("years",)  # constructor settings, never restored from a checkpoint
+
+    def wants_year(self, year):
+        return year in self.years
+
+    def weeks(self, league):
+        return range(1, league.settings.reg_season_count + 1)
+
+    def start_season(self, league):
+        pass
+
+    def add_week(self, league, week, box_scores):
+        pass
+
+    def end_season(self, league):
+        pass
+
+    def rows(self):
+        return []
+
+    def get_state(self):
+        return {k: v for k, v in vars(self).items() if k not in self.config}
+
+    def set_state(self, state):
+        vars(self).update(state)
+
+
+def completed_weeks(league, weeks):
+    # Never ask ESPN for weeks past the current one: box_scores() silently
+    # clamps them to the current week and scoreboard() returns empty games
+    return [week for week in weeks if week <= league.current_week]
+
+
+def is_final(league, week):
+    return league.year < current_season() or week < league.current_week
+
+
+def fetch_week(league, week):
+    # Box scores (with lineups) only exist from 2019 on; older seasons only
+    # have the scoreboard, which carries the same teams and scores. Either
+    # way the week is turned into compact records before it goes anywhere.
+    with METRICS.time("fetch_week", league.year, week):
+        box_scores = league.box_scores(week) if league.year >= 2019 else league.scoreboard(week)
+    with METRICS.time("compact_week", league.year, week):
+        return compact_week(box_scores)
+
+
+def fetch_weeks(fetcher, league, weeks):
+    # Yields (week, CompactWeek, error) in week order. One request for the
+    # whole season first; only the weeks it couldn't cover, or all of them
+    # if it failed, are then fetched week by week.
+    season = {}
+    for _, season_weeks, error in fetcher.map(partial(timed_fetch_season, league), [weeks] if weeks else []):
+        if error:
+            print(f"Bulk fetch failed for {league.year}, fetching week by week: {error}")
+            METRICS.error("fetch_season", error, league.year)
+        else:
+            season = season_weeks
+    rest = iter(fetcher.map(partial(fetch_week, league), [week for week in weeks if week not in season]))
+    for week in weeks:
+        yield (week, season[week], None) if week in season else next(rest)
+
+
+def timed_fetch_season(league, weeks):
+    with METRICS.time("fetch_season", league.year):
+        return fetch_season(league, weeks)
+
+
+def run_pipeline(league_id, accumulators, swid=None, espn_s2=None, fetcher=None,
+                 checkpoint=None, incremental=False):
+    fetcher = fetcher or Fetcher()
+    years = sorted(set().union(*(acc.years for acc in accumulators)))
+
+    # The checkpoint holds the aggregates up to the last week that can no
+    # longer change. An incremental run restores it and only folds in the
+    # weeks after that (year, week) mark.
+    high_water = (0, 0)
+    if incremental and checkpoint:
+        high_water = load_checkpoint(checkpoint, accumulators)
+        years = [year for year in years if year >= high_water[0]]
+    mark = high_water
+    snapshot = None
+
+    def freeze():
+        # Called before the first in-progress or failed week is folded in
+        nonlocal snapshot
+        if snapshot is None:
+            snapshot = dump_state(accumulators, mark)
+
+    for year, league, error in fetcher.leagues(league_id, years, swid=swid, espn_s2=espn_s2):
+        print(f"Processing {year}...")
+        if error:
+            print(f"Error loading {year}: {error}")
+            METRICS.error("load_season", error, year)
+            freeze()
+            continue
+
+        active = [acc for acc in accumulators if acc.wants_year(year)]
+        for acc in active:
+            with METRICS.time(f"start_season.{type(acc).__name__}", year):
+                acc.start_season(league)
+
+        # Each accumulator asks for its own weeks; fetch their union once
+        wanted = {acc: set(completed_weeks(league, acc.weeks(league))) for acc in active}
+        weeks = [week for week in sorted(set().union(*wanted.values())) if (year, week) > high_water]
+        for week, box_scores, error in fetch_weeks(fetcher, league, weeks):
+            if error:
+                print(f"Failed week {week} in {year}: {error}")
+                METRICS.error("fetch_week", error, year, week)
+                freeze()
+                continue
+            if not is_final(league, week):
+                freeze()
+            for acc in active:
+                if week in wanted[acc]:
+                    with METRICS.time(f"add_week.{type(acc).__name__}", year, week):
+                        acc.add_week(league, week, box_scores)
+            if snapshot is None:
+                mark = (year, week)
+
+        for acc in active:
+            with METRICS.time(f"end_season.{type(acc).__name__}", year):
+                acc.end_season(league)
+        if snapshot is None:
+            mark = max(mark, (year, 0))
+
+    if checkpoint:
+        with METRICS.time("checkpoint"):
+            save_checkpoint(checkpoint, snapshot or dump_state(accumulators, mark))
+
+
+def fetcher_for(args):
+    if args.from_archive:
+        from helpers.store import ArchiveReader
+        return ArchiveReader()
+    return Fetcher(base_url=args.standin)
+
+
+def export(accumulator, output_path):
+    export_rows(accumulator.rows(), output_path, accumulator.sort_by, accumulator.ascending)
+
+
+def export_rows(rows, output_path, sort_by=None, ascending=True):
+    # Streams rows (a list or a generator) straight to disk; see helpers/export.py
+    with METRICS.time("export"):
+        written = write_rows(rows, output_path, sort_by, ascending)
+    if written is None:
+        print(f"No data collected for {output_path}")
+        return
+    METRICS.count("rows_written", written, output=Path(output_path).name)
+    print(f"Saved to {output_path}")
@@ -0,0 +1,96 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_SCHEDULES = 100_000
+BATCH_SIZE = 4_000  # schedules per array pass, about 10 MB of indices for 12 teams and 14 weeks
+
+
+def round_robin(n_teams):
+    # Circle method: opponents[r, slot] is the slot that `slot` plays in
+    # round r, for the n_teams - 1 rounds of a full round robin
+    slots = np.arange(n_teams)
+    opponents = np.empty((n_teams - 1, n_teams), dtype=np.int64)
+    for r in range(n_teams - 1):
+        circle = np.r_[0, np.roll(slots[1:], r)]
+        home, away = circle[:n_teams // 2], circle[n_teams // 2:][::-1]
+        opponents[r, home] = away
+        opponents[r, away] = home
+    return opponents
+
+
+def season_scores(season):
+    # (weeks x teams) points of a SeasonStandings, NaN where a team didn't
+    # play, and the wins (a tie counting half) of its real schedule
+    scores = np.full((len(season.weeks), len(season.team_ids)), np.nan)
+    for k, column, scored, _ in season.games:
+        scores[k, column] = scored
+    return scores, np.array(season.wins[-1]) + np.array(season.ties[-1]) / 2
+
+
+def simulate_schedules(scores, n_schedules=DEFAULT_SCHEDULES, seed=None, batch_size=BATCH_SIZE):
+    """Win distributions of every team over random schedules of a season.
+
+    `scores` is (weeks x teams), NaN for a week a team sat out. Each
+    schedule relabels the teams of a fixed round robin at random and plays
+    its rounds in random order, cycling once the rounds run out, so it is
+    a schedule the league could really have drawn; the real weekly scores
+    are then replayed against it. Returns (teams x 2 * weeks + 1) counts
+    of schedules by half-wins, a tie counting half a win.
+    """
+    rng = np.random.default_rng(seed)
+    n_weeks, n_teams = scores.shape
+    if n_teams % 2:
+        # A team that never scores: whoever draws it has a bye
+        scores = np.c_[scores, np.full(n_weeks, np.nan)]
+    n = scores.shape[1]
+    opponents = round_robin(n)
+    weeks = np.arange(n_weeks)
+    counts = np.zeros(n * (2 * n_weeks + 1), dtype=np.int64)
+
+    for start in range(0, n_schedules, batch_size):
+        b = min(batch_size, n_schedules - start)
+        teams = np.argsort(rng.random((b, n)), axis=1)            # slot -> team
+        slots = np.argsort(teams, axis=1)                         # team -> slot
+        rounds = np.argsort(rng.random((b, n - 1)), axis=1)[:, weeks % (n - 1)]
+        opponent_slots = opponents[rounds[:, :, None], slots[:, None, :]]  # (b, weeks, teams)
+        opponent_teams = teams[np.arange(b)[:, None, None], opponent_slots]
+        against = scores[weeks[None, :, None], opponent_teams]
+        half_wins = 2 * (scores > against).sum(axis=1) + (scores == against).sum(axis=1)
+        counts += np.bincount((half_wins + np.arange(n) * (2 * n_weeks + 1)).ravel(), minlength=len(counts))
+
+    return counts.reshape(n, -1)[:n_teams]
+
+
+def luck_summary(counts, actual_wins):
+    # Expected wins, spread, percentile of the real win total and the odds
+    # of exactly the real record, per team
+    n_schedules = counts.sum(axis=1)
+    wins = np.arange(counts.shape[1]) / 2
+    expected = counts @ wins / n_schedules
+    spread = np.sqrt(np.maximum(counts @ wins ** 2 / n_schedules - expected ** 2, 0))
+    actual = np.rint(np.asarray(actual_wins) * 2).astype(np.int64)
+    below = np.array([row[:a].sum() for row, a in zip(counts, actual)])
+    exact = counts[np.arange(len(counts)), actual]
+    return {
+        "expected": expected,
+        "spread": spread,
+        "percentile": 100 * (below + exact / 2) / n_schedules,
+        "odds": exact / n_schedules,
+    }
+
+
+def simulate_season(task):
+    # One season in a worker process; the seed is derived from the year so
+    # results never depend on how seasons were split between processes
+    year, scores, n_schedules, seed = task
+    return year, simulate_schedules(scores, n_schedules, seed=None if seed is None else [seed, year])
+
+
+def simulate_seasons(seasons, n_schedules=DEFAULT_SCHEDULES, seed=None, processes=1):
+    # {year: scores} -> {year: counts}, one season per task
+    tasks = [(year, scores, n_schedules, seed) for year, scores in seasons.items()]
+    if processes <= 1:
+        return dict(map(simulate_season, tasks))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return dict(pool.map(simulate_season, tasks))
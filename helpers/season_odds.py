@@ -0,0 +1,125 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_SEASONS = 100_000
+CHUNK_SIZE = 10_000  # seasons per task and per array pass, about 15 MB for 12 teams and 14 weeks left
+PRIOR_GAMES = 3  # every team's mean starts at the league mean, weighted like this many games
+OUTCOMES = ("playoffs", "bye", "champion", "sacko")
+
+
+def bracket_order(size):
+    # 0-based seeds in bracket order, e.g. 0 7 3 4 1 6 2 5 for eight, so the
+    # top seeds can only meet late; seeds past the playoff field are byes
+    order = [0]
+    while len(order) < size:
+        n = 2 * len(order)
+        order = [s for seed in order for s in (seed, n - 1 - seed)]
+    return np.array(order)
+
+
+class SeasonState:
+    """A season part-way through: the record so far from a SeasonStandings,
+    every team's scoring (its mean so far pulled towards the league mean,
+    with one spread pooled over the league) and the regular-season games
+    still to play."""
+
+    def __init__(self, season, remaining_games, playoff_teams):
+        # `remaining_games` is [(week, home team id, away team id)]
+        n = len(season.team_ids)
+        self.team_ids = season.team_ids
+        self.playoff_teams = min(playoff_teams, n)
+        if season.weeks:
+            wins, losses, ties = (np.array(rows[-1], dtype=np.float64)
+                                  for rows in (season.wins, season.losses, season.ties))
+            self.win_points = wins + ties / 2
+            self.played = wins + losses + ties
+            self.points_for = np.array(season.points_for[-1])
+        else:
+            self.win_points, self.played, self.points_for = np.zeros(n), np.zeros(n), np.zeros(n)
+
+        # Scores so far; with no games yet every team is the same
+        scores = [[] for _ in range(n)]
+        for _, column, scored, _ in season.games:
+            scores[column].append(scored)
+        team_means = np.array([np.mean(team_scores) if team_scores else 0.0 for team_scores in scores])
+        residuals = [score - team_means[i] for i, team_scores in enumerate(scores) for score in team_scores]
+        self.spread = float(np.std(residuals, ddof=1)) if len(residuals) > n else 1.0
+        games = np.array([len(team_scores) for team_scores in scores])
+        league_mean = np.mean([score for team_scores in scores for score in team_scores]) if residuals else 0.0
+        self.means = (team_means * games + league_mean * PRIOR_GAMES) / (games + PRIOR_GAMES)
+
+        weeks = sorted({week for week, _, _ in remaining_games})
+        self.remaining_weeks = len(weeks)
+        week_rows = {week: k for k, week in enumerate(weeks)}
+        self.game_week = np.array([week_rows[week] for week, _, _ in remaining_games], dtype=np.int64)
+        self.home = np.array([season.column[home_id] for _, home_id, _ in remaining_games], dtype=np.int64)
+        self.away = np.array([season.column[away_id] for _, _, away_id in remaining_games], dtype=np.int64)
+
+
+def simulate_chunk(task):
+    """Plays out `n_seasons` copies of the rest of a season and its playoffs.
+
+    Every remaining week draws each team's score from its normal
+    distribution; games, final standings (win percentage, then points for,
+    then team id, like SeasonStandings) and single-elimination playoffs with
+    byes for the top seeds are then settled across all copies at once.
+    Returns per-team counts of each outcome and the sum of final wins.
+    """
+    state, n_seasons, seed = task
+    rng = np.random.default_rng(seed)
+    n = len(state.team_ids)
+    copies = np.arange(n_seasons)[:, None]
+
+    scores = rng.normal(state.means, state.spread, size=(n_seasons, state.remaining_weeks, n))
+    home_points = scores[:, state.game_week, state.home]
+    away_points = scores[:, state.game_week, state.away]
+    home_games = np.eye(n)[state.home]  # (games x teams) one-hot, to scatter results with a matmul
+    away_games = np.eye(n)[state.away]
+    win_points = (state.win_points
+                  + ((home_points > away_points) + (home_points == away_points) / 2) @ home_games
+                  + ((away_points > home_points) + (home_points == away_points) / 2) @ away_games)
+    points_for = state.points_for + home_points @ home_games + away_points @ away_games
+    played = state.played + home_games.sum(axis=0) + away_games.sum(axis=0)
+
+    win_pct = np.divide(win_points, played, out=np.zeros(win_points.shape), where=played > 0)
+    team_order = np.broadcast_to(np.arange(n), win_pct.shape)
+    standings = np.lexsort((team_order, -points_for, -win_pct), axis=-1)
+
+    # Seeds past the playoff field are byes (-1) in the first round
+    size = 1 << max(state.playoff_teams - 1, 0).bit_length()
+    seeds = bracket_order(size)
+    alive = np.where(seeds < state.playoff_teams, standings[:, np.minimum(seeds, n - 1)], -1)
+    byes = size - state.playoff_teams
+    while alive.shape[1] > 1:
+        # A bye (-1) picks the extra -inf column and always loses
+        playoff_scores = np.c_[rng.normal(state.means, state.spread, size=(n_seasons, n)),
+                               np.full(n_seasons, -np.inf)]
+        top, bottom = alive[:, 0::2], alive[:, 1::2]
+        top_wins = playoff_scores[copies, top] >= playoff_scores[copies, bottom]
+        alive = np.where(top_wins, top, bottom)
+
+    return {
+        "playoffs": np.bincount(standings[:, :state.playoff_teams].ravel(), minlength=n),
+        "bye": np.bincount(standings[:, :byes].ravel(), minlength=n),
+        "champion": np.bincount(alive[:, 0], minlength=n) if state.playoff_teams else np.zeros(n, dtype=np.int64),
+        "sacko": np.bincount(standings[:, -1], minlength=n),
+        "wins": win_points.sum(axis=0),
+    }
+
+
+def simulate_odds(state, n_seasons=DEFAULT_SEASONS, seed=None, processes=1):
+    # Fixed-size chunks seeded by their number, so a seeded run gives the
+    # same odds however many processes share it
+    chunks = [(state, min(CHUNK_SIZE, n_seasons - start), None if seed is None else [seed, k])
+              for k, start in enumerate(range(0, n_seasons, CHUNK_SIZE))]
+    if processes <= 1:
+        results = list(map(simulate_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(simulate_chunk, chunks))
+    totals = {key: sum(result[key] for result in results) for key in (*OUTCOMES, "wins")}
+    return {
+        **{key: totals[key] / n_seasons for key in OUTCOMES},
+        "projected_wins": totals["wins"] / n_seasons,
+    }
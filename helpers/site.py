@@ -0,0 +1,228 @@
+import csv
+import gzip
+import hashlib
+import json
+from collections import defaultdict
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always written
+    brotli = None
+
+from helpers.export import atomic_open, write_json
+from helpers.utilities import BASE_DIR
+
+DATA_DIR = BASE_DIR / "data"
+MIN_ALL_TIME_SEASONS = 5
+AWARD_ORDER = ["Regression", "Crawlspace", "Clipboard"]
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def win_pct(wins, losses):
+    games = wins + losses
+    return wins / games if games else 0
+
+
+# === HISTORY TAB ===
+def season_order(row):
+    # Win % then points for, both descending
+    return -win_pct(row["wins"], row["losses"]), -row["pf"]
+
+
+def history_payload(rows):
+    all_time = {}
+    by_season = defaultdict(list)
+    for r in rows:
+        wins, losses = int(r["Wins"]), int(r["Losses"])
+        pf, pa = float(r["Points For"]), float(r["Points Against"])
+
+        o = all_time.setdefault(r["Owner ID"], {
+            "owner": r["Owner Name"], "seasons": set(), "wins": 0, "losses": 0,
+            "pf": 0.0, "pa": 0.0, "champs": 0, "sackos": 0
+        })
+        o["seasons"].add(r["Year"])
+        o["wins"] += wins
+        o["losses"] += losses
+        o["pf"] += pf
+        o["pa"] += pa
+        o["champs"] += r["Final Standing"] == "1"
+        o["sackos"] += r["Sacko"] == "True"
+
+        by_season[r["Year"]].append({
+            "owner": r["Owner Name"], "wins": wins, "losses": losses, "wp": round(win_pct(wins, losses), 4),
+            "pf": pf, "pa": pa, "champion": r["Final Standing"] == "1", "sacko": r["Sacko"] == "True"
+        })
+
+    owners = []
+    for o in all_time.values():
+        if len(o["seasons"]) < MIN_ALL_TIME_SEASONS:
+            continue
+        owners.append({
+            "owner": o["owner"], "seasons": len(o["seasons"]), "wins": o["wins"], "losses": o["losses"],
+            "wp": round(win_pct(o["wins"], o["losses"]), 4), "pf": round(o["pf"], 2), "pa": round(o["pa"], 2),
+            "champs": o["champs"], "sackos": o["sackos"]
+        })
+    owners.sort(key=season_order)
+    for season in by_season.values():
+        season.sort(key=season_order)
+
+    years = sorted(by_season, key=int, reverse=True)
+    return {"years": years, "all_time": owners, "by_season": {y: by_season[y] for y in years}}
+
+
+# === ADVANCED TAB ===
+def advanced_payload(rows):
+    overall = {}
+    by_season = defaultdict(list)
+    for r in rows:
+        by_season[r["Year"]].append({
+            "owner": r["Owner Name"], "true_wl": r["True W/L"], "true_pct": r["True W/L %"],
+            "luck": r["Luck Index"], "sos": float(r["Strength of Schedule"]), "eff": float(r["Manager Efficiency"])
+        })
+        o = overall.setdefault(r["Owner Name"], {"c": 0, "w": 0.0, "l": 0.0, "luck": 0.0, "sos": 0.0, "eff": 0.0})
+        o["c"] += 1
+        o["w"] += float(r["Normalized True Wins"])
+        o["l"] += float(r["Normalized True Losses"])
+        o["luck"] += float(r["Luck Index"])
+        o["sos"] += float(r["Strength of Schedule"])
+        o["eff"] += float(r["Manager Efficiency"])
+
+    all_time = []
+    for owner, o in overall.items():
+        total = o["w"] + o["l"]
+        all_time.append({
+            "owner": owner, "true_wins": round(o["w"], 2), "true_losses": round(o["l"], 2),
+            "true_pct": round(o["w"] / total, 4) if total else 0,
+            "luck": round(o["luck"] / o["c"], 4), "sos": round(o["sos"] / o["c"], 3),
+            "eff": round(o["eff"] / o["c"], 4)
+        })
+
+    years = sorted(by_season, key=int, reverse=True)
+    return {"years": years, "all_time": all_time, "by_season": {y: by_season[y] for y in years}}
+
+
+# === RECORDS AND HABITS TABS ===
+def records_payload(rows):
+    return [
+        {"category": r["Category"], "record": r["Record"], "owner": r["Owner"], "detail": r["Detail"],
+         "points": r["Points"], "year": r["Year"], "week": r["Week"]}
+        for r in rows
+    ]
+
+
+def habits_payload(rows):
+    return [
+        {"owner": r["Owner Name"], "player": r["Most Drafted Player"],
+         "times": int(r["Times Drafted"]), "seasons": r["Drafted Seasons"]}
+        for r in rows
+    ]
+
+
+# === WEEKLY TAB ===
+def award_priority(name):
+    for i, key in enumerate(AWARD_ORDER):
+        if key in name:
+            return i
+    return len(AWARD_ORDER)
+
+
+def weekly_payload(award_rows, survivor, payouts):
+    weeks = defaultdict(lambda: {"payouts": [], "awards": {}, "eliminated": []})
+    summary = {}
+
+    def owner_summary(owner):
+        return summary.setdefault(owner, {
+            "owner": owner, "payouts": 0, "regression": 0, "crawlspace": 0, "clipboard": 0, "eliminated": "—"
+        })
+
+    # One winner per award per week; rows without an award are skipped
+    for r in award_rows:
+        week, owner, award = r["Week"].strip(), r["Owner"].strip(), r["Award"].strip()
+        if week and owner and award:
+            weeks[int(week)]["awards"][award] = owner
+
+    for p in payouts:
+        weeks[int(p["week"])]["payouts"].append({"label": p["payout_text"], "owner": p["owner"], "points": p["points"]})
+        owner_summary(p["owner"])["payouts"] += 1
+
+    for owner, week in survivor.get("eliminated", {}).items():
+        weeks[int(week)]["eliminated"].append(owner)
+        owner_summary(owner)["eliminated"] = week
+    for owner in survivor.get("remaining", []):
+        owner_summary(owner)["eliminated"] = "Still Alive"
+
+    for wk in weeks.values():
+        for award, owner in wk["awards"].items():
+            for key in AWARD_ORDER:
+                if key in award:
+                    owner_summary(owner)[key.lower()] += 1
+
+    return {
+        "survivor_remaining": sorted(survivor.get("remaining", [])),
+        "summary": sorted(summary.values(), key=lambda s: (s["owner"].lower(), s["owner"])),
+        "weeks": [
+            {
+                "week": week,
+                "payouts": weeks[week]["payouts"],
+                "awards": [
+                    {"name": name, "owner": weeks[week]["awards"][name]}
+                    for name in sorted(weeks[week]["awards"], key=lambda n: (award_priority(n), n))
+                ],
+                "eliminated": weeks[week]["eliminated"],
+            }
+            for week in sorted(weeks, reverse=True)
+        ],
+    }
+
+
+# === WRITING ===
+def write_payload(name, payload, directory=DATA_DIR):
+    # <name>.<hash>.json plus .gz/.br siblings, each renamed into place whole
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:10]
+    filename = f"{name}.{digest}.json"
+
+    encoded = [(filename, body), (f"{filename}.gz", gzip.compress(body, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoded.append((f"{filename}.br", brotli.compress(body)))
+    for sibling, data in encoded:
+        with atomic_open(directory / sibling, "wb") as f:
+            f.write(data)
+    return filename
+
+
+def prune_payloads(manifest, directory=DATA_DIR):
+    # Older builds of each payload go only once the new manifest is in place,
+    # so the manifest being served never lists a file that is gone
+    for name, filename in manifest.items():
+        for old in directory.glob(f"{name}.*.json*"):
+            if not old.name.startswith(filename):
+                old.unlink()
+
+
+def build_site(root=BASE_DIR, directory=DATA_DIR):
+    payloads = {
+        "history": history_payload(read_csv(root / "league_history.csv")),
+        "advanced": advanced_payload(read_csv(root / "advanced_team_metrics.csv")),
+        "records": records_payload(read_csv(root / "all_time_records.csv")),
+        "habits": habits_payload(read_csv(root / "most_drafted_players.csv")),
+        "weekly": weekly_payload(
+            read_csv(root / "weekly_efficiency_awards.csv"),
+            read_json(root / "survivor_results.json"),
+            read_json(root / "weekly_payout_winners.json"),
+        ),
+    }
+    manifest = {name: write_payload(name, payload, directory) for name, payload in payloads.items()}
+
+    write_json(manifest, directory / "manifest.json", indent=2)
+    prune_payloads(manifest, directory)
+    return manifest
@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from helpers.export import atomic_open
+from helpers.utilities import BASE_DIR
+
+FIXTURE_DIR = BASE_DIR / "ignore" / "fixtures"
+ESPN_HOST = "https://lm-api-reads.fantasy.espn.com"
+API_PREFIX = "/apis/v3/games/"
+DEFAULT_PORT = 8765
+
+
+def standin_url(port=DEFAULT_PORT, host="127.0.0.1"):
+    return f"http://{host}:{port}{API_PREFIX}"
+
+
+def point_at(espn_request, base_url):
+    # Rewrites the endpoints espn_api built in EspnFantasyRequests.__init__ so
+    # every league_get()/get() goes to `base_url` instead of ESPN. Must run
+    # before the first request.
+    from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+
+    espn_request.ENDPOINT = espn_request.ENDPOINT.replace(FANTASY_BASE_ENDPOINT, base_url)
+    espn_request.LEAGUE_ENDPOINT = espn_request.LEAGUE_ENDPOINT.replace(FANTASY_BASE_ENDPOINT, base_url)
+    return espn_request
+
+
+def request_key(path, query, fantasy_filter):
+    # Query order and encoding vary between clients, so key on the sorted
+    # pairs; the x-fantasy-filter header selects different data on the same URL
+    canonical = json.dumps([path, sorted(parse_qsl(query, keep_blank_values=True)), fantasy_filter or ""])
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+class FixtureStore:
+    """Recorded ESPN responses, one gzip'd JSON file per distinct request."""
+
+    def __init__(self, root=FIXTURE_DIR):
+        self.root = root
+
+    def path(self, key):
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def get(self, key):
+        try:
+            with gzip.open(self.path(key), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except OSError:
+            return None
+
+    def put(self, key, fixture):
+        with atomic_open(self.path(key), "wb") as f:
+            f.write(gzip.compress(json.dumps(fixture).encode("utf-8"), mtime=0))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Set on the server by standin_server(): .store, .record and .limiter
+    protocol_version = "HTTP/1.1"  # lets keep-alive clients reuse their connection
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        fantasy_filter = self.headers.get("x-fantasy-filter")
+        key = request_key(parts.path, parts.query, fantasy_filter)
+        store = self.server.store
+
+        fixture = store.get(key)
+        if fixture is None and self.server.record:
+            fixture = self.fetch_upstream(parts, fantasy_filter)
+            store.put(key, fixture)
+        if fixture is None:
+            print(f"No fixture for {self.path} (filter={fantasy_filter})", file=sys.stderr)
+            fixture = {"status": 501, "body": json.dumps({"error": "no recorded response"})}
+
+        body = fixture["body"].encode("utf-8")
+        self.send_response(fixture["status"])
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def fetch_upstream(self, parts, fantasy_filter):
+        import requests
+
+        headers = {}
+        if fantasy_filter:
+            headers["x-fantasy-filter"] = fantasy_filter
+        if self.headers.get("Cookie"):
+            headers["Cookie"] = self.headers["Cookie"]
+        url = ESPN_HOST + parts.path + (f"?{parts.query}" if parts.query else "")
+
+        self.server.limiter.acquire()
+        r = requests.get(url, headers=headers)
+        # Error responses are kept too: espn_api relies on the 401 from one
+        # league endpoint to switch to the other for older seasons
+        return {"path": parts.path, "query": parts.query, "filter": fantasy_filter,
+                "status": r.status_code, "body": r.content.decode("utf-8")}
+
+    def log_message(self, format, *args):
+        pass
+
+
+def standin_server(port=DEFAULT_PORT, store=None, record=False, host="127.0.0.1"):
+    """Local stand-in for ESPN's fantasy API that answers from recorded fixtures.
+
+    With record=True, requests without a fixture are forwarded to ESPN
+    (passing through the client's cookies, rate limited) and saved first.
+    """
+    from helpers.fetcher import TokenBucket
+
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.store = store or FixtureStore()
+    server.record = record
+    server.limiter = TokenBucket()
+    return server
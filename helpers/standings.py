@@ -0,0 +1,209 @@
+import pickle
+from bisect import bisect_left, bisect_right
+
+from helpers.checkpoint import STATE_DIR, save_checkpoint
+
+STANDINGS_PATH = STATE_DIR / "standings.pkl"
+
+
+class SeasonStandings:
+    """The standings of one season after every week, built as the weeks come in.
+
+    Each recorded week adds a row of cumulative wins, losses, ties and points
+    on top of the previous one, one column per team in `team_ids` order.
+    Rank, games back and the clinched/eliminated flags of a row are worked
+    out the first time it's looked up, then kept. Teams rank by win
+    percentage (a tie counts half a win), then points for, then team id;
+    ESPN's head-to-head and division tie-breaks are not modelled. Weeks
+    already recorded are ignored, so a season can be fed again after a
+    checkpoint.
+    """
+
+    def __init__(self, team_ids, reg_season_count, playoff_teams=None):
+        self.team_ids = sorted(team_ids)
+        self.column = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        self.reg_season_count = reg_season_count
+        self.playoff_teams = playoff_teams
+        self.weeks = []
+        self.games = []  # (week row, team column, points scored, points allowed) per team per game
+        # One list per recorded week, one entry per team column
+        self.wins, self.losses, self.ties = [], [], []
+        self.points_for, self.points_against = [], []
+        self.ranked = {}  # week row -> (order, rank, games back, clinched, eliminated)
+
+    def __setstate__(self, state):
+        if "ranked" in state:
+            vars(self).update(state)
+            return
+        # Pickled before the rows were built week by week: replay its games,
+        # which it logged home side first
+        self.__init__(state["team_ids"], state["reg_season_count"], state["playoff_teams"])
+        by_row = {}
+        for (k, home, home_score, away_score), (_, away, _, _) in zip(state["games"][::2], state["games"][1::2]):
+            by_row.setdefault(k, []).append((self.team_ids[home], self.team_ids[away], home_score, away_score))
+        for k, week in enumerate(state["weeks"]):
+            self.add_week(week, by_row.get(k, []))
+
+    def last_week(self):
+        return self.weeks[-1] if self.weeks else 0
+
+    def add_week(self, week, games):
+        # `games` is [(home team id, away team id, home score, away score)]
+        if week <= self.last_week():
+            return
+        k, n, column = len(self.weeks), len(self.team_ids), self.column
+        if k:
+            wins, losses, ties = self.wins[-1][:], self.losses[-1][:], self.ties[-1][:]
+            points_for, points_against = self.points_for[-1][:], self.points_against[-1][:]
+        else:
+            wins, losses, ties = [0] * n, [0] * n, [0] * n
+            points_for, points_against = [0.0] * n, [0.0] * n
+        for home_id, away_id, home_score, away_score in games:
+            home, away = column[home_id], column[away_id]
+            self.games.append((k, home, home_score, away_score))
+            self.games.append((k, away, away_score, home_score))
+            points_for[home] += home_score
+            points_against[home] += away_score
+            points_for[away] += away_score
+            points_against[away] += home_score
+            if home_score > away_score:
+                wins[home] += 1
+                losses[away] += 1
+            elif home_score < away_score:
+                losses[home] += 1
+                wins[away] += 1
+            else:
+                ties[home] += 1
+                ties[away] += 1
+
+        self.weeks.append(week)
+        self.wins.append(wins)
+        self.losses.append(losses)
+        self.ties.append(ties)
+        self.points_for.append(points_for)
+        self.points_against.append(points_against)
+
+    def rank_row(self, k):
+        # (team columns first to last, rank, games back, clinched, eliminated) after the k-th week
+        if k in self.ranked:
+            return self.ranked[k]
+        n = len(self.team_ids)
+        wins, losses, ties, points_for = self.wins[k], self.losses[k], self.ties[k], self.points_for[k]
+        win_points = [w + t / 2 for w, t in zip(wins, ties)]
+        win_pct = [p / (w + l + t) if w + l + t else 0.0 for p, w, l, t in zip(win_points, wins, losses, ties)]
+        order = sorted(range(n), key=lambda i: (-win_pct[i], -points_for[i], i))
+        rank = [0] * n
+        for place, i in enumerate(order, 1):
+            rank[i] = place
+        leader = order[0]
+        games_back = [((wins[leader] - wins[i]) + (losses[i] - losses[leader])) / 2 for i in range(n)]
+
+        # Clinched: fewer than `playoff_teams` others can still catch up.
+        # Eliminated: can't catch the last playoff spot as it stands. Both
+        # assume one game a week and treat a tie in wins as not good enough.
+        clinched, eliminated = [False] * n, [False] * n
+        if self.playoff_teams and self.playoff_teams < n:
+            remaining = max(self.reg_season_count - self.weeks[k], 0)
+            best_possible = [p + remaining for p in win_points]
+            ceilings = sorted(best_possible)
+            cutoff = sorted(win_points, reverse=True)[self.playoff_teams - 1]
+            for i in range(n):
+                # Everyone whose best reaches this team's points, less the team itself
+                catchers = n - bisect_left(ceilings, win_points[i]) - 1
+                clinched[i] = catchers < self.playoff_teams
+                eliminated[i] = best_possible[i] < cutoff
+
+        ranked = self.ranked[k] = (order, rank, games_back, clinched, eliminated)
+        return ranked
+
+    # === LOOKUPS ===
+    def row(self, week=None):
+        # Index of the standings after `week` (the last recorded week up to
+        # it), or None before the first one
+        if week is None:
+            week = self.reg_season_count
+        k = bisect_right(self.weeks, week) - 1
+        return k if k >= 0 else None
+
+    def standings(self, week=None):
+        # Team ids from first to last after `week`
+        k = self.row(week)
+        if k is None:
+            return []
+        return [self.team_ids[i] for i in self.rank_row(k)[0]]
+
+    def rank_after(self, week, team_id):
+        k = self.row(week)
+        return None if k is None else self.rank_row(k)[1][self.column[team_id]]
+
+    def team_after(self, week, team_id):
+        k = self.row(week)
+        if k is None:
+            return None
+        i = self.column[team_id]
+        _, rank, games_back, clinched, eliminated = self.rank_row(k)
+        return {
+            "week": self.weeks[k],
+            "rank": rank[i],
+            "wins": self.wins[k][i],
+            "losses": self.losses[k][i],
+            "ties": self.ties[k][i],
+            "points_for": round(self.points_for[k][i], 2),
+            "points_against": round(self.points_against[k][i], 2),
+            "games_back": games_back[i],
+            "clinched": clinched[i],
+            "eliminated": eliminated[i],
+        }
+
+    def sacko(self):
+        # Last place at the end of the regular season (or as it stands)
+        standings = self.standings()
+        return standings[-1] if standings else None
+
+    def clinch_week(self, team_id):
+        # First week the team was sure of a playoff spot, if it ever was
+        i = self.column[team_id]
+        return next((week for k, week in enumerate(self.weeks) if self.rank_row(k)[3][i]), None)
+
+
+class StandingsTimeline:
+    """Week-by-week standings of every season of a league."""
+
+    def __init__(self):
+        self.seasons = {}  # year -> SeasonStandings
+
+    def start_season(self, year, team_ids, reg_season_count, playoff_teams=None):
+        # A season carried over from a checkpoint keeps its recorded weeks
+        season = self.seasons.get(year)
+        if season is None or season.team_ids != sorted(team_ids):
+            season = self.seasons[year] = SeasonStandings(team_ids, reg_season_count, playoff_teams)
+        return season
+
+    def add_week(self, year, week, games):
+        self.seasons[year].add_week(week, games)
+
+    def season(self, year):
+        return self.seasons[year]
+
+    def rank_after(self, year, week, team_id):
+        return self.seasons[year].rank_after(week, team_id)
+
+    def sacko(self, year):
+        return self.seasons[year].sacko()
+
+    def rows(self):
+        # A generator: one row per team per week per season, too many to hold at once
+        for year in sorted(self.seasons):
+            season = self.seasons[year]
+            for week in season.weeks:
+                for team_id in season.team_ids:
+                    yield {"year": year, "team_id": team_id, **season.team_after(week, team_id)}
+
+    # === PERSISTENCE ===
+    def save(self, path=STANDINGS_PATH):
+        save_checkpoint(path, pickle.dumps(self))
+
+    @classmethod
+    def load(cls, path=STANDINGS_PATH):
+        with open(path, "rb") as f:
+            return pickle.load(f)
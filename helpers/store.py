@@ -0,0 +1,328 @@
+import json
+import math
+import sqlite3
+from contextlib import closing
+
+from helpers.compact import line_points, position_name, slot_name
+from helpers.metrics import METRICS
+from helpers.pipeline import Accumulator, is_final
+from helpers.standings import SeasonStandings
+from helpers.utilities import BASE_DIR
+
+ARCHIVE_PATH = BASE_DIR / "ignore" / "archive.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    league_id INTEGER, year INTEGER,
+    reg_season_count INTEGER, current_week INTEGER, current_matchup_period INTEGER,
+    position_slot_counts TEXT, matchup_periods TEXT,
+    PRIMARY KEY (league_id, year)
+);
+CREATE TABLE IF NOT EXISTS teams (
+    league_id INTEGER, year INTEGER, team_id INTEGER,
+    owner_id TEXT, first_name TEXT, last_name TEXT, team_name TEXT,
+    wins INTEGER, losses INTEGER, points_for REAL, points_against REAL,
+    final_standing INTEGER, reg_season_rank INTEGER,
+    PRIMARY KEY (league_id, year, team_id)
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    league_id INTEGER, year INTEGER, week INTEGER,
+    home_team_id INTEGER, away_team_id INTEGER,
+    home_score REAL, away_score REAL,
+    PRIMARY KEY (league_id, year, week, home_team_id)
+);
+CREATE TABLE IF NOT EXISTS player_lines (
+    league_id INTEGER, year INTEGER, week INTEGER, team_id INTEGER, lineup_index INTEGER, owner_id TEXT,
+    player_id INTEGER, name TEXT, position TEXT, slot_position TEXT, points REAL,
+    PRIMARY KEY (league_id, year, week, team_id, lineup_index)
+);
+CREATE TABLE IF NOT EXISTS draft_picks (
+    league_id INTEGER, year INTEGER, team_id INTEGER,
+    player_id INTEGER, player_name TEXT, round_num INTEGER, round_pick INTEGER,
+    PRIMARY KEY (league_id, year, round_num, round_pick)
+);
+"""
+
+
+def connect(path=ARCHIVE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def migrate(conn):
+    # Archives from before lineup_index keyed player lines by player id, so
+    # a player listed twice in one lineup kept a single line. Number the
+    # lines that are left; the next crawl of a week rewrites it whole.
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(player_lines)")]
+    if not columns or "lineup_index" in columns:
+        return
+    with conn:
+        conn.execute("ALTER TABLE player_lines RENAME TO player_lines_old")
+    conn.executescript(SCHEMA)
+    with conn:
+        conn.execute("""
+            INSERT INTO player_lines
+            SELECT league_id, year, week, team_id,
+                   ROW_NUMBER() OVER (PARTITION BY league_id, year, week, team_id ORDER BY rowid) - 1,
+                   owner_id, player_id, name, position, slot_position, points
+            FROM player_lines_old
+        """)
+        conn.execute("DROP TABLE player_lines_old")
+
+
+def query(sql, params=(), path=ARCHIVE_PATH):
+    import pandas as pd
+
+    with closing(connect(path)) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def player_season_totals(league_id, path=ARCHIVE_PATH):
+    return query("""
+        SELECT year, player_id, name, owner_id, position, SUM(points) AS points
+        FROM player_lines
+        WHERE league_id = ? AND points IS NOT NULL
+        GROUP BY year, player_id, owner_id
+        ORDER BY points DESC
+    """, (league_id,), path)
+
+
+def player_positions(league_id, path=ARCHIVE_PATH):
+    # Each player's latest position in the archived lineups
+    with closing(connect(path)) as conn:
+        return dict(conn.execute("""
+            SELECT player_id, position FROM player_lines
+            WHERE league_id = ? AND position != ''
+            ORDER BY year, week
+        """, (league_id,)))
+
+
+# === WRITING: one more accumulator on the crawl ===
+class ArchiveWriter(Accumulator):
+    config = ("years", "path")
+
+    def __init__(self, years, path=ARCHIVE_PATH):
+        self.years = years
+        self.path = path
+
+    def weeks(self, league):
+        # Every matchup period, playoffs included
+        return sorted(int(w) for w in league.settings.matchup_periods)
+
+    def start_season(self, league):
+        league_id, year = league.league_id, league.year
+        teams = []
+        for team in league.teams:
+            owner = team.owners[0] if team.owners else {}
+            teams.append((
+                league_id, year, team.team_id,
+                owner.get('id'), owner.get('firstName'), owner.get('lastName'), team.team_name,
+                team.wins, team.losses, team.points_for, team.points_against,
+                team.final_standing, None
+            ))
+        try:
+            picks = [
+                (league_id, year, pick.team.team_id, pick.playerId, pick.playerName, pick.round_num, pick.round_pick)
+                for pick in league.draft
+            ]
+        except Exception as e:
+            # Archive the rest of the season; any picks archived before are kept
+            print(f"Could not load draft data for {year}: {e}")
+            METRICS.error("load_draft", e, year)
+            picks = None
+
+        with closing(connect(self.path)) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO seasons VALUES (?, ?, ?, ?, ?, ?, ?)", (
+                league_id, year, league.settings.reg_season_count, league.current_week,
+                league.currentMatchupPeriod, json.dumps(league.settings.position_slot_counts),
+                json.dumps(league.settings.matchup_periods)
+            ))
+            conn.executemany("INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", teams)
+            if picks is not None:
+                conn.execute("DELETE FROM draft_picks WHERE league_id = ? AND year = ?", (league_id, year))
+                conn.executemany("INSERT INTO draft_picks VALUES (?, ?, ?, ?, ?, ?, ?)", picks)
+
+    def add_week(self, league, week, box_scores):
+        league_id, year = league.league_id, league.year
+        owner_ids = {team.team_id: team.owners[0]['id'] if team.owners else None for team in league.teams}
+        names = box_scores.names
+        matchups = []
+        lines = []
+        for box in box_scores:
+            matchups.append((
+                league_id, year, week, box.home_team_id, box.away_team_id, box.home_score, box.away_score
+            ))
+            for team_id, _, lineup in box.sides():
+                if not team_id:
+                    continue
+                owner_id = owner_ids.get(team_id)
+                # Keyed by place in the lineup: a player can be listed twice
+                for lineup_index, (player_id, position, slot, points) in enumerate(zip(
+                    lineup["player_id"].tolist(), lineup["position"].tolist(), lineup["slot"].tolist(),
+                    line_points(lineup).tolist()
+                )):
+                    lines.append((
+                        league_id, year, week, team_id, lineup_index, owner_id, player_id, names.get(player_id),
+                        position_name(position), slot_name(slot), None if math.isnan(points) else points
+                    ))
+
+        with closing(connect(self.path)) as conn, conn:
+            conn.execute("DELETE FROM matchups WHERE league_id = ? AND year = ? AND week = ?", (league_id, year, week))
+            conn.execute("DELETE FROM player_lines WHERE league_id = ? AND year = ? AND week = ?", (league_id, year, week))
+            conn.executemany("INSERT INTO matchups VALUES (?, ?, ?, ?, ?, ?, ?)", matchups)
+            conn.executemany("INSERT INTO player_lines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", lines)
+
+    def end_season(self, league):
+        # Regular-season standings from the final weeks already archived,
+        # ranked the way the standings timeline ranks them
+        league_id, year, reg_season_count = league.league_id, league.year, league.settings.reg_season_count
+        season = SeasonStandings([team.team_id for team in league.teams], reg_season_count)
+        with closing(connect(self.path)) as conn, conn:
+            games = {}
+            for week, *game in conn.execute(
+                "SELECT week, home_team_id, away_team_id, home_score, away_score FROM matchups "
+                "WHERE league_id = ? AND year = ? AND week <= ? AND home_team_id AND away_team_id ORDER BY week",
+                (league_id, year, reg_season_count)
+            ):
+                games.setdefault(week, []).append(game)
+            for week in sorted(games):
+                if is_final(league, week):
+                    season.add_week(week, games[week])
+            conn.executemany(
+                "UPDATE teams SET reg_season_rank = ? WHERE league_id = ? AND year = ? AND team_id = ?",
+                [(rank, league_id, year, team_id) for rank, team_id in enumerate(season.standings(), 1)]
+            )
+
+
+# === READING: seasons rebuilt from the archive, shaped like espn_api objects ===
+class ArchivedSettings:
+    def __init__(self, reg_season_count, position_slot_counts, matchup_periods):
+        self.reg_season_count = reg_season_count
+        self.position_slot_counts = position_slot_counts
+        self.matchup_periods = matchup_periods
+
+
+class ArchivedTeam:
+    def __init__(self, team_id, owner_id, first_name, last_name, team_name,
+                 wins, losses, points_for, points_against, final_standing, reg_season_rank):
+        self.team_id = team_id
+        self.owners = [{'id': owner_id, 'firstName': first_name, 'lastName': last_name}] if owner_id else []
+        self.team_name = team_name
+        self.wins = wins
+        self.losses = losses
+        self.points_for = points_for
+        self.points_against = points_against
+        self.final_standing = final_standing
+        self.reg_season_rank = reg_season_rank
+
+
+class ArchivedPlayer:
+    def __init__(self, playerId, name, position, slot_position, points):
+        self.playerId = playerId
+        self.name = name
+        self.position = position
+        self.slot_position = slot_position
+        self.points = points
+
+
+class ArchivedBox:
+    def __init__(self, home_team, away_team, home_score, away_score, home_lineup, away_lineup):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.home_score = home_score
+        self.away_score = away_score
+        self.home_lineup = home_lineup
+        self.away_lineup = away_lineup
+
+
+class ArchivedPick:
+    def __init__(self, team, playerId, playerName, round_num, round_pick):
+        self.team = team
+        self.playerId = playerId
+        self.playerName = playerName
+        self.round_num = round_num
+        self.round_pick = round_pick
+
+
+class ArchivedSeason:
+    def __init__(self, conn, league_id, year):
+        row = conn.execute(
+            "SELECT reg_season_count, current_week, current_matchup_period, position_slot_counts, matchup_periods "
+            "FROM seasons WHERE league_id = ? AND year = ?", (league_id, year)
+        ).fetchone()
+        if row is None:
+            raise LookupError(f"{year} is not in the archive")
+
+        self.league_id = league_id
+        self.year = year
+        reg_season_count, self.current_week, self.currentMatchupPeriod, slots, periods = row
+        self.settings = ArchivedSettings(reg_season_count, json.loads(slots), json.loads(periods))
+
+        self.teams = [
+            ArchivedTeam(*team) for team in conn.execute(
+                "SELECT team_id, owner_id, first_name, last_name, team_name, wins, losses, points_for, "
+                "points_against, final_standing, reg_season_rank FROM teams "
+                "WHERE league_id = ? AND year = ? ORDER BY team_id", (league_id, year)
+            )
+        ]
+        team_map = {team.team_id: team for team in self.teams}
+
+        self.draft = [
+            ArchivedPick(team_map[team_id], player_id, player_name, round_num, round_pick)
+            for team_id, player_id, player_name, round_num, round_pick in conn.execute(
+                "SELECT team_id, player_id, player_name, round_num, round_pick FROM draft_picks "
+                "WHERE league_id = ? AND year = ? ORDER BY round_num, round_pick", (league_id, year)
+            )
+        ]
+
+        lineups = {}
+        for week, team_id, player_id, name, position, slot, points in conn.execute(
+            "SELECT week, team_id, player_id, name, position, slot_position, points FROM player_lines "
+            "WHERE league_id = ? AND year = ? ORDER BY week, team_id, lineup_index", (league_id, year)
+        ):
+            lineups.setdefault((week, team_id), []).append(ArchivedPlayer(player_id, name, position, slot, points))
+
+        self.weeks = {}
+        for week, home_id, away_id, home_score, away_score in conn.execute(
+            "SELECT week, home_team_id, away_team_id, home_score, away_score FROM matchups "
+            "WHERE league_id = ? AND year = ? ORDER BY rowid", (league_id, year)
+        ):
+            self.weeks.setdefault(week, []).append(ArchivedBox(
+                team_map.get(home_id, 0), team_map.get(away_id, 0), home_score, away_score,
+                lineups.get((week, home_id), []), lineups.get((week, away_id), [])
+            ))
+
+    def box_scores(self, week):
+        if week not in self.weeks:
+            raise LookupError(f"Week {week} of {self.year} is not in the archive")
+        return self.weeks[week]
+
+    scoreboard = box_scores
+
+    def standings_weekly(self, week):
+        # Only the end-of-regular-season standings are archived
+        if week != self.settings.reg_season_count:
+            raise ValueError(f"Only week {self.settings.reg_season_count} standings are archived")
+        # A season archived before any week was final has no ranks yet
+        return sorted(self.teams, key=lambda team: (team.reg_season_rank is None, team.reg_season_rank or 0))
+
+
+class ArchiveReader:
+    """Drop-in replacement for Fetcher that serves seasons from the local archive."""
+
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+
+    def map(self, fn, items):
+        for item in items:
+            try:
+                yield item, fn(item), None
+            except Exception as e:
+                yield item, None, e
+
+    def leagues(self, league_id, years, swid=None, espn_s2=None, cache=None):
+        with closing(connect(self.path)) as conn:
+            return list(self.map(lambda year: ArchivedSeason(conn, league_id, year), years))
@@ -0,0 +1,109 @@
+import copy
+import pickle
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from helpers.checkpoint import save_checkpoint
+from helpers.export import write_json
+
+# How a tie for lowest score is broken: the first in this order goes home
+TIE_BREAKS = {
+    "team_name": lambda pool, owner, team_name: team_name,
+    "season_points": lambda pool, owner, team_name: (pool.season_points.get(owner, 0.0), team_name),
+}
+
+
+class SurvivorPool:
+    """One survivor pool as a state machine. Each new week knocks out the
+    lowest scorers still standing, until the cutoff week; weeks it has
+    already seen are ignored, so feeding it the whole season again is safe."""
+
+    def __init__(self, name, cutoff_week=12, eliminations=1, tie_break="team_name"):
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"Unknown tie break {tie_break!r} for survivor pool {name!r}")
+        self.name = name
+        self.rules = {"cutoff_week": cutoff_week, "eliminations": eliminations, "tie_break": tie_break}
+        self.last_week = 0
+        self.remaining = set()
+        self.eliminated = {}  # owner -> week, in elimination order
+        self.season_points = {}
+
+    def add_week(self, week, scores):
+        # `scores` is [(owner, team name, points)] for every team that played
+        if week <= self.last_week:
+            return
+        self.last_week = week
+
+        tie_break = TIE_BREAKS[self.rules["tie_break"]]
+        standing = []
+        for owner, team_name, points in scores:
+            if owner not in self.eliminated:
+                self.remaining.add(owner)
+                standing.append((points, tie_break(self, owner, team_name), owner))
+            self.season_points[owner] = self.season_points.get(owner, 0.0) + points
+
+        if week >= self.rules["cutoff_week"]:
+            return
+        # The last one standing is never knocked out
+        count = min(self.rules["eliminations"], len(self.remaining) - 1)
+        for _, _, owner in sorted(standing)[:count]:
+            self.eliminated[owner] = week
+            self.remaining.remove(owner)
+
+    def results(self):
+        return {
+            "eliminated": dict(self.eliminated),
+            "remaining": sorted(self.remaining)
+        }
+
+
+class SurvivorPools:
+    """Several pools fed from one stream of weekly scores. Only final weeks
+    are committed to the saved state; later weeks are shown on a copy."""
+
+    def __init__(self, pools_config):
+        self.pools = {name: SurvivorPool(name, **rules) for name, rules in pools_config["pools"].items()}
+
+    def last_week(self):
+        return min((pool.last_week for pool in self.pools.values()), default=0)
+
+    def consume(self, weekly_scores, final_week):
+        # `weekly_scores` is [(week, owner, team name, points)]; weeks every
+        # pool has seen are dropped before grouping
+        last_week = self.last_week()
+        new_scores = sorted((row for row in weekly_scores if row[0] > last_week), key=itemgetter(0))
+        preview = None
+        for week, rows in groupby(new_scores, key=itemgetter(0)):
+            if week > final_week and preview is None:
+                preview = copy.deepcopy(self)
+            scores = [(owner, team_name, points) for _, owner, team_name, points in rows]
+            for pool in (preview or self).pools.values():
+                pool.add_week(int(week), scores)
+        return {name: pool.results() for name, pool in (preview or self).pools.items()}
+
+    def save(self, path):
+        save_checkpoint(path, pickle.dumps({name: vars(pool) for name, pool in self.pools.items()}))
+
+    @classmethod
+    def load(cls, path, pools_config):
+        # Pools whose rules changed since the state was saved start over
+        pools = cls(pools_config)
+        try:
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+        except OSError:
+            return pools
+        for name, pool in pools.pools.items():
+            if name in saved and saved[name]["rules"] == pool.rules:
+                vars(pool).update(saved[name])
+        return pools
+
+
+def write_results(results, output_dir):
+    # The "main" pool keeps the original survivor_results.json name
+    for name, result in results.items():
+        filename = "survivor_results.json" if name == "main" else f"survivor_results_{name}.json"
+        path = Path(output_dir) / filename
+        write_json(result, path, indent=2)
+        print(f"✅ Survivor results saved to {path}")
@@ -0,0 +1,126 @@
+import random
+import string
+from functools import lru_cache
+
+from helpers.compact import compact_week
+from helpers.store import ArchivedBox, ArchivedPick, ArchivedPlayer, ArchivedSettings, ArchivedTeam
+
+SLOT_COUNTS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "RB/WR/TE": 2, "K": 1, "D/ST": 1, "BE": 6, "IR": 1}
+ROSTER_SLOTS = ["QB", "RB", "RB", "WR", "WR", "TE", "RB/WR/TE", "RB/WR/TE", "K", "D/ST"] + ["BE"] * 6
+POSITIONS = ["QB", "RB", "RB", "WR", "WR", "WR", "TE", "K", "D/ST"]
+PLAYER_POOL = 600
+PLAYOFF_WEEKS = 3
+DRAFT_ROUNDS = 16
+VARIANTS = 16  # distinct generated seasons per shape, shared between leagues
+
+
+def synthetic_team(team_id):
+    first = string.ascii_uppercase[team_id % 26]
+    last = string.ascii_uppercase[(team_id * 7) % 26]
+    return ArchivedTeam(team_id, f"{{SYNTHETIC-{team_id:04d}}}", f"{first}owner", f"{last}synthetic",
+                        f"Team {team_id}", 0, 0, 0.0, 0.0, 0, 0)
+
+
+@lru_cache(maxsize=VARIANTS * 4)
+def synthetic_season(n_teams, n_weeks, variant):
+    # Teams, weekly boxes and draft for one made-up season. Generating 16
+    # player lines per team-week dominates a benchmark run, so leagues reuse
+    # a small set of seasons and only differ in league_id and year. Weeks are
+    # compacted here, the way a real crawl compacts each week once on fetch.
+    rng = random.Random(f"{n_teams}-{n_weeks}-{variant}")
+    teams = [synthetic_team(team_id) for team_id in range(1, n_teams + 1)]
+    pool = [(player_id, f"Player {player_id}", rng.choice(POSITIONS)) for player_id in range(1, PLAYER_POOL + 1)]
+    by_position = {}
+    for player in pool:
+        by_position.setdefault(player[2], []).append(player)
+
+    # Each team keeps one roster all season, filled slot by slot
+    rosters = {}
+    for team in teams:
+        roster = []
+        for slot in ROSTER_SLOTS:
+            eligible = by_position[rng.choice(["RB", "WR", "TE"])] if slot in ("RB/WR/TE", "BE") else by_position[slot]
+            roster.append((rng.choice(eligible), slot))
+        rosters[team.team_id] = roster
+
+    reg_season_count = n_weeks - PLAYOFF_WEEKS
+    results = {team.team_id: [] for team in teams}  # (points for, points against) per regular season week
+    weeks = {}
+    for week in range(1, n_weeks + 1):
+        order = teams[:]
+        rng.shuffle(order)
+        boxes = []
+        for home, away in zip(order[::2], order[1::2]):
+            lineups = []
+            for team in (home, away):
+                lineup = []
+                for (player_id, name, position), slot in rosters[team.team_id]:
+                    roll = rng.random()
+                    points = None if roll < 0.02 else 0.0 if roll < 0.05 else round(rng.uniform(-2, 35), 2)
+                    lineup.append(ArchivedPlayer(player_id, name, position, slot, points))
+                lineups.append(lineup)
+            scores = [round(sum(p.points or 0 for p in lineup if p.slot_position not in ("BE", "IR")), 2)
+                      for lineup in lineups]
+            boxes.append(ArchivedBox(home, away, scores[0], scores[1], lineups[0], lineups[1]))
+            if week <= reg_season_count:
+                results[home.team_id].append((scores[0], scores[1]))
+                results[away.team_id].append((scores[1], scores[0]))
+        weeks[week] = compact_week(boxes)
+
+    for team in teams:
+        team.wins = sum(pf > pa for pf, pa in results[team.team_id])
+        team.losses = sum(pf < pa for pf, pa in results[team.team_id])
+        team.points_for = round(sum(pf for pf, _ in results[team.team_id]), 2)
+        team.points_against = round(sum(pa for _, pa in results[team.team_id]), 2)
+    standings = sorted(teams, key=lambda team: (-team.wins, -team.points_for))
+    for rank, team in enumerate(standings, 1):
+        team.reg_season_rank = rank
+        team.final_standing = rank
+
+    draft = []
+    for round_num in range(1, DRAFT_ROUNDS + 1):
+        for round_pick, team in enumerate(teams, 1):
+            player_id, name, _ = pool[rng.randrange(PLAYER_POOL // 4)]
+            draft.append(ArchivedPick(team, player_id, name, round_num, round_pick))
+
+    settings = ArchivedSettings(reg_season_count, SLOT_COUNTS, {str(week): [week] for week in range(1, n_weeks + 1)})
+    return teams, weeks, draft, settings
+
+
+class SyntheticLeague:
+    """A finished season shaped like espn_api's League, made up from a seed."""
+
+    def __init__(self, league_id, year, n_teams=12, n_weeks=17):
+        self.league_id = league_id
+        self.year = year
+        variant = hash((league_id, year)) % VARIANTS
+        self.teams, self.weeks, self.draft, self.settings = synthetic_season(n_teams, n_weeks, variant)
+        self.current_week = n_weeks
+        self.currentMatchupPeriod = n_weeks + 1
+
+    def box_scores(self, week):
+        return self.weeks[week]
+
+    scoreboard = box_scores
+
+    def standings_weekly(self, week):
+        # Only the end-of-regular-season standings are generated
+        return sorted(self.teams, key=lambda team: team.reg_season_rank)
+
+
+class SyntheticFetcher:
+    """Drop-in replacement for Fetcher that serves synthetic seasons."""
+
+    def __init__(self, n_teams=12, n_weeks=17):
+        self.n_teams = n_teams
+        self.n_weeks = n_weeks
+
+    def map(self, fn, items):
+        for item in items:
+            try:
+                yield item, fn(item), None
+            except Exception as e:
+                yield item, None, e
+
+    def leagues(self, league_id, years, swid=None, espn_s2=None, cache=None):
+        return self.map(lambda year: SyntheticLeague(league_id, year, self.n_teams, self.n_weeks), years)
@@ -12,5 +12,9 @@ def get_credentials(path = CREDS_PATH):
 
 
 def get_owner_map(path = OWNER_MAP_PATH):
-    with open(path) as f:
-        return json.load(f)
+    # Optional name overrides for OwnerIndex, keyed by owner GUID or team id
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,127 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import argparse
+import contextlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from helpers.build import build_league, league_namespace
+from helpers.cache import ResponseCache
+from helpers.fetcher import Fetcher, REQUESTS_PER_SECOND, BURST
+from helpers.metrics import METRICS
+from helpers.store import ArchiveReader
+from helpers.utilities import get_credentials
+
+# Every league writes to <output>/<league id>/, run report (batch.json and
+# batch.prom) included, and keeps its cache, checkpoint, archive and owner
+# map under ignore/leagues/<league id>/ (put an owner_map.json there to fill
+# in owner names).
+
+# === USER CONFIGURATION ===
+DEFAULT_YEARS = range(2013, 2026)
+OUTPUT_DIR = PROJECT_ROOT / "leagues"
+MAX_PROCESSES = 4
+
+
+def parse_league(spec):
+    # "885349" or "885349:2015-2025" (inclusive)
+    league_id, _, years = spec.partition(":")
+    if not years:
+        return int(league_id), DEFAULT_YEARS
+    start, _, end = years.partition("-")
+    years = range(int(start), int(end or start) + 1)
+    if not years:
+        raise argparse.ArgumentTypeError(f"empty year range in {spec}")
+    return int(league_id), years
+
+
+def load_owner_map(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def run_league(league_id, years, output_dir, creds, options):
+    # Runs in a worker process. Any failure is caught and reported so the
+    # rest of the batch carries on; the league's output goes to its own log.
+    namespace = league_namespace(league_id)
+    output_dir = Path(output_dir) / str(league_id)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    METRICS.reset()  # worker processes are reused between leagues
+
+    with open(output_dir / "build.log", "w") as log, contextlib.redirect_stdout(log):
+        try:
+            if options["from_archive"]:
+                fetcher = ArchiveReader(namespace["archive"])
+            else:
+                # The processes share ESPN's rate limit between them
+                fetcher = Fetcher(rate=REQUESTS_PER_SECOND / options["processes"], burst=BURST,
+                                  base_url=options["standin"], cache=ResponseCache(namespace["cache"]))
+            build_league(league_id, years, output_dir, load_owner_map(namespace["owner_map"]),
+                         swid=creds.get('swid'), espn_s2=creds.get('espn_s2'), fetcher=fetcher,
+                         checkpoint=namespace["state"] / "build_all.pkl",
+                         archive_path=None if options["from_archive"] else namespace["archive"],
+                         incremental=options["incremental"],
+                         draft_index_path=namespace["state"] / "draft_index.pkl", positions_path=namespace["archive"],
+                         standings_path=namespace["state"] / "standings.pkl",
+                         owners_path=namespace["state"] / "owners.pkl")
+            error = None
+        except Exception as e:
+            traceback.print_exc(file=log)
+            METRICS.error("build_league", e)
+            error = f"{type(e).__name__}: {e}"
+        METRICS.write("batch", output_dir, league=league_id)
+
+    return league_id, error, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the history outputs for many leagues in parallel")
+    parser.add_argument("leagues", nargs="*", type=parse_league, metavar="LEAGUE[:START-END]")
+    parser.add_argument("--file", type=Path, help="file with one LEAGUE[:START-END] per line")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--processes", type=int, default=min(MAX_PROCESSES, os.cpu_count() or 1))
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--from-archive", action="store_true")
+    parser.add_argument("--standin", metavar="URL")
+    args = parser.parse_args()
+
+    leagues = list(args.leagues)
+    if args.file:
+        leagues += [parse_league(line.strip()) for line in args.file.read_text().splitlines()
+                    if line.strip() and not line.startswith("#")]
+    if not leagues:
+        parser.error("no leagues given")
+
+    creds = get_credentials()
+    options = {"from_archive": args.from_archive, "incremental": args.incremental,
+               "standin": args.standin, "processes": args.processes}
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        futures = {pool.submit(run_league, league_id, years, args.output, creds, options): league_id
+                   for league_id, years in leagues}
+        for future in as_completed(futures):
+            try:
+                league_id, error, seconds = future.result()
+            except Exception as e:  # the worker process itself died
+                league_id, error, seconds = futures[future], f"{type(e).__name__}: {e}", 0.0
+            if error:
+                failed.append(league_id)
+                print(f"❌ {league_id} failed after {seconds:.1f}s: {error}")
+            else:
+                print(f"✅ {league_id} done in {seconds:.1f}s")
+
+    print(f"{len(leagues) - len(failed)}/{len(leagues)} leagues built in {args.output}")
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,211 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import math
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from helpers.accumulators import AdvancedMetrics, DraftHabits, HeadToHead, LeagueHistory, Records, WeeklyPayouts
+from helpers.owners import OwnerIndex
+from helpers.pipeline import Accumulator, run_pipeline
+from helpers.survivor import SurvivorPools
+from helpers.synthetic import VARIANTS, SyntheticFetcher, synthetic_season
+
+BASELINE_PATH = PROJECT_ROOT / "scripts" / "bench_baseline.json"
+PAYOUT_CONFIG = PROJECT_ROOT / "scripts" / "weekly_payouts_config.json"
+SURVIVOR_CONFIG = PROJECT_ROOT / "scripts" / "survivor_pools_config.json"
+OUTPUT_PATH = PROJECT_ROOT / "bench_output.txt"
+FIRST_YEAR = 2000  # fixed so results never depend on today's date
+TOLERANCE = 0.5  # shared machines easily swing 30% between runs
+REPEAT = 3
+MIN_SECONDS = 0.05  # shorter runs are mostly timer noise, only their results are compared
+
+
+# === ANALYZERS ===
+class SurvivorSeasons(Accumulator):
+    """Runs the survivor pools over each season's weekly scores, the way
+    weekly_summary.py feeds them to SurvivorPools.consume()."""
+
+    config = ("years", "owners", "pools_config")
+
+    def __init__(self, years, owners, pools_config):
+        self.years = years
+        self.owners = owners
+        self.pools_config = pools_config
+        self.scores = []
+        self.team_names = {}
+        self.results = {}  # year -> {pool: results}
+
+    def start_season(self, league):
+        self.scores = []
+        self.team_names = {team.team_id: team.team_name for team in league.teams}
+
+    def add_week(self, league, week, box_scores):
+        for box in box_scores:
+            for team_id, points, _ in box.sides():
+                if team_id:
+                    self.scores.append((week, self.owners.name_of(league.year, team_id),
+                                        self.team_names[team_id], points))
+
+    def end_season(self, league):
+        final_week = max((week for week, _, _, _ in self.scores), default=0)
+        self.results[league.year] = SurvivorPools(self.pools_config).consume(self.scores, final_week)
+
+    def rows(self):
+        return [{"Year": year, "Pool": name, **result}
+                for year in sorted(self.results) for name, result in self.results[year].items()]
+
+
+# Each builds the accumulator one of the scripts runs; "survivor" wraps the
+# survivor pools, which weekly_summary.py feeds from its export. "fetch" only
+# walks the synthetic weeks, so its time is the floor every other analyzer
+# pays. All of them run behind the owner index, like in the scripts.
+ANALYZERS = {
+    "fetch": lambda years, owners: Accumulator(),
+    "history": lambda years, owners: LeagueHistory(years, owners),
+    "h2h": lambda years, owners: HeadToHead(years, owners),
+    "records": lambda years, owners: Records(years, owners),
+    "advanced": lambda years, owners: AdvancedMetrics(years, owners),
+    "habits": lambda years, owners: DraftHabits(years, owners),
+    "payouts": lambda years, owners: WeeklyPayouts(years, owners, json.loads(PAYOUT_CONFIG.read_text())),
+    "survivor": lambda years, owners: SurvivorSeasons(years, owners, json.loads(SURVIVOR_CONFIG.read_text())),
+}
+
+
+def run_analyzer(name, n_leagues, n_seasons, n_teams, n_weeks):
+    years = range(FIRST_YEAR, FIRST_YEAR + n_seasons)
+    fetcher = SyntheticFetcher(n_teams, n_weeks)
+    digest = hashlib.sha1()
+    for league_id in range(1, n_leagues + 1):
+        owners = OwnerIndex(years)
+        acc = ANALYZERS[name](years, owners)
+        acc.years = years
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_pipeline(league_id, [owners, acc], fetcher=fetcher)
+        digest.update(json.dumps(acc.rows(), sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def measure(name, n_leagues, n_seasons, n_teams, n_weeks, memory=True, repeat=REPEAT):
+    # Runs in its own process so earlier analyzers never share caches or heap.
+    # The synthetic seasons are generated up front so only analysis is timed.
+    for variant in range(VARIANTS):
+        synthetic_season(n_teams, n_weeks, variant)
+    run_analyzer(name, 1, 1, n_teams, n_weeks)
+
+    # Best of `repeat`: the fastest run is the one least disturbed by the machine
+    seconds = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        digest = run_analyzer(name, n_leagues, n_seasons, n_teams, n_weeks)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        run_analyzer(name, n_leagues, n_seasons, n_teams, n_weeks)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    team_weeks = n_leagues * n_seasons * n_teams * n_weeks
+    return {
+        "seconds": round(seconds, 4),
+        "team_weeks_per_s": round(team_weeks / seconds),
+        "peak_mb": round(peak_mb, 2) if peak_mb is not None else None,
+        "digest": digest,
+    }
+
+
+# === REPORTING ===
+def case_key(name, shape):
+    return f"{name}@{'x'.join(map(str, shape))}"
+
+
+def compare(result, base, tolerance):
+    if base is None:
+        return "new"
+    if result["digest"] != base["digest"]:
+        return "RESULTS CHANGED"
+    if max(result["seconds"], base["seconds"]) < MIN_SECONDS:
+        return "ok"
+    change = result["seconds"] / base["seconds"] - 1
+    if change > tolerance:
+        return f"SLOWER {change:+.0%}"
+    if change < -tolerance:
+        return f"faster {change:+.0%}"
+    return f"ok {change:+.0%}"
+
+
+def scaling_exponent(points):
+    # Slope of log(time) against log(work) between the smallest and largest
+    # runs: ~1 is linear, clearly above 1 means something grows too fast
+    (w0, t0), (w1, t1) = points[0], points[-1]
+    if w1 == w0 or t0 <= 0:
+        return None
+    return math.log(t1 / t0) / math.log(w1 / w0)
+
+
+def parse_list(text):
+    return [int(value) for value in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the analyzers on synthetic leagues")
+    parser.add_argument("--analyzers", default=",".join(ANALYZERS))
+    parser.add_argument("--leagues", type=parse_list, default=[1, 10])
+    parser.add_argument("--seasons", type=parse_list, default=[20])
+    parser.add_argument("--teams", type=parse_list, default=[12])
+    parser.add_argument("--weeks", type=int, default=17)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per case, the fastest counts")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak memory pass")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {BASELINE_PATH.name}")
+    args = parser.parse_args()
+
+    names = args.analyzers.split(",")
+    shapes = [(leagues, seasons, teams, args.weeks)
+              for teams in args.teams for seasons in args.seasons for leagues in args.leagues]
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+    results = {}
+    lines = [f"{'analyzer':<10} {'leagues x seasons x teams x weeks':>34} {'seconds':>9} "
+             f"{'team-wk/s':>10} {'peak MB':>8}  vs baseline"]
+    regressions = 0
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for name in names:
+            curve = []
+            for shape in shapes:
+                result = pool.submit(measure, name, *shape, memory=not args.no_memory, repeat=args.repeat).result()
+                key = case_key(name, shape)
+                results[key] = result
+                status = compare(result, baseline.get(key), args.tolerance)
+                regressions += status.startswith(("SLOWER", "RESULTS"))
+                curve.append((shape[0] * shape[1] * shape[2] * shape[3], result["seconds"]))
+
+                peak = f"{result['peak_mb']:.1f}" if result["peak_mb"] is not None else "-"
+                lines.append(f"{name:<10} {' x '.join(map(str, shape)):>34} {result['seconds']:>9.3f} "
+                             f"{result['team_weeks_per_s']:>10} {peak:>8}  {status}")
+                print(lines[-1], flush=True)
+
+            exponent = scaling_exponent(sorted(curve)) if len(curve) > 1 else None
+            if exponent is not None:
+                lines.append(f"{name:<10} scaling exponent {exponent:.2f}")
+                print(lines[-1], flush=True)
+
+    with open(OUTPUT_PATH, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baseline to {BASELINE_PATH}")
+    elif regressions:
+        sys.exit(1)
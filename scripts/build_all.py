@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from helpers.build import build_league
+from helpers.checkpoint import STATE_DIR
+from helpers.cli import parse_args
+from helpers.drafts import DRAFT_INDEX_PATH
+from helpers.metrics import METRICS
+from helpers.owners import OWNERS_PATH
+from helpers.pipeline import fetcher_for
+from helpers.standings import STANDINGS_PATH
+from helpers.store import ARCHIVE_PATH
+from helpers.utilities import get_credentials, get_owner_map
+
+# === CONFIGURATION ===
+LEAGUE_ID = 885349
+FULL_HISTORY = range(2013, 2026)
+
+
+def main(args):
+    creds = get_credentials()
+
+    # === ONE CRAWL, EVERY OUTPUT ===
+    build_league(LEAGUE_ID, FULL_HISTORY, args.output_dir, get_owner_map(), swid=creds['swid'],
+                 espn_s2=creds['espn_s2'], fetcher=fetcher_for(args), checkpoint=STATE_DIR / "build_all.pkl",
+                 archive_path=None if args.from_archive else ARCHIVE_PATH, incremental=args.incremental,
+                 draft_index_path=DRAFT_INDEX_PATH, standings_path=STANDINGS_PATH,
+                 owners_path=OWNERS_PATH)
+
+    # === RUN REPORT ===
+    METRICS.write("build_all", args.metrics_dir, league=LEAGUE_ID)
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from helpers.site import build_site
+
+# Reads the CSV/JSON outputs of the other scripts and writes one
+# pre-aggregated payload per tab (plus .gz/.br copies) under ../data
+
+
+def main():
+    manifest = build_site()
+    for tab, filename in manifest.items():
+        print(f"{tab}: data/{filename}")
+
+
+if __name__ == "__main__":
+    main()
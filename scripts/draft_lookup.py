@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import argparse
+
+from helpers.drafts import DRAFT_INDEX_PATH, DraftIndex
+
+# Answers draft questions from the saved draft index (written by
+# build_all.py and owner_habits.py), without fetching anything
+
+
+def print_player(index, player):
+    picks = index.player_picks(player)
+    if not picks:
+        print(f"{player} was never drafted")
+        return
+    for pick in picks:
+        owner = index.owner_names.get(pick["owner_id"], "??")
+        print(f"{pick['year']}  {owner:<4} round {pick['round_num']:>2}, pick {pick['round_pick']:>2}  "
+              f"{pick['player_name']}")
+
+
+def print_owner(index, owner, top):
+    profile = index.owner_profile(owner)
+    print(f"{profile['owner_name']}: {profile['picks']} picks over {len(profile['seasons'])} seasons")
+    print("By round:    " + ", ".join(f"R{round_num} {count}" for round_num, count in profile["by_round"].items()))
+    print("By position: " + ", ".join(f"{pos} {count}" for pos, count in profile["by_position"].items()))
+    print(f"Top {top} repeat picks:")
+    for repeat in index.top_repeats(owner, top):
+        print(f"  {repeat['times']}x {repeat['player_name']} ({' / '.join(map(str, repeat['seasons']))})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Look up draft history in the saved draft index")
+    parser.add_argument("--player", help="player name or ESPN player id")
+    parser.add_argument("--owner", help="owner initials or owner id")
+    parser.add_argument("--top", type=int, default=5, help="repeat picks to list per owner")
+    parser.add_argument("--index", type=Path, default=DRAFT_INDEX_PATH)
+    args = parser.parse_args()
+
+    try:
+        index = DraftIndex.load(args.index)
+    except OSError:
+        sys.exit(f"No draft index at {args.index}, run build_all.py or owner_habits.py first")
+
+    if args.player:
+        print_player(index, int(args.player) if args.player.isdigit() else args.player)
+    if args.owner:
+        try:
+            print_owner(index, args.owner, args.top)
+        except KeyError as e:
+            sys.exit(e.args[0])
+    if not args.player and not args.owner:
+        for owner_id in index.owners():
+            print_owner(index, owner_id, args.top)
+            print()
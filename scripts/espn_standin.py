@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import argparse
+
+from helpers.standin import DEFAULT_PORT, FIXTURE_DIR, FixtureStore, standin_server, standin_url
+
+# Record once against ESPN:
+#   python espn_standin.py --record
+#   python build_all.py --standin http://127.0.0.1:8765/apis/v3/games/
+# then drop --record and every later run is served from ../ignore/fixtures
+# without touching the network.
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the ESPN fantasy API")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_DIR)
+    parser.add_argument("--record", action="store_true",
+                        help="forward requests without a fixture to ESPN and save the response")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    server = standin_server(args.port, FixtureStore(args.fixtures), record=args.record)
+    mode = "recording" if args.record else "replaying"
+    print(f"ESPN stand-in {mode} {args.fixtures} at {standin_url(args.port)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -4,89 +4,33 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from espn_api.football import League
-import pandas as pd
-import json
-from collections import defaultdict
-
+from helpers.accumulators import HeadToHead
+from helpers.checkpoint import STATE_DIR
+from helpers.cli import parse_args
+from helpers.metrics import METRICS
+from helpers.owners import OwnerIndex
+from helpers.pipeline import run_pipeline, export, fetcher_for
 from helpers.utilities import get_credentials, get_owner_map
 
-CREDS = get_credentials()
-OWNER_MAP = get_owner_map()
-
 LEAGUE_ID = 885349
 YEAR_RANGE = range(2013, 2026)  # Adjust as needed
 
-SWID = CREDS['swid']
-ESPN_S2 = CREDS['espn_s2']
-
-# === Matchup tracker ===
-matchups = defaultdict(lambda: {
-    'Wins': 0, 'Losses': 0, 'Ties': 0,
-    'Games Played': 0,
-    'Points For': 0.0,
-    'Points Against': 0.0
-})
-
-# === Map owner_id to latest name ===
-owner_id_to_name = {}
-
-for year in YEAR_RANGE:
-    print(f"Processing {year}...")
-    try:
-        league = League(league_id=LEAGUE_ID, year=year, swid=SWID, espn_s2=ESPN_S2)
-    except Exception as e:
-        print(f"Error loading {year}: {e}")
-        continue
-
-    team_map = {team.team_id: team for team in league.teams}
-    id_map = {team.team_id: team.owners[0]['id'] for team in league.teams}
-    name_map = {team.owners[0]['id']: f"{team.owners[0]['firstName'][0]}{team.owners[0]['lastName'][0]}" for team in league.teams}
-    owner_id_to_name.update(name_map)
-
-    for week in range(1, league.settings.reg_season_count + 1):
-        scoreboard = league.scoreboard(week)
-        for match in scoreboard:
-            if not match.home_team or not match.away_team:
-                continue
-
-            home_id = id_map[match.home_team.team_id]
-            away_id = id_map[match.away_team.team_id]
 
-            home_points = match.home_score
-            away_points = match.away_score
+def main(args):
+    creds = get_credentials()
 
-            # Track for both perspectives
-            for p1, p2, p1_pts, p2_pts in [
-                (home_id, away_id, home_points, away_points),
-                (away_id, home_id, away_points, home_points)
-            ]:
-                key = (p1, p2)
-                matchups[key]['Games Played'] += 1
-                matchups[key]['Points For'] += p1_pts
-                matchups[key]['Points Against'] += p2_pts
+    # === Matchup tracker ===
+    owners = OwnerIndex(YEAR_RANGE, get_owner_map())
+    head_to_head = HeadToHead(YEAR_RANGE, owners)
+    run_pipeline(LEAGUE_ID, [owners, head_to_head], swid=creds['swid'], espn_s2=creds['espn_s2'], fetcher=fetcher_for(args),
+                 checkpoint=STATE_DIR / "head_to_head.pkl", incremental=args.incremental)
 
-                if p1_pts > p2_pts:
-                    matchups[key]['Wins'] += 1
-                elif p1_pts < p2_pts:
-                    matchups[key]['Losses'] += 1
-                else:
-                    matchups[key]['Ties'] += 1
+    export(head_to_head, args.output_dir / 'head_to_head_lifetime.csv')
+    head_to_head.write_owner_slices(args.output_dir / 'h2h')
 
-# === Build output DataFrame ===
-records = []
-for (owner_id, opp_id), stats in matchups.items():
-    records.append({
-        'Owner ID': owner_id,
-        'Owner Name': owner_id_to_name.get(owner_id, 'Unknown'),
-        'Opponent ID': opp_id,
-        'Opponent Name': owner_id_to_name.get(opp_id, 'Unknown'),
-        'Win %': round(100 * stats['Wins'] / stats['Games Played'], 2) if stats['Games Played'] > 0 else 0.0,
-        **stats
-    })
+    # === RUN REPORT ===
+    METRICS.write("head_to_head", args.metrics_dir, league=LEAGUE_ID)
 
-df = pd.DataFrame(records)
 
-# Optional: sort and format
-df = df.sort_values(by=['Owner Name', 'Opponent Name'])
-df.to_csv('../head_to_head_lifetime.csv', index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    main(parse_args())
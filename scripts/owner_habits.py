@@ -1,73 +1,41 @@
-from espn_api.football import League
-import pandas as pd
-import json
-from collections import defaultdict, Counter
-
-# === LOAD CREDENTIALS ===
-CREDS_FILE = '../ignore/espn_creds.json'
-with open(CREDS_FILE) as f:
-    CREDS = json.load(f)
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from helpers.accumulators import DraftHabits
+from helpers.build import save_draft_index
+from helpers.checkpoint import STATE_DIR
+from helpers.cli import parse_args
+from helpers.drafts import DRAFT_INDEX_PATH
+from helpers.metrics import METRICS
+from helpers.owners import OwnerIndex
+from helpers.pipeline import run_pipeline, export, fetcher_for
+from helpers.utilities import get_credentials, get_owner_map
 
 # === CONFIGURATION ===
 LEAGUE_ID = 885349               # Replace with your league ID
 YEAR_RANGE = range(2013, 2026)
-SWID = CREDS['swid']
-ESPN_S2 = CREDS['espn_s2']
 
-# === ACCUMULATORS ===
-owner_player_counts = defaultdict(Counter)
-owner_player_years = defaultdict(lambda: defaultdict(list))  # owner_id -> player_name -> [years]
-owner_initials = {}
 
-# === MAIN LOOP ===
-for year in YEAR_RANGE:
-    print(f"Processing {year}...")
-    try:
-        league = League(league_id=LEAGUE_ID, year=year, swid=SWID, espn_s2=ESPN_S2)
-    except Exception as e:
-        print(f"Failed to load league for {year}: {e}")
-        continue
+def main(args):
+    # === LOAD CREDENTIALS ===
+    creds = get_credentials()
 
-    team_id_to_owner = {}
-    for team in league.teams:
-        if not team.owners or not team.owners[0].get('id'):
-            continue
-        owner_id = team.owners[0]['id']
-        initials = f"{team.owners[0]['firstName'][0]}{team.owners[0]['lastName'][0]}"
-        team_id_to_owner[team.team_id] = owner_id
-        owner_initials[owner_id] = initials
+    # === MAIN LOOP ===
+    owners = OwnerIndex(YEAR_RANGE, get_owner_map())
+    habits = DraftHabits(YEAR_RANGE, owners)
+    run_pipeline(LEAGUE_ID, [owners, habits], swid=creds['swid'], espn_s2=creds['espn_s2'], fetcher=fetcher_for(args),
+                 checkpoint=STATE_DIR / "owner_habits.pkl", incremental=args.incremental)
 
-    try:
-        draft = league.draft
-    except Exception as e:
-        print(f"Could not load draft data for {year}: {e}")
-        continue
+    # === OUTPUT ===
+    export(habits, args.output_dir / "most_drafted_players.csv")
+    save_draft_index(habits.index, LEAGUE_ID, DRAFT_INDEX_PATH)  # for draft_lookup.py
 
-    for pick in draft:
-        team = pick.team
-        player_name = pick.playerName
-        if team.team_id not in team_id_to_owner:
-            continue
-        owner_id = team_id_to_owner[team.team_id]
-        owner_player_counts[owner_id][player_name] += 1
-        owner_player_years[owner_id][player_name].append(year)
+    # === RUN REPORT ===
+    METRICS.write("owner_habits", args.metrics_dir, league=LEAGUE_ID)
 
-# === OUTPUT ===
-rows = []
-for owner_id, counter in owner_player_counts.items():
-    if not counter:
-        continue
-    top_player, count = counter.most_common(1)[0]
-    seasons = sorted(owner_player_years[owner_id][top_player])
-    rows.append({
-        "Owner ID": owner_id,
-        "Owner Name": owner_initials.get(owner_id, "??"),
-        "Most Drafted Player": top_player,
-        "Times Drafted": count,
-        "Drafted Seasons": " / ".join(map(str, seasons)) 
-    })
 
-df = pd.DataFrame(rows)
-df = df.sort_values(by="Times Drafted", ascending=False)
-df.to_csv("../most_drafted_players.csv", index=False)
-print("Exported to ../most_drafted_players.csv")
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from helpers.cli import add_luck_arguments, parse_args
+from helpers.export import write_json
+from helpers.owners import OWNERS_PATH, OwnerIndex
+from helpers.pipeline import export_rows
+from helpers.schedule_luck import luck_summary, season_scores, simulate_seasons
+from helpers.standings import STANDINGS_PATH, StandingsTimeline
+
+# Replays every season of the saved standings timeline (written by
+# get_history.py and build_all.py, with the owner index saved beside it) under --simulations random schedules,
+# with the real weekly scores, to see how much each record owed to the
+# schedule. Nothing is fetched.
+
+
+def main(args):
+    standings_path = args.standings or STANDINGS_PATH
+    try:
+        timeline = StandingsTimeline.load(standings_path)
+    except OSError:
+        sys.exit(f"No standings timeline at {standings_path}, run get_history.py or build_all.py first")
+    owners_path = standings_path.with_name(OWNERS_PATH.name)
+    try:
+        owners = OwnerIndex.load(owners_path)
+    except OSError:
+        sys.exit(f"No owner index at {owners_path}, run get_history.py or build_all.py first")
+
+    seasons, actual_wins = {}, {}
+    for year, season in sorted(timeline.seasons.items()):
+        if season.weeks:
+            seasons[year], actual_wins[year] = season_scores(season)
+    counts = simulate_seasons(seasons, args.simulations, seed=args.seed, processes=args.processes)
+
+    rows = []
+    distributions = {}
+    for year in sorted(counts):
+        summary = luck_summary(counts[year], actual_wins[year])
+        distributions[year] = {}
+        for i, team_id in enumerate(timeline.season(year).team_ids):
+            owner_id = owners.owner(year, team_id)
+            wins = float(actual_wins[year][i])
+            rows.append({
+                "Year": year,
+                "Owner ID": owner_id,
+                "Owner Name": owners.name(owner_id),
+                "Weeks": len(seasons[year]),
+                "Wins": wins,
+                "Expected Wins": round(float(summary["expected"][i]), 2),
+                "Expected Wins Spread": round(float(summary["spread"][i]), 2),
+                "Schedule Luck": round(wins - float(summary["expected"][i]), 2),
+                "Wins Percentile": round(float(summary["percentile"][i]), 1),
+                "Record Odds %": round(100 * float(summary["odds"][i]), 2),
+            })
+            # Share of schedules ending on each win total
+            team_counts = counts[year][i]
+            distributions[year][owner_id] = {
+                str(half_wins / 2): round(int(count) / int(team_counts.sum()), 5)
+                for half_wins, count in enumerate(team_counts) if count
+            }
+
+    export_rows(rows, args.output_dir / "schedule_luck.csv", sort_by=["Year", "Owner Name"])
+    distribution_path = args.output_dir / "schedule_luck_distributions.json"
+    write_json(distributions, distribution_path, indent=2)
+    print(f"Saved to {distribution_path}")
+
+
+if __name__ == "__main__":
+    main(parse_args(add_luck_arguments))
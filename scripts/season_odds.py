@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from helpers.bulk import fetch_schedule
+from helpers.cache import cached_league
+from helpers.cli import add_odds_arguments, parse_args
+from helpers.fetcher import Fetcher
+from helpers.metrics import METRICS
+from helpers.owners import OwnerIndex
+from helpers.pipeline import export_rows, is_final
+from helpers.season_odds import SeasonState, simulate_odds
+from helpers.standings import SeasonStandings
+from helpers.utilities import get_credentials, get_owner_map
+
+# Looks forward from this week: plays the rest of the regular season and the
+# playoffs --simulations times from the current standings and every team's
+# scoring so far. Meant for a weekly cron, e.g. `whodat odds --simulations 1000000`.
+
+LEAGUE_ID = 885349
+YEAR = 2025
+PLAYOFF_TEAMS = 6  # when the league settings don't say
+
+
+def season_so_far(league):
+    # Standings from the final weeks, and every game not final yet. The
+    # schedule comes in one request; a week is its matchup period, as with
+    # scoreboard(week).
+    reg_season_count = league.settings.reg_season_count
+    season = SeasonStandings([team.team_id for team in league.teams], reg_season_count)
+    schedule = fetch_schedule(league)
+    remaining = []
+    for week in range(1, reg_season_count + 1):
+        games = [game for game in schedule.get(week, []) if game[0] and game[1]]
+        if is_final(league, week):
+            season.add_week(week, games)
+        else:
+            remaining.extend((week, home_id, away_id) for home_id, away_id, _, _ in games)
+    return season, remaining
+
+
+def main(args):
+    creds = get_credentials()
+
+    fetcher = Fetcher(base_url=args.standin)
+    league = cached_league(LEAGUE_ID, YEAR, swid=creds['swid'], espn_s2=creds['espn_s2'], limiter=fetcher.limiter,
+                           base_url=args.standin)
+    owners = OwnerIndex(owner_map=get_owner_map())
+    owners.add_season(YEAR, league.teams)
+    season, remaining = season_so_far(league)
+    playoff_teams = getattr(league.settings, "playoff_team_count", None) or PLAYOFF_TEAMS
+    state = SeasonState(season, remaining, playoff_teams)
+
+    print(f"Simulating {args.simulations:,} seasons from week {season.last_week()} "
+          f"({len(remaining)} games left)...")
+    with METRICS.time("simulate"):
+        odds = simulate_odds(state, args.simulations, seed=args.seed, processes=args.processes)
+
+    teams_by_id = {team.team_id: team for team in league.teams}
+    rows = []
+    for i, team_id in enumerate(state.team_ids):
+        record = season.team_after(season.last_week(), team_id) or {"wins": 0, "losses": 0, "ties": 0}
+        rows.append({
+            "Owner ID": owners.owner(YEAR, team_id),
+            "Owner Name": owners.name_of(YEAR, team_id),
+            "Team Name": teams_by_id[team_id].team_name,
+            "Record": f"{record['wins']}-{record['losses']}" + (f"-{record['ties']}" if record['ties'] else ""),
+            "Projected Wins": round(float(odds["projected_wins"][i]), 2),
+            "Playoff %": round(100 * float(odds["playoffs"][i]), 2),
+            "Bye %": round(100 * float(odds["bye"][i]), 2),
+            "Champion %": round(100 * float(odds["champion"][i]), 2),
+            "Sacko %": round(100 * float(odds["sacko"][i]), 2),
+        })
+    export_rows(rows, args.output_dir / "season_odds.csv", sort_by="Projected Wins", ascending=False)
+
+    # === RUN REPORT ===
+    METRICS.write("season_odds", args.metrics_dir, league=LEAGUE_ID)
+
+
+if __name__ == "__main__":
+    main(parse_args(add_odds_arguments))
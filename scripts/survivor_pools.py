@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import csv
+import json
+
+from helpers.cli import add_output_arguments, parse_args
+from helpers.survivor import SurvivorPools, write_results
+
+# Re-runs every survivor pool from the weekly_efficiency_awards.csv that
+# weekly_summary.py last exported, without fetching anything (handy after
+# changing survivor_pools_config.json). Every week in the export counts and
+# the saved pool state is left alone; weekly_summary.py keeps that current.
+
+SURVIVOR_CONFIG = Path(__file__).with_name('survivor_pools_config.json')
+
+
+def read_weekly_scores(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(int(row["Week"]), row["Owner"], row["Team Name"], float(row["Actual Points"]))
+                for row in csv.DictReader(f)]
+
+
+def main(args):
+    with open(SURVIVOR_CONFIG) as f:
+        survivor_config = json.load(f)
+
+    weekly_scores = read_weekly_scores(args.output_dir / "weekly_efficiency_awards.csv")
+    final_week = max((week for week, _, _, _ in weekly_scores), default=0)
+    results = SurvivorPools(survivor_config).consume(weekly_scores, final_week)
+    write_results(results, args.output_dir)
+
+
+if __name__ == "__main__":
+    main(parse_args(add_output_arguments))
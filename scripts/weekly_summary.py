@@ -1,45 +1,48 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
 import json
+import numpy as np
 import pandas as pd
-from collections import defaultdict
-from espn_api.football import League
-
-def get_optimal_lineup(players, lineup_config):
-    used_ids = set()
-    optimal_lineup = []
-
-    position_groups = defaultdict(list)
-    for p in players:
-        if p.points is not None and p.points >= 0:
-            position_groups[p.position].append(p)
-
-    def select_best(pos_list, count):
-        nonlocal used_ids
-        eligible = [p for p in pos_list if hasattr(p, 'playerId') and p.playerId not in used_ids]
-        best = sorted(eligible, key=lambda p: p.points or 0, reverse=True)[:count]
-        used_ids.update(p.playerId for p in best)
-        return best
-
-    for pos in ["QB", "RB", "WR", "TE", "K", "D/ST"]:
-        count = lineup_config.get(pos, 0)
-        optimal_lineup.extend(select_best(position_groups[pos], count))
-
-    flex_count = lineup_config.get("FLEX", 0)
-    flex_pool = []
-    for pos in ["RB", "WR", "TE"]:
-        flex_pool.extend([p for p in position_groups[pos] if p.playerId not in used_ids])
-    optimal_lineup.extend(select_best(flex_pool, flex_count))
-
-    return optimal_lineup
-
-def calculate_team_efficiency(team, lineup, config, week):
-    actual = sum(p.points for p in lineup if p.slot_position not in ['BE', 'IR'] and p.points is not None)
-    optimal = sum(p.points for p in get_optimal_lineup(lineup, config) if p.points is not None)
+
+from helpers.accumulators import WeeklyPayouts
+from helpers.checkpoint import STATE_DIR
+from helpers.cli import add_fetch_arguments, parse_args
+from helpers.compact import is_starter, line_points, optimal_points
+from helpers.export import write_json
+from helpers.fetcher import Fetcher
+from helpers.metrics import METRICS
+from helpers.owners import OwnerIndex
+from helpers.pipeline import Accumulator, export_rows, fetch_weeks, is_final, run_pipeline
+from helpers.survivor import SurvivorPools, write_results
+from helpers.utilities import get_credentials, get_owner_map
+
+LEAGUE_ID = 885349
+YEAR = 2025
+LINEUP_CONFIG = {
+    "QB": 1,
+    "RB": 2,
+    "WR": 2,
+    "TE": 1,
+    "FLEX": 2,
+    "K": 1,
+    "D/ST": 1
+}
+PAYOUT_CONFIG = Path(__file__).with_name('weekly_payouts_config.json')
+SURVIVOR_CONFIG = Path(__file__).with_name('survivor_pools_config.json')
+
+def calculate_team_efficiency(team, owner, lineup, optimal, week):
+    points = line_points(lineup)[is_starter(lineup)]
+    actual = sum(points[~np.isnan(points)].tolist())
     efficiency = (actual / optimal) * 100 if optimal > 0 else 0.0
 
     return {
         "Week": week,
         "Team Name": team.team_name,
-        "Owner": f"{team.owners[0]['firstName'][0]}{team.owners[0]['lastName'][0]}" if team.owners else "N/A",
+        "Owner": owner,
         "Actual Points": round(actual, 2),
         "Optimal Points": round(optimal, 2),
         "Efficiency %": round(efficiency, 2),
@@ -63,206 +66,119 @@ def assign_weekly_awards(week_data):
         elif entry == min_eff:
             entry["Award"] = "🧠 Staniel's Should’ve Played My Bench Golden Clipboard"
 
-def export_weekly_efficiencies(league_id, year, swid, espn_s2, output_path, lineup_config, payouts):
-    league = League(league_id=league_id, year=year, swid=swid, espn_s2=espn_s2)
+def export_weekly_efficiencies(league, fetcher, year, output_path, lineup_config, payouts):
+    teams_by_id = {team.team_id: team for team in league.teams}
+    owners = OwnerIndex(owner_map=get_owner_map())
+    owners.add_season(year, league.teams)
     all_data = []
+    exported = set()
 
-    for week in range(1, min(league.currentMatchupPeriod, league.settings.reg_season_count) + 1):
-        try:
-            box_scores = league.box_scores(week)
-        except Exception as e:
-            print(f"⚠️ Failed to load week {week}: {e}")
+    weeks = range(1, min(league.currentMatchupPeriod, league.settings.reg_season_count) + 1)
+    for week, box_scores, error in fetch_weeks(fetcher, league, list(weeks)):
+        if error:
+            print(f"⚠️ Failed to load week {week}: {error}")
             continue
 
-        week_data = []
+        sides = [side for box in box_scores for side in box.sides()]
+        optimal = optimal_points(box_scores, lineup_config, lineup_config.get("FLEX", 0))
 
-        for box in box_scores:
-            home_data = calculate_team_efficiency(box.home_team, box.home_lineup, lineup_config, week)
-            away_data = calculate_team_efficiency(box.away_team, box.away_lineup, lineup_config, week)
-            week_data.extend([home_data, away_data])
+        week_data = [
+            calculate_team_efficiency(teams_by_id[team_id], owners.name_of(year, team_id), lineup, float(best), week)
+            for (team_id, _, lineup), best in zip(sides, optimal)
+            if team_id
+        ]
 
         assign_weekly_awards(week_data)
         all_data.extend(week_data)
+        if week_data:
+            exported.add(week)
+
+    all_data.sort(key=lambda row: (row["Week"], row["Team Name"]))
+    export_rows(all_data, output_path)
+
+    # Scores of the last final week and before won't change any more. Like
+    # run_pipeline's high-water mark it stops short of the first week that
+    # failed or came back empty, so the survivor pools never commit past a
+    # week they haven't seen.
+    final_week = 0
+    for week in weeks:
+        if week not in exported or not is_final(league, week):
+            break
+        final_week = week
+    return pd.DataFrame(all_data), final_week
+
+
+def calculate_survivor_eliminations(weekly_scores, final_week, pools_config, state_path, output_dir):
+    # Only weeks the saved pools haven't seen are processed
+    pools = SurvivorPools.load(state_path, pools_config)
+    results = pools.consume(zip(weekly_scores["Week"], weekly_scores["Owner"], weekly_scores["Team Name"],
+                                weekly_scores["Actual Points"]), final_week)
+    pools.save(state_path)
+    write_results(results, output_dir)
+
+class LoadedSeason(Accumulator):
+    """Keeps the League run_pipeline loaded, so the rest of the summary reuses it."""
+
+    def __init__(self, year):
+        self.years = [year]
+        self.league = None
+
+    def weeks(self, league):
+        return []
+
+    def start_season(self, league):
+        self.league = league
+
+
+def calculate_all_weekly_payouts(league_id, year, swid, espn_s2, payout_config, fetcher):
+    # The season's final payout weeks run through WeeklyPayouts, which only
+    # fetches the weeks with a payout rule. Returns the winners and the
+    # season's League.
+    owners = OwnerIndex([year], get_owner_map())
+    payouts = WeeklyPayouts([year], owners, payout_config)
+    season = LoadedSeason(year)
+    run_pipeline(league_id, [owners, payouts, season], swid=swid, espn_s2=espn_s2, fetcher=fetcher)
+    if season.league is None:
+        raise RuntimeError(f"Could not load the {year} season")
+    return payouts.season_winners(year), season.league
+
+
+def main(args):
+    creds = get_credentials()
 
-    df = pd.DataFrame(all_data)
-    df.sort_values(by=["Week", "Team Name"], inplace=True)
-    df.to_csv(output_path, index=False)
-    print(f"✅ Exported to {output_path}")
-
-
-def calculate_survivor_eliminations(csv_path, output_json_path):
-    df = pd.read_csv(csv_path)
-    df = df.sort_values(by=["Week", "Actual Points"])
-
-    eliminated = {}
-    remaining = set(df["Owner"].unique())
-
-    for week in sorted(df["Week"].unique()):
-        if week >= 12:
-            continue
-        week_df = df[df["Week"] == week]
-        week_df = week_df[week_df["Owner"].isin(remaining)]
-
-        if not week_df.empty:
-            lowest = week_df.iloc[0]
-            eliminated_player = lowest["Owner"]
-            eliminated[eliminated_player] = int(week)
-            remaining.remove(eliminated_player)
-
-    survivor_result = {
-        "eliminated": eliminated,
-        "remaining": list(sorted(remaining))
-    }
-
-    with open(output_json_path, "w") as f:
-        json.dump(survivor_result, f, indent=2)
-    print(f"✅ Survivor results saved to {output_json_path}")
-
-def calculate_all_weekly_payouts(league_id, year, swid, espn_s2, payout_config):
-    league = League(league_id=league_id, year=year, swid=swid, espn_s2=espn_s2)
-    weeks_played = sorted(int(w) for w in league.settings.matchup_periods.keys() if int(w) in range(1, 15))
-
-    all_winners = []
-
-    def best(players, count):
-        return sorted(players, key=lambda x: x.points or 0, reverse=True)[:count]
-
-    def add_points(players):
-        return sum(p.points or 0 for p in players)
-
-    for week in range(1, league.current_week):
-        if str(week) not in payout_config["weekly_payouts"]:
-            continue  # skip weeks with no payout rule
-
-        rule = payout_config["weekly_payouts"][str(week)]
-        payout_type = rule["type"]
-        box_scores = league.box_scores(week)
-        winners = []
-
-        for box in box_scores:
-            for team, lineup in [(box.home_team, box.home_lineup), (box.away_team, box.away_lineup)]:
-                owner = f"{team.owners[0]['firstName'][0]}{team.owners[0]['lastName'][0]}"
-                name = team.team_name
-                filtered = [p for p in lineup if p.slot_position != "BE" and p.points is not None]
-
-                if payout_type == "highest_total_points":
-                    total = sum(p.points for p in filtered)
-                    winners.append({
-                        "team": name,
-                        "owner": owner,
-                        "points": total,
-                        "players": [p.name for p in filtered],
-                        "text": "Highest Scoring Team"
-                    })
-
-                elif payout_type == "top_player_overall":
-                    top = max(filtered, key=lambda p: p.points)
-                    winners.append({
-                        "team": name,
-                        "owner": owner,
-                        "points": top.points,
-                        "players": [top.name],
-                        "text": "Top Individual Player Score"
-                    })
-
-                elif payout_type == "top_slot":
-                    max_combo = None
-                    max_points = -1
-                    slot_counts = rule["slots"]
-                    for pos, count in slot_counts.items():
-                        eligible = [p for p in filtered if p.position == pos]
-                        if len(eligible) >= count:
-                            top_players = best(eligible, count)
-                            points = add_points(top_players)
-                            if points > max_points:
-                                max_points = points
-                                max_combo = top_players
-                    if max_combo:
-                        winners.append({
-                            "team": name,
-                            "owner": owner,
-                            "points": max_points,
-                            "players": [p.name for p in max_combo],
-                            "text": f"Top {', '.join([f'{v}×{k}' for k, v in slot_counts.items()])} Score"
-                        })
-
-                elif payout_type == "top_slot_combo":
-                    slot_counts = rule["slots"]
-                    selected = []
-                    used_ids = set()
-
-                    for pos, count in slot_counts.items():
-                        eligible = [p for p in filtered if p.position == pos and p.playerId not in used_ids]
-                        top_players = best(eligible, count)
-                        used_ids.update(p.playerId for p in top_players)
-                        selected.extend(top_players)
-
-                    if len(selected) == sum(slot_counts.values()):
-                        total = add_points(selected)
-                        winners.append({
-                            "team": name,
-                            "owner": owner,
-                            "points": total,
-                            "players": [p.name for p in selected],
-                            "text": f"Top Combo: {', '.join([f'{v}×{k}' for k, v in slot_counts.items()])}"
-                        })
-
-        if winners:
-            top = max(winners, key=lambda w: w["points"])
-            all_winners.append({
-                "week": week,
-                "payout_text": top["text"],
-                "team": top["team"],
-                "owner": top["owner"],
-                "points": round(top["points"], 2),
-                "players": top["players"]
-            })
-
-    return all_winners
-
-
-
-# Example usage
-if __name__ == "__main__":
-    CREDS_FILE = "../ignore/espn_creds.json"
-    with open(CREDS_FILE) as f:
-        creds = json.load(f)
-    
-    PAYOUT_CONFIG = 'weekly_payouts_config.json'
     with open(PAYOUT_CONFIG) as f:
         payout_config = json.load(f)
-    
-    winners = calculate_all_weekly_payouts(
-        league_id=885349,
-        year=2025,
+
+    fetcher = Fetcher(base_url=args.standin)
+    winners, league = calculate_all_weekly_payouts(
+        league_id=LEAGUE_ID,
+        year=YEAR,
         swid=creds['swid'],
         espn_s2=creds['espn_s2'],
-        payout_config=payout_config
+        payout_config=payout_config,
+        fetcher=fetcher
     )
 
-    export_weekly_efficiencies(
-        league_id=885349,
-        year=2025,
-        swid=creds['swid'],
-        espn_s2=creds['espn_s2'],
-        output_path="../weekly_efficiency_awards.csv",
-        lineup_config={
-            "QB": 1,
-            "RB": 2,
-            "WR": 2,
-            "TE": 1,
-            "FLEX": 2,
-            "K": 1,
-            "D/ST": 1
-        },
+    weekly_scores, final_week = export_weekly_efficiencies(
+        league=league,
+        fetcher=fetcher,
+        year=YEAR,
+        output_path=args.output_dir / "weekly_efficiency_awards.csv",
+        lineup_config=LINEUP_CONFIG,
         payouts=winners
     )
 
+    with open(SURVIVOR_CONFIG) as f:
+        survivor_config = json.load(f)
 
-calculate_survivor_eliminations("../weekly_efficiency_awards.csv", "../survivor_results.json")
+    calculate_survivor_eliminations(weekly_scores, final_week, survivor_config,
+                                    STATE_DIR / f"survivor_{LEAGUE_ID}_{YEAR}.pkl", args.output_dir)
 
+    write_json(winners, args.output_dir / "weekly_payout_winners.json", indent=2)
 
+    # === RUN REPORT ===
+    METRICS.write("weekly_summary", args.metrics_dir, league=LEAGUE_ID)
 
 
-with open("../weekly_payout_winners.json", "w") as f:
-    json.dump(winners, f, indent=2)
\ No newline at end of file
+if __name__ == "__main__":
+    main(parse_args(add_fetch_arguments))
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import argparse
+import importlib
+
+from helpers.cli import (add_fetch_arguments, add_luck_arguments, add_odds_arguments, add_output_arguments,
+                         add_pipeline_arguments)
+
+# One entry point for every output:  python scripts/whodat.py <command> [options]
+# Each command runs the main() of one of the scripts next to this file. A
+# script (and with it pandas, numpy and espn_api) is only imported once its
+# command has been picked, so cheap commands start right away.
+
+# command -> (script, options, help)
+COMMANDS = {
+    "history": ("get_history", add_pipeline_arguments, "season-by-season standings"),
+    "h2h": ("head_to_head", add_pipeline_arguments, "lifetime head-to-head records"),
+    "records": ("records", add_pipeline_arguments, "all-time single-week records and leaderboards"),
+    "habits": ("owner_habits", add_pipeline_arguments, "most drafted players per owner"),
+    "advanced": ("advanced_history", add_pipeline_arguments, "luck, all-play and lineup efficiency"),
+    "weekly": ("weekly_summary", add_fetch_arguments, "this season's payouts, efficiency awards and survivor pools"),
+    "survivor": ("survivor_pools", add_output_arguments, "re-run the survivor pools from the last weekly export"),
+    "luck": ("schedule_luck", add_luck_arguments, "how much each record owed to the schedule"),
+    "odds": ("season_odds", add_odds_arguments, "playoff, bye, title and Sacko odds for the rest of the season"),
+    "all": ("build_all", add_pipeline_arguments, "every history output from one crawl"),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="whodat", description="Who Dat league history")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for name, (_, add_arguments, help_text) in COMMANDS.items():
+        add_arguments(commands.add_parser(name, help=help_text, description=help_text))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    script = importlib.import_module(f"scripts.{COMMANDS[args.command][0]}")
+    script.main(args)
+
+
+if __name__ == "__main__":
+    main()
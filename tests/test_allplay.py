@@ -0,0 +1,32 @@
+import numpy as np
+
+from helpers.allplay import all_play
+
+
+def test_all_play_on_a_fixed_week():
+    # Two weeks interleaved: week 1 has a tie at 90, week 2 a three-way tie
+    group = [1, 2, 1, 1, 2, 1, 2, 2]
+    scores = [90.0, 70.0, 120.5, 90.0, 70.0, 60.25, 70.0, 101.0]
+    wins, losses, ties = all_play(group, scores)
+
+    assert wins.tolist() == [1, 0, 3, 1, 0, 0, 0, 3]
+    assert losses.tolist() == [1, 1, 0, 1, 1, 3, 1, 0]
+    assert ties.tolist() == [1, 2, 0, 1, 2, 0, 2, 0]
+
+
+def test_all_play_matches_pairwise_counts():
+    rng = np.random.default_rng(3)
+    group = rng.integers(0, 5, 200)
+    scores = rng.integers(50, 60, 200).astype(float)
+    wins, losses, ties = all_play(group, scores)
+
+    for i in range(len(scores)):
+        others = (group == group[i]) & (np.arange(len(scores)) != i)
+        assert wins[i] == np.sum(others & (scores < scores[i]))
+        assert losses[i] == np.sum(others & (scores > scores[i]))
+        assert ties[i] == np.sum(others & (scores == scores[i]))
+
+
+def test_all_play_of_nothing():
+    wins, losses, ties = all_play([], [])
+    assert len(wins) == len(losses) == len(ties) == 0
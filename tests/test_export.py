@@ -0,0 +1,93 @@
+import csv
+import json
+import random
+
+import pytest
+
+from helpers.export import atomic_open, external_sort, sort_key, write_json, write_rows
+
+
+def make_rows(n, seed=5):
+    # Few distinct values so most keys tie; `i` records the input order
+    rng = random.Random(seed)
+    return [{"i": i, "year": rng.choice([2019, 2020, 2021]), "points": rng.choice([None, 1.5, 2.0, 7.25, float("nan")])}
+            for i in range(n)]
+
+
+def reference_key(descending):
+    # Missing values last either way, then the value in the asked direction
+    def key(row):
+        values = []
+        for column in ("year", "points"):
+            value = row[column]
+            missing = value is None or value != value
+            values.append((missing, 0 if missing else -value if descending else value))
+        return values
+    return key
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_external_sort_matches_sorted(tmp_path, ascending):
+    rows = make_rows(500)
+    key = sort_key(["year", "points"], ascending)
+    # A run size of 7 spills dozens of runs
+    spilled = list(external_sort(iter(rows), key, chunk_rows=7, directory=tmp_path))
+
+    assert [row["i"] for row in spilled] == [row["i"] for row in sorted(rows, key=key)]
+    assert [row["i"] for row in spilled] == [row["i"] for row in sorted(rows, key=reference_key(not ascending))]
+    # The runs are cleaned up once the merge is done
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("n", [0, 1, 6, 7, 8, 21])
+def test_external_sort_at_run_boundaries(tmp_path, n):
+    rows = make_rows(n)
+    key = sort_key("points")
+    spilled = external_sort(rows, key, chunk_rows=7, directory=tmp_path)
+    assert [row["i"] for row in spilled] == [row["i"] for row in sorted(rows, key=key)]
+
+
+def test_write_rows_sorts_through_small_runs(tmp_path):
+    rows = make_rows(100)
+    path = tmp_path / "out.csv"
+    assert write_rows(rows, path, sort_by=["year", "points"], ascending=False, chunk_rows=4) == 100
+
+    with open(path, newline="") as f:
+        written = [int(row["i"]) for row in csv.DictReader(f)]
+    assert written == [row["i"] for row in sorted(rows, key=reference_key(True))]
+
+
+def test_write_rows_ndjson_and_nothing_to_write(tmp_path):
+    path = tmp_path / "out.ndjson"
+    assert write_rows([{"a": 1, "b": float("nan")}], path) == 1
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [{"a": 1, "b": None}]
+
+    assert write_rows([], tmp_path / "empty.csv") is None
+    assert not (tmp_path / "empty.csv").exists()
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "out.json"
+    write_json({"version": 1}, path)
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write('{"version": 2')
+            raise RuntimeError("crawl failed halfway")
+
+    assert json.loads(path.read_text()) == {"version": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+def test_failed_export_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "out.csv"
+    write_rows([{"a": 1}], path)
+
+    def rows():
+        yield {"a": 2}
+        raise RuntimeError("crawl failed halfway")
+
+    with pytest.raises(RuntimeError):
+        write_rows(rows(), path)
+    assert path.read_text() == "a\n1\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv"]
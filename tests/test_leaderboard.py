@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from helpers.leaderboard import Leaderboard, Leaderboards
+
+
+def pushed(points, k, largest):
+    board = Leaderboard(k, largest)
+    for i, p in enumerate(points):
+        board.push(p, {"id": i, "points": p})
+    return [entry["id"] for entry in board.entries()]
+
+
+def expected(points, k, largest):
+    # A stable sort keeps the earlier of two equal scores first
+    order = sorted(range(len(points)), key=lambda i: -points[i] if largest else points[i])
+    return order[:k]
+
+
+@pytest.mark.parametrize("largest", [True, False])
+def test_matches_sorted(largest):
+    rng = random.Random(11)
+    for _ in range(100):
+        # Few distinct scores, so evictions happen at tied cut lines
+        points = [rng.choice([-3.5, 0.0, 12.25, 40.0, 88.0, 130.5]) for _ in range(rng.randint(0, 40))]
+        for k in (1, 3, 10):
+            assert pushed(points, k, largest) == expected(points, k, largest)
+
+
+def test_ties_keep_the_first_pushed():
+    assert pushed([50, 70, 70, 50, 70], 2, True) == [1, 2]
+    assert pushed([50, 70, 70, 50, 70], 2, False) == [0, 3]
+    assert pushed([50, 70, 70, 50, 70], 4, True) == [1, 2, 4, 0]
+
+
+def test_eviction_order():
+    board = Leaderboard(3)
+    for p in [10, 20, 30]:
+        board.push(p, p)
+    board.push(25, 25)  # evicts 10
+    board.push(5, 5)    # too low to get in
+    board.push(30, "late 30")  # evicts 20, but ranks after the first 30
+    assert board.entries() == [30, "late 30", 25]
+
+
+def test_boards_keep_top_and_bottom_per_slice():
+    boards = Leaderboards(k=2)
+    for week, (owner, points) in enumerate([("AK", 100), ("CC", 80), ("AK", 120), ("CC", 60)], 1):
+        boards.add("Team Game", points, {"owner": owner, "week": week}, slices=[owner])
+
+    assert sorted(boards.slices("Team Game")) == ["AK", "All", "CC"]
+    assert [e["week"] for e in boards.top("Team Game")] == [3, 1]
+    assert [e["week"] for e in boards.bottom("Team Game")] == [4, 2]
+    assert [e["week"] for e in boards.top("Team Game", "CC")] == [2, 4]
+    assert boards.top("Player Game") == []
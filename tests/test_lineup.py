@@ -0,0 +1,97 @@
+import math
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from helpers.lineup import FLEX_POSITIONS, LINEUP_POSITIONS, POSITION_CODES, solve_optimal_lineups
+
+SLOT_COUNTS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "K": 1, "D/ST": 1}
+FLEX_COUNT = 1
+NOT_IN_LINEUP = len(LINEUP_POSITIONS)  # e.g. an IDP code, which never starts
+
+
+def fits(players, slot_counts, flex_count):
+    # Whether these (position, points) lines can all start at once
+    overflow = 0
+    for pos in set(pos for pos, _ in players):
+        extra = sum(p == pos for p, _ in players) - slot_counts.get(pos, 0)
+        if extra > 0:
+            if pos not in FLEX_POSITIONS:
+                return False
+            overflow += extra
+    return overflow <= flex_count
+
+
+def brute_force(players, slot_counts, flex_count):
+    # Best total over every set of lines that fits the slots
+    eligible = [(pos, pts) for pos, pts in players
+                if pos in LINEUP_POSITIONS and pts is not None and not math.isnan(pts) and pts >= 0]
+    best = 0.0
+    for size in range(len(eligible) + 1):
+        for chosen in combinations(eligible, size):
+            if fits(chosen, slot_counts, flex_count):
+                best = max(best, sum(pts for _, pts in chosen))
+    return best
+
+
+def solve(lineups, slot_counts=SLOT_COUNTS, flex_count=FLEX_COUNT):
+    group, position, points = [], [], []
+    for g, lineup in enumerate(lineups):
+        for pos, pts in lineup:
+            group.append(g)
+            position.append(POSITION_CODES.get(pos, NOT_IN_LINEUP))
+            points.append(np.nan if pts is None else pts)
+    return solve_optimal_lineups(group, position, points, slot_counts, flex_count, n_groups=len(lineups))
+
+
+LINEUPS = {
+    # The best leftover RB takes the flex over a weaker WR and TE
+    "flex_rb": [("QB", 20), ("RB", 15), ("RB", 12), ("RB", 11), ("WR", 14), ("WR", 9), ("WR", 8),
+                ("TE", 7), ("TE", 6), ("K", 9), ("D/ST", 4)],
+    # A TE can flex; a second QB or K never does
+    "flex_te": [("QB", 20), ("QB", 30), ("RB", 5), ("RB", 4), ("WR", 6), ("WR", 3), ("TE", 10), ("TE", 9),
+                ("K", 8), ("K", 12), ("D/ST", 3), ("D/ST", 7)],
+    # Negative and missing scores sit, leaving the slot empty
+    "negative": [("QB", -2), ("RB", None), ("RB", 10), ("WR", 3), ("TE", -1), ("K", 0), ("D/ST", -4)],
+    # Positions outside the lineup never start
+    "not_in_lineup": [("QB", 10), ("LB", 40), ("RB", 8), ("WR", 7), ("K", 5), ("D/ST", 6)],
+    # Ties at the cut line between positions and within one
+    "ties": [("QB", 10), ("RB", 8), ("RB", 8), ("RB", 8), ("WR", 8), ("WR", 8), ("WR", 8), ("TE", 8),
+             ("TE", 8), ("K", 8), ("K", 8), ("D/ST", 8)],
+    "empty": [],
+}
+
+
+@pytest.mark.parametrize("name", LINEUPS)
+def test_matches_brute_force(name):
+    lineup = LINEUPS[name]
+    optimal, chosen = solve([lineup])
+    assert optimal[0] == pytest.approx(brute_force(lineup, SLOT_COUNTS, FLEX_COUNT))
+
+    # The chosen lines are a lineup that fits and adds up to the total
+    starters = [line for line, starts in zip(lineup, chosen) if starts]
+    assert fits(starters, SLOT_COUNTS, FLEX_COUNT)
+    assert sum(pts for _, pts in starters) == pytest.approx(optimal[0])
+
+
+def test_groups_are_solved_independently():
+    lineups = list(LINEUPS.values())
+    optimal, _ = solve(lineups)
+    assert len(optimal) == len(lineups)
+    for total, lineup in zip(optimal, lineups):
+        assert total == pytest.approx(brute_force(lineup, SLOT_COUNTS, FLEX_COUNT))
+
+
+def test_random_lineups_with_ties():
+    # Whole-point scores so ties are common; two flex spots
+    rng = random.Random(7)
+    lineups = [
+        [(rng.choice(LINEUP_POSITIONS + ["RB", "WR", "LB"]), rng.choice([None, -1] + list(range(6))))
+         for _ in range(rng.randint(0, 12))]
+        for _ in range(200)
+    ]
+    optimal, _ = solve(lineups, SLOT_COUNTS, flex_count=2)
+    for total, lineup in zip(optimal, lineups):
+        assert total == pytest.approx(brute_force(lineup, SLOT_COUNTS, 2))
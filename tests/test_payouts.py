@@ -0,0 +1,85 @@
+import pytest
+
+from helpers.payouts import PAYOUT_RULES, PayoutSchedule, SeasonLines
+from helpers.store import ArchivedBox, ArchivedPlayer, ArchivedTeam
+
+# (player id, position, slot, points) per team; bench lines never count, IR lines do
+LINEUPS = {
+    1: [(1, "QB", "QB", 20), (2, "RB", "RB", 10), (3, "WR", "WR", 15), (4, "WR", "WR", 9), (5, "K", "K", 8),
+        (6, "WR", "BE", 40)],
+    2: [(7, "QB", "QB", 25), (8, "RB", "RB", 30), (9, "WR", "WR", 5), (10, "D/ST", "D/ST", 12)],
+    3: [(11, "QB", "QB", 18), (12, "RB", "RB", 12), (13, "WR", "WR", 22), (14, "WR", "WR", 21), (15, "TE", "TE", 6)],
+    4: [(16, "QB", "QB", 10), (17, "RB", "RB", None), (18, "WR", "WR", 3), (19, "K", "K", 14), (20, "RB", "IR", 9)],
+}
+
+
+def team(team_id):
+    return ArchivedTeam(team_id, None, None, None, f"Team {team_id}", 0, 0, 0.0, 0.0, 0, 0)
+
+
+def box(home_id, away_id, lineups=LINEUPS):
+    home, away = [[ArchivedPlayer(player_id, f"P{player_id}", pos, slot, points)
+                   for player_id, pos, slot, points in lineups.get(team_id, [])]
+                  for team_id in (home_id, away_id)]
+    return ArchivedBox(team(home_id) if home_id else None, team(away_id) if away_id else None, 0, 0, home, away)
+
+
+def winners(config, weeks):
+    schedule = PayoutSchedule({"weekly_payouts": {str(week): config for week in weeks}})
+    return [(w["week"], w["team_id"], w["points"], w["players"]) for w in schedule.winners(SeasonLines(weeks))]
+
+
+WEEK = {1: [box(1, 2), box(3, 4)]}
+
+
+@pytest.mark.parametrize("config, expected", [
+    ({"type": "highest_total_points"}, (3, 79, ["P11", "P12", "P13", "P14", "P15"])),
+    ({"type": "top_player_overall"}, (2, 30, ["P8"])),
+    ({"type": "top_slot", "slots": {"WR": 2}}, (3, 43, ["P13", "P14"])),
+    ({"type": "top_slot", "slots": {"QB": 1, "RB": 1}}, (2, 30, ["P8"])),
+    ({"type": "top_slot", "slots": {"K": 1}}, (4, 14, ["P19"])),
+    ({"type": "top_slot_combo", "slots": {"QB": 1, "WR": 1}}, (3, 40, ["P11", "P13"])),
+    # Only team 2 has a D/ST to go with its QB
+    ({"type": "top_slot_combo", "slots": {"QB": 1, "D/ST": 1}}, (2, 37, ["P7", "P10"])),
+])
+def test_each_rule_picks_its_winner(config, expected):
+    assert winners(config, WEEK) == [(1, *expected)]
+
+
+def test_every_registered_rule_is_covered():
+    assert set(PAYOUT_RULES) == {"highest_total_points", "top_player_overall", "top_slot", "top_slot_combo"}
+    for name, rule in PAYOUT_RULES.items():
+        assert rule({"type": name, "slots": {"QB": 1}}).text()
+
+
+def test_no_winner_without_a_matching_line():
+    # No line is ever a FLEX, so nobody can win the week
+    assert winners({"type": "top_slot", "slots": {"FLEX": 1}}, WEEK) == []
+
+
+def test_ties_go_to_the_first_side_in_box_order():
+    tied = {1: [(1, "QB", "QB", 50)], 2: [(2, "QB", "QB", 30)], 3: [(3, "QB", "QB", 50)]}
+    weeks = {1: [box(2, 1, tied), box(3, 0, tied)], 2: [box(3, 1, tied), box(2, 0, tied)]}
+    assert winners({"type": "highest_total_points"}, weeks) == [(1, 1, 50, ["P1"]), (2, 3, 50, ["P3"])]
+
+
+def test_weeks_sharing_a_rule_are_scored_together():
+    schedule = PayoutSchedule({"weekly_payouts": {
+        "1": {"type": "highest_total_points"}, "2": {"type": "top_player_overall"},
+        "3": {"type": "highest_total_points"},
+    }})
+    assert schedule.weeks() == [1, 2, 3]
+    assert len(schedule.rules) == 2
+
+
+def test_unknown_payout_type():
+    with pytest.raises(ValueError):
+        PayoutSchedule({"weekly_payouts": {"1": {"type": "most_vibes"}}})
+
+
+def test_stat_corrections_change_the_winner():
+    season = SeasonLines(WEEK)
+    assert season.correct(1, 8, 2.0) == 1
+    schedule = PayoutSchedule({"weekly_payouts": {"1": {"type": "top_player_overall"}}})
+    # Team 2's QB now outscores its corrected RB
+    assert [(w["team_id"], w["points"], w["players"]) for w in schedule.winners(season)] == [(2, 25, ["P7"])]
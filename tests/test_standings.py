@@ -0,0 +1,100 @@
+import pickle
+
+from helpers.standings import SeasonStandings, StandingsTimeline
+
+# Four teams, three regular-season weeks, two playoff spots
+WEEKS = {
+    1: [(1, 2, 100, 90), (3, 4, 80, 85)],
+    2: [(1, 3, 110, 70), (2, 4, 95, 95)],
+    3: [(1, 4, 60, 100), (2, 3, 120, 100)],
+}
+
+
+def season():
+    standings = SeasonStandings([4, 2, 3, 1], reg_season_count=3, playoff_teams=2)
+    for week, games in WEEKS.items():
+        standings.add_week(week, games)
+    return standings
+
+
+def old_format_pickle():
+    # The state a SeasonStandings pickled before the rows were built week by
+    # week: only the games, logged home side first, and the weeks
+    old = SeasonStandings.__new__(SeasonStandings)
+    column = {team_id: i for i, team_id in enumerate([1, 2, 3, 4])}
+    games = []
+    for k, week_games in enumerate(WEEKS.values()):
+        for home, away, home_score, away_score in week_games:
+            games.append((k, column[home], home_score, away_score))
+            games.append((k, column[away], away_score, home_score))
+    vars(old).update({"team_ids": [1, 2, 3, 4], "column": column, "reg_season_count": 3, "playoff_teams": 2,
+                      "weeks": list(WEEKS), "games": games, "built": -1})
+    return pickle.dumps(old)
+
+
+def table(standings, week):
+    return [(team_id, *(standings.team_after(week, team_id)[key] for key in
+                        ("rank", "wins", "losses", "ties", "points_for", "points_against", "games_back",
+                         "clinched", "eliminated")))
+            for team_id in standings.standings(week)]
+
+
+def test_standings_table():
+    standings = season()
+    assert table(standings, 1) == [
+        (1, 1, 1, 0, 0, 100, 90, 0, False, False),
+        (4, 2, 1, 0, 0, 85, 80, 0, False, False),
+        (2, 3, 0, 1, 0, 90, 100, 1, False, False),
+        (3, 4, 0, 1, 0, 80, 85, 1, False, False),
+    ]
+    assert table(standings, 2) == [
+        (1, 1, 2, 0, 0, 210, 160, 0, True, False),
+        (4, 2, 1, 0, 1, 180, 175, 0.5, False, False),
+        (2, 3, 0, 1, 1, 185, 195, 1.5, False, False),
+        (3, 4, 0, 2, 0, 150, 195, 2, False, True),
+    ]
+    assert table(standings, 3) == [
+        (4, 1, 2, 0, 1, 280, 235, 0, True, False),
+        (1, 2, 2, 1, 0, 270, 260, 0.5, True, False),
+        (2, 3, 1, 1, 1, 305, 295, 1, False, True),
+        (3, 4, 0, 3, 0, 250, 315, 2.5, False, True),
+    ]
+
+
+def test_lookups():
+    standings = season()
+    assert standings.standings() == [4, 1, 2, 3]
+    assert standings.rank_after(2, 4) == 2
+    assert standings.rank_after(0, 4) is None
+    assert standings.standings(0) == []
+    assert standings.sacko() == 3
+    assert [standings.clinch_week(team_id) for team_id in (1, 2, 3, 4)] == [2, None, None, 3]
+
+
+def test_weeks_already_recorded_are_ignored():
+    standings = season()
+    standings.add_week(2, [(1, 2, 0, 500)])
+    assert table(standings, 3) == table(season(), 3)
+
+
+def test_old_format_pickle_is_replayed():
+    standings = pickle.loads(old_format_pickle())
+    assert standings.weeks == [1, 2, 3]
+    for week in WEEKS:
+        assert table(standings, week) == table(season(), week)
+    assert standings.clinch_week(1) == 2
+
+
+def test_timeline_round_trip(tmp_path):
+    timeline = StandingsTimeline()
+    timeline.start_season(2024, [1, 2, 3, 4], 3, 2)
+    for week, games in WEEKS.items():
+        timeline.add_week(2024, week, games)
+    path = tmp_path / "standings.pkl"
+    timeline.save(path)
+
+    loaded = StandingsTimeline.load(path)
+    assert loaded.sacko(2024) == 3
+    assert list(loaded.rows()) == list(timeline.rows())
+    # A season carried over from the checkpoint keeps its weeks
+    assert loaded.start_season(2024, [4, 3, 2, 1], 3, 2).weeks == [1, 2, 3]
@@ -0,0 +1,21 @@
+from helpers.build import build_league
+from helpers.store import ArchiveReader
+from helpers.synthetic import SyntheticFetcher
+
+LEAGUE_ID = 1
+YEARS = range(2019, 2021)
+OUTPUTS = ["league_history.csv", "head_to_head_lifetime.csv", "all_time_records.csv",
+           "advanced_team_metrics.csv", "most_drafted_players.csv", "all_time_leaderboards.csv"]
+
+
+def test_archive_replays_the_live_crawl(tmp_path):
+    # Synthetic rosters list some players twice in one lineup, which the
+    # archive has to keep
+    archive = tmp_path / "archive.sqlite"
+    build_league(LEAGUE_ID, YEARS, tmp_path / "live", {}, fetcher=SyntheticFetcher(n_teams=6, n_weeks=8),
+                 archive_path=archive)
+    build_league(LEAGUE_ID, YEARS, tmp_path / "replay", {}, fetcher=ArchiveReader(archive), archive_path=None)
+
+    for filename in OUTPUTS:
+        live = (tmp_path / "live" / filename).read_text()
+        assert (tmp_path / "replay" / filename).read_text() == live, filename
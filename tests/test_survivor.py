@@ -0,0 +1,77 @@
+import pytest
+
+from helpers.survivor import SurvivorPool, SurvivorPools
+
+
+def scores(*rows):
+    # (owner, points) with the team named after its owner
+    return [(owner, f"Team {owner}", points) for owner, points in rows]
+
+
+def test_lowest_score_goes_home():
+    pool = SurvivorPool("main")
+    pool.add_week(1, scores(("AK", 100), ("CC", 80), ("DP", 90)))
+    pool.add_week(2, scores(("AK", 70), ("CC", 200), ("DP", 75)))
+    assert pool.results() == {"eliminated": {"CC": 1, "AK": 2}, "remaining": ["DP"]}
+
+
+def test_tie_at_the_cut_line_by_team_name():
+    pool = SurvivorPool("main", tie_break="team_name")
+    pool.add_week(1, [("AK", "Zebras", 80), ("CC", "Aardvarks", 80), ("DP", "Moles", 95)])
+    assert pool.eliminated == {"CC": 1}
+
+
+def test_tie_at_the_cut_line_by_season_points():
+    pool = SurvivorPool("main", tie_break="season_points", eliminations=2)
+    pool.add_week(1, scores(("AK", 120), ("CC", 100), ("DP", 110), ("MS", 130), ("GW", 10), ("RP", 5)))
+    # Three tied at the line for two spots: the fewest season points go first
+    pool.add_week(2, scores(("AK", 60), ("CC", 60), ("DP", 60), ("MS", 90)))
+    assert pool.eliminated == {"RP": 1, "GW": 1, "CC": 2, "DP": 2}
+    assert pool.results()["remaining"] == ["AK", "MS"]
+
+
+def test_pool_runs_out_of_entrants():
+    pool = SurvivorPool("main", eliminations=3)
+    pool.add_week(1, scores(("AK", 100), ("CC", 80), ("DP", 90)))
+    # Only two could go; the last one standing never does
+    assert pool.results() == {"eliminated": {"CC": 1, "DP": 1}, "remaining": ["AK"]}
+    pool.add_week(2, scores(("AK", 10), ("CC", 80), ("DP", 90)))
+    assert pool.results() == {"eliminated": {"CC": 1, "DP": 1}, "remaining": ["AK"]}
+
+
+def test_no_eliminations_from_the_cutoff_week():
+    pool = SurvivorPool("main", cutoff_week=2)
+    pool.add_week(1, scores(("AK", 100), ("CC", 80), ("DP", 90)))
+    pool.add_week(2, scores(("AK", 10), ("DP", 90)))
+    assert pool.results() == {"eliminated": {"CC": 1}, "remaining": ["AK", "DP"]}
+
+
+def test_weeks_already_seen_are_ignored():
+    pool = SurvivorPool("main")
+    pool.add_week(1, scores(("AK", 100), ("CC", 80), ("DP", 90)))
+    pool.add_week(1, scores(("AK", 1), ("CC", 80), ("DP", 90)))
+    assert pool.results() == {"eliminated": {"CC": 1}, "remaining": ["AK", "DP"]}
+    assert pool.season_points["AK"] == 100
+
+
+def test_unknown_tie_break():
+    with pytest.raises(ValueError):
+        SurvivorPool("main", tie_break="coin_flip")
+
+
+def test_weeks_past_the_final_week_are_not_committed(tmp_path):
+    config = {"pools": {"main": {"cutoff_week": 12, "eliminations": 1}}}
+    weekly = [(1, "AK", "Team AK", 100), (1, "CC", "Team CC", 80), (1, "DP", "Team DP", 90),
+              (2, "AK", "Team AK", 70), (2, "DP", "Team DP", 95)]
+    pools = SurvivorPools(config)
+    # Week 2 is still being played: shown, but not kept
+    assert pools.consume(weekly, final_week=1) == {"main": {"eliminated": {"CC": 1, "AK": 2}, "remaining": ["DP"]}}
+    assert pools.last_week() == 1
+
+    path = tmp_path / "survivor.pkl"
+    pools.save(path)
+    assert SurvivorPools.load(path, config).pools["main"].results() == {"eliminated": {"CC": 1},
+                                                                        "remaining": ["AK", "DP"]}
+    # A pool whose rules changed starts over
+    changed = {"pools": {"main": {"cutoff_week": 12, "eliminations": 2}}}
+    assert SurvivorPools.load(path, changed).last_week() == 0